@@ -0,0 +1,62 @@
+import os
+from glob import glob
+import tensorflow as tf
+from sklearn.model_selection import train_test_split
+
+# Modelin giriş boyutu
+IMAGE_SIZE = (256, 256)
+
+# Dosya adları karıştırılırken kullanılan tampon boyutu (görüntüler değil, sadece dosya yolları tutulur)
+SHUFFLE_BUFFER = 1024
+
+AUTOTUNE = tf.data.AUTOTUNE
+
+
+# Klasördeki uydu görüntüleri ve onlara karşılık gelen maskelerin dosya yollarını bulun
+def list_pairs(data_path):
+    sat_images = sorted(glob(os.path.join(data_path, '*_sat.jpg')))
+    if not sat_images:
+        raise ValueError(f"No '*_sat.jpg' images found in {data_path}")
+    mask_images = [f.replace('_sat.jpg', '_mask.png') for f in sat_images]
+    return sat_images, mask_images
+
+
+# Eğitim ve test ayrımını diziler yerine dosya listeleri üzerinde yapın
+def split_pairs(sat_images, mask_images, test_size=0.1, seed=None):
+    sat_train, sat_test, mask_train, mask_test = train_test_split(
+        sat_images, mask_images, test_size=test_size, random_state=seed)
+    return (sat_train, mask_train), (sat_test, mask_test)
+
+
+# Görüntüyü okuyun, yeniden boyutlandırın ve float32 olarak [0, 1] aralığına getirin
+def load_image(path):
+    image = tf.io.decode_jpeg(tf.io.read_file(path), channels=3)
+    # cv2.imread ile aynı kanal sırası (BGR) korunuyor
+    image = tf.reverse(image, axis=[-1])
+    image = tf.image.resize(image, IMAGE_SIZE, method='bilinear')
+    return image / 255.0
+
+
+def load_mask(path):
+    mask = tf.io.decode_png(tf.io.read_file(path), channels=1)
+    mask = tf.image.resize(mask, IMAGE_SIZE, method='bilinear')
+    # ikili maske oluştur
+    return tf.cast(mask > 128, tf.float32)
+
+
+def load_pair(image_path, mask_path):
+    return load_image(image_path), load_mask(mask_path)
+
+
+# Görüntüleri diskten akış halinde okuyan tf.data veri seti
+# Çözme ve yeniden boyutlandırma paralel çalışır, prefetch sayesinde model eğitilirken sonraki yığınlar hazırlanır
+def make_dataset(sat_images, mask_images, batch_size=32, shuffle=True, shuffle_buffer=SHUFFLE_BUFFER, seed=None):
+    # Boş bir ayrım tf.data'da anlaşılması zor bir hataya (0 boyutlu karıştırma tamponu) yol açar
+    if not len(sat_images):
+        raise ValueError("Cannot build a dataset from an empty list of images")
+    dataset = tf.data.Dataset.from_tensor_slices((list(sat_images), list(mask_images)))
+    if shuffle:
+        dataset = dataset.shuffle(min(shuffle_buffer, len(sat_images)), seed=seed, reshuffle_each_iteration=True)
+    # Karıştırılan eğitim verisinde sıranın korunmasına gerek yok; böylece yavaş çözülen bir dosya diğerlerini bekletmez
+    dataset = dataset.map(load_pair, num_parallel_calls=AUTOTUNE, deterministic=not shuffle)
+    return dataset.batch(batch_size).prefetch(AUTOTUNE)
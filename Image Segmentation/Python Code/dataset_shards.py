@@ -0,0 +1,130 @@
+import argparse
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import cv2
+from tensorflow.keras.utils import Sequence
+from data_pipeline import IMAGE_SIZE, list_pairs
+
+# Parçaların (shard) listesini ve görüntülerin kaynak dosyalarını tutan dizin dosyası
+INDEX_FILE = 'index.json'
+
+# Her parçadaki görüntü sayısı
+SHARD_SIZE = 1024
+
+
+# Görüntüyü ve maskeyi bir kez çözüp hedef boyuta getirin; görüntü uint8 olarak kalır, maske bitlere sıkıştırılır
+def preprocess_pair(image_path, mask_path):
+    image = cv2.resize(cv2.imread(image_path, cv2.IMREAD_COLOR), IMAGE_SIZE)
+    mask = cv2.resize(cv2.imread(mask_path, cv2.IMREAD_GRAYSCALE), IMAGE_SIZE)
+    return image, np.packbits(mask > 128, axis=-1)
+
+
+# Veri setini tek seferlik olarak bellek eşlemeli .npy parçalarına yazın
+# Dosyalar önceden karıştırılır; böylece ardışık dilimler rastgele alt kümeler olur ve eğitim/test ayrımı
+# indis aralıklarıyla, kopyalama yapmadan yapılabilir
+def write_shards(sat_images, mask_images, output_dir, shard_size=SHARD_SIZE, seed=0, workers=None):
+    order = np.random.default_rng(seed).permutation(len(sat_images))
+    sat_images = [sat_images[i] for i in order]
+    mask_images = [mask_images[i] for i in order]
+
+    os.makedirs(output_dir, exist_ok=True)
+    height, width = IMAGE_SIZE[1], IMAGE_SIZE[0]
+    shards = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for shard_number, start in enumerate(range(0, len(sat_images), shard_size)):
+            stop = min(start + shard_size, len(sat_images))
+            names = {'images': f'images_{shard_number:05d}.npy', 'masks': f'masks_{shard_number:05d}.npy'}
+            images = np.lib.format.open_memmap(os.path.join(output_dir, names['images']), mode='w+',
+                                               dtype=np.uint8, shape=(stop - start, height, width, 3))
+            masks = np.lib.format.open_memmap(os.path.join(output_dir, names['masks']), mode='w+',
+                                              dtype=np.uint8, shape=(stop - start, height, (width + 7) // 8))
+
+            # cv2 çözme sırasında GIL'i bıraktığı için iş parçacıkları paralel çalışır
+            results = pool.map(preprocess_pair, sat_images[start:stop], mask_images[start:stop])
+            for position, (image, mask) in enumerate(results):
+                images[position] = image
+                masks[position] = mask
+            images.flush()
+            masks.flush()
+            del images, masks
+
+            shards.append(dict(names, count=stop - start))
+
+    index = {'image_size': [height, width], 'channel_order': 'bgr', 'count': len(sat_images),
+             'shards': shards, 'sat_images': sat_images, 'mask_images': mask_images}
+    with open(os.path.join(output_dir, INDEX_FILE), 'w') as f:
+        json.dump(index, f, indent=1)
+    return index
+
+
+def load_index(shard_dir):
+    with open(os.path.join(shard_dir, INDEX_FILE)) as f:
+        return json.load(f)
+
+
+# Örnek sayısını eğitim ve test için iki indis aralığına ayırın
+def split_range(count, test_size=0.1):
+    split = count - int(round(count * test_size))
+    return (0, split), (split, count)
+
+
+# Parçalardan doğrudan yığın okuyan Keras veri dizisi
+# Her yığın, bir parçanın bellek eşlemeli dizisinden ardışık bir dilimdir (kopyalama yapılmaz);
+# sadece float32'ye dönüştürme ve maskenin bitlerinin açılması yığın başına yapılır
+class ShardSequence(Sequence):
+    def __init__(self, shard_dir, batch_size=32, start=0, stop=None, shuffle=True, seed=None, **kwargs):
+        super().__init__(**kwargs)
+        index = load_index(shard_dir)
+        self.width = index['image_size'][1]
+        self.images = [np.load(os.path.join(shard_dir, shard['images']), mmap_mode='r') for shard in index['shards']]
+        self.masks = [np.load(os.path.join(shard_dir, shard['masks']), mmap_mode='r') for shard in index['shards']]
+        if stop is None:
+            stop = index['count']
+
+        # Yığınlar parça sınırlarını aşmaz: (parça, başlangıç, bitiş)
+        self.batches = []
+        offset = 0
+        for shard_number, shard in enumerate(index['shards']):
+            first, last = max(start, offset), min(stop, offset + shard['count'])
+            for batch_start in range(first, last, batch_size):
+                self.batches.append((shard_number, batch_start - offset, min(batch_start + batch_size, last) - offset))
+            offset += shard['count']
+
+        self.shuffle = shuffle
+        self.rng = np.random.default_rng(seed)
+        self.on_epoch_end()
+
+    def __len__(self):
+        return len(self.batches)
+
+    def __getitem__(self, number):
+        shard_number, start, stop = self.batches[self.order[number]]
+        images = self.images[shard_number][start:stop]
+        masks = self.masks[shard_number][start:stop]
+        x = images.astype(np.float32) / 255.0
+        y = np.unpackbits(masks, axis=-1, count=self.width).astype(np.float32)
+        return x, y[..., np.newaxis]
+
+    def on_epoch_end(self):
+        # Her epoch sonunda yığınların sırasını karıştırın
+        self.order = self.rng.permutation(len(self.batches)) if self.shuffle else np.arange(len(self.batches))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Preprocess *_sat.jpg / *_mask.png pairs into memory-mapped shards.")
+    parser.add_argument('data_path')
+    parser.add_argument('output_dir')
+    parser.add_argument('--shard-size', type=int, default=SHARD_SIZE)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    sat_images, mask_images = list_pairs(args.data_path)
+    index = write_shards(sat_images, mask_images, args.output_dir, args.shard_size, args.seed, args.workers)
+    print(f"{index['count']} görüntü {len(index['shards'])} parçaya yazıldı: {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
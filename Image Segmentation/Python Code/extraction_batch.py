@@ -0,0 +1,132 @@
+import argparse
+import csv
+import os
+import time
+from glob import glob
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import cv2
+from road_extraction import LOWER_THRESHOLD, UPPER_THRESHOLD, extract_roads
+
+
+# Tahmin edilen maskeler ile gerçek maske arasındaki doğru pozitif, yanlış pozitif ve yanlış negatif sayıları
+# predicted: (eşik sayısı, yükseklik, genişlik) boyutunda bool dizi; tüm eşikler tek seferde hesaplanır
+def confusion_counts(predicted, truth):
+    predicted = predicted.reshape(len(predicted), -1)
+    truth = truth.reshape(-1)
+    true_positive = np.count_nonzero(predicted & truth, axis=1)
+    false_positive = np.count_nonzero(predicted, axis=1) - true_positive
+    false_negative = np.count_nonzero(truth) - true_positive
+    return true_positive, false_positive, false_negative
+
+
+# Sayılardan IoU, kesinlik (precision) ve duyarlılık (recall); payda sıfırsa sonuç 0 olur
+def scores(true_positive, false_positive, false_negative):
+    true_positive = np.asarray(true_positive, dtype=np.float64)
+    def ratio(denominator):
+        return np.divide(true_positive, denominator, out=np.zeros_like(true_positive), where=denominator > 0)
+    return (ratio(true_positive + false_positive + false_negative),
+            ratio(true_positive + false_positive),
+            ratio(true_positive + false_negative))
+
+
+def _init_worker():
+    # Süreçler zaten paralel çalıştığı için OpenCV'nin kendi iş parçacıkları kapatılır
+    cv2.setNumThreads(1)
+
+
+# Tek bir uydu görüntüsü/maske çifti için bütün eşiklerde yol çıkarma ve skorlama
+def evaluate_pair(pair, thresholds):
+    sat_path, mask_path = pair
+    sat_image = cv2.imread(sat_path, cv2.IMREAD_COLOR)
+    truth = cv2.imread(mask_path, cv2.IMREAD_GRAYSCALE)
+    if sat_image is None or truth is None or sat_image.shape[:2] != truth.shape:
+        return sat_path, None
+
+    predicted = np.stack([extract_roads(sat_image, lower, upper)[0] > 0 for lower, upper in thresholds])
+    return sat_path, np.stack(confusion_counts(predicted, truth > 128), axis=1)
+
+
+# Klasördeki bütün _sat/_mask çiftlerini süreç havuzunda işleyin
+# Dönüş: görüntü başına (eşik sayısı, 3) boyutunda tp/fp/fn sayıları ve atlanan (okunamayan/uyuşmayan) dosyalar
+def run_batch(sat_images, mask_images, thresholds=((LOWER_THRESHOLD, UPPER_THRESHOLD),), processes=None):
+    pairs = list(zip(sat_images, mask_images))
+    counts = {}
+    skipped = []
+    processes = processes or os.cpu_count() or 1
+    chunksize = max(1, len(pairs) // (processes * 4))
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker) as pool:
+        for sat_path, pair_counts in pool.map(evaluate_pair, pairs, [thresholds] * len(pairs), chunksize=chunksize):
+            if pair_counts is None:
+                skipped.append(sat_path)
+            else:
+                counts[sat_path] = pair_counts
+    return counts, skipped
+
+
+# Her eşik için veri seti genelindeki (toplam sayılardan) ve görüntü başına ortalama skorlar
+def summarize(counts, thresholds):
+    stacked = np.stack(list(counts.values()))  # (görüntü, eşik, 3)
+    total_iou, total_precision, total_recall = scores(*stacked.sum(axis=0).T)
+    image_iou, _, _ = scores(*np.moveaxis(stacked, -1, 0))
+    rows = []
+    for number, (lower, upper) in enumerate(thresholds):
+        rows.append({'lower_threshold': lower, 'upper_threshold': upper, 'iou': total_iou[number],
+                     'precision': total_precision[number], 'recall': total_recall[number],
+                     'mean_image_iou': image_iou[:, number].mean()})
+    return rows
+
+
+def write_results(output_path, counts, thresholds):
+    # Görüntü ve eşik başına sonuç tablosu (CSV)
+    with open(output_path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['image', 'lower_threshold', 'upper_threshold', 'true_positive', 'false_positive',
+                         'false_negative', 'iou', 'precision', 'recall'])
+        for sat_path, pair_counts in counts.items():
+            iou, precision, recall = scores(*pair_counts.T)
+            for number, (lower, upper) in enumerate(thresholds):
+                writer.writerow([os.path.basename(sat_path), lower, upper, *pair_counts[number].tolist(),
+                                 f"{iou[number]:.6f}", f"{precision[number]:.6f}", f"{recall[number]:.6f}"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score the Canny/morphology road extractor over a dataset.")
+    parser.add_argument('data_path', help="folder of *_sat.jpg / *_mask.png pairs")
+    parser.add_argument('--output', default='road_extraction_results.csv')
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--limit', type=int, default=None, help="only use the first N pairs")
+    parser.add_argument('--sweep', action='store_true', help="sweep Canny threshold pairs instead of the defaults")
+    parser.add_argument('--lower', type=int, nargs='+', default=[25, 50, 75, 100])
+    parser.add_argument('--ratio', type=float, nargs='+', default=[2.0, 3.0], help="upper / lower threshold ratios")
+    args = parser.parse_args()
+
+    if args.sweep:
+        thresholds = [(lower, int(lower * ratio)) for lower in args.lower for ratio in args.ratio]
+    else:
+        thresholds = [(LOWER_THRESHOLD, UPPER_THRESHOLD)]
+
+    # data_pipeline.list_pairs TensorFlow'u import ettiği için dosyalar burada listelenir
+    sat_images = sorted(glob(os.path.join(args.data_path, '*_sat.jpg')))
+    mask_images = [f.replace('_sat.jpg', '_mask.png') for f in sat_images]
+    if args.limit is not None:
+        sat_images, mask_images = sat_images[:args.limit], mask_images[:args.limit]
+
+    start_time = time.perf_counter()
+    counts, skipped = run_batch(sat_images, mask_images, thresholds, args.processes)
+    elapsed = time.perf_counter() - start_time
+    if not counts:
+        print("Hiçbir görüntü çifti işlenemedi.")
+        return
+
+    write_results(args.output, counts, thresholds)
+    print(f"{len(counts)} görüntü {elapsed:.1f} saniyede işlendi ({len(counts) / elapsed:.2f} görüntü/saniye), "
+          f"{len(skipped)} atlandı. Sonuçlar: {args.output}")
+    print(f"{'lower':>6} {'upper':>6} {'IoU':>7} {'precision':>9} {'recall':>7} {'mean IoU':>9}")
+    for row in sorted(summarize(counts, thresholds), key=lambda row: row['iou'], reverse=True):
+        print(f"{row['lower_threshold']:>6} {row['upper_threshold']:>6} {row['iou']:>7.4f} {row['precision']:>9.4f} "
+              f"{row['recall']:>7.4f} {row['mean_image_iou']:>9.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import argparse
+import os
+import time
+import numpy as np
+import cv2
+
+# Modelin giriş boyutu ve karolar arasındaki varsayılan örtüşme
+TILE_SIZE = 256
+OVERLAP = 64
+
+
+# Bir eksen boyunca karo başlangıçları; son karo görüntünün sonuna hizalanır
+def tile_starts(length, tile_size, stride):
+    if length <= tile_size:
+        return [0]
+    starts = list(range(0, length - tile_size, stride))
+    starts.append(length - tile_size)
+    return starts
+
+
+# Karo kenarlarına doğru azalan ağırlıklar; örtüşen karolar yumuşak geçişle birleştirilir
+def blend_window(tile_size, overlap):
+    position = np.arange(tile_size, dtype=np.float32)
+    ramp = np.minimum(position + 0.5, tile_size - position - 0.5) / max(overlap, 1)
+    ramp = np.clip(ramp, 1e-3, 1.0)
+    return np.outer(ramp, ramp)
+
+
+def _open_outputs(shape, output_dir):
+    # Çıktılar output_dir verilirse diskte bellek eşlemeli .npy dosyalarına yazılır; çok büyük sahneler
+    # belleğe sığmasa da olur ve maske doğrudan hierarchical_routing.open_mask ile açılabilir
+    if output_dir is None:
+        return np.zeros(shape, dtype=np.float32), np.zeros(shape, dtype=np.uint8)
+    os.makedirs(output_dir, exist_ok=True)
+    probability = np.lib.format.open_memmap(os.path.join(output_dir, 'probability.npy'), mode='w+',
+                                            dtype=np.float32, shape=shape)
+    mask = np.lib.format.open_memmap(os.path.join(output_dir, 'mask.npy'), mode='w+', dtype=np.uint8, shape=shape)
+    return probability, mask
+
+
+# Büyük bir uydu görüntüsünü örtüşen karolara bölerek modeli yığınlar halinde çalıştırın
+# Karolar satır satır işlenir; bellekte sadece bir karo satırı ve bir karo yüksekliğindeki birikim bandı tutulur
+# Dönüş: tam boyutlu yol olasılık haritası, create_flat_image ve yol bulucularla uyumlu 0/255 maske ve ölçümler
+def predict_large_image(model, image, tile_size=TILE_SIZE, overlap=OVERLAP, batch_size=8, threshold=0.5,
+                        output_dir=None):
+    if overlap >= tile_size:
+        raise ValueError("overlap must be smaller than tile_size")
+    height, width = image.shape[:2]
+
+    # Karodan küçük görüntüler yansıtılarak karo boyutuna tamamlanır
+    padded_height, padded_width = max(height, tile_size), max(width, tile_size)
+    if (padded_height, padded_width) != (height, width):
+        image = np.pad(image, ((0, padded_height - height), (0, padded_width - width), (0, 0)), mode='reflect')
+
+    stride = tile_size - overlap
+    window = blend_window(tile_size, overlap)
+    rows = tile_starts(padded_height, tile_size, stride)
+    columns = tile_starts(padded_width, tile_size, stride)
+    probability, mask = _open_outputs((height, width), output_dir)
+
+    # Birikim bandı: band_top satırından başlayan tile_size satırlık ağırlıklı toplam ve ağırlıklar
+    band = np.zeros((tile_size, padded_width), dtype=np.float32)
+    band_weight = np.zeros((tile_size, padded_width), dtype=np.float32)
+    band_top = 0
+
+    def finish_rows(stop):
+        # band_top ile stop arasındaki satırlara artık yeni karo eklenmeyecek; sonuçları yazıp bandı kaydırın
+        nonlocal band_top
+        count = stop - band_top
+        rows_out = min(stop, height) - band_top
+        if rows_out > 0:
+            values = band[:rows_out, :width] / band_weight[:rows_out, :width]
+            probability[band_top:band_top + rows_out] = values
+            mask[band_top:band_top + rows_out] = np.where(values > threshold, 255, 0)
+        band[:-count] = band[count:]
+        band_weight[:-count] = band_weight[count:]
+        band[-count:] = 0
+        band_weight[-count:] = 0
+        band_top = stop
+
+    start_time = time.perf_counter()
+    tile_count = 0
+    for row in rows:
+        if row > band_top:
+            finish_rows(row)
+
+        for first in range(0, len(columns), batch_size):
+            batch_columns = columns[first:first + batch_size]
+            tiles = np.stack([image[row:row + tile_size, column:column + tile_size] for column in batch_columns])
+            predictions = model.predict(tiles.astype(np.float32) / 255.0, verbose=0)[..., 0]
+            for column, prediction in zip(batch_columns, predictions):
+                band[:, column:column + tile_size] += prediction * window
+                band_weight[:, column:column + tile_size] += window
+            tile_count += len(batch_columns)
+
+    finish_rows(band_top + tile_size)
+    elapsed = time.perf_counter() - start_time
+
+    if output_dir is not None:
+        probability.flush()
+        mask.flush()
+    stats = {'tiles': tile_count, 'seconds': elapsed, 'tiles_per_second': tile_count / elapsed if elapsed else 0.0}
+    return probability, mask, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tiled U-Net road segmentation for large satellite images.")
+    parser.add_argument('image')
+    parser.add_argument('model', help="saved Keras model (.keras / .h5)")
+    parser.add_argument('--output-dir', help="write probability.npy and mask.npy as memory-mapped arrays here")
+    parser.add_argument('--mask-png', help="also save the binary mask as an image")
+    parser.add_argument('--tile-size', type=int, default=TILE_SIZE)
+    parser.add_argument('--overlap', type=int, default=OVERLAP)
+    parser.add_argument('--batch-size', type=int, default=8)
+    parser.add_argument('--threshold', type=float, default=0.5)
+    args = parser.parse_args()
+
+    from tensorflow.keras.models import load_model
+    model = load_model(args.model, compile=False)
+
+    # Eğitimde olduğu gibi cv2 ile BGR kanal sırasında okunur
+    image = cv2.imread(args.image, cv2.IMREAD_COLOR)
+    _, mask, stats = predict_large_image(model, image, args.tile_size, args.overlap, args.batch_size,
+                                         args.threshold, args.output_dir)
+    if args.mask_png:
+        cv2.imwrite(args.mask_png, np.asarray(mask))
+    print(f"{stats['tiles']} karo {stats['seconds']:.2f} saniyede işlendi "
+          f"({stats['tiles_per_second']:.2f} karo/saniye)")
+
+
+if __name__ == "__main__":
+    main()
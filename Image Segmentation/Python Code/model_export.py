@@ -0,0 +1,167 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+import numpy as np
+import cv2
+import tensorflow as tf
+from data_pipeline import IMAGE_SIZE, list_pairs
+
+try:
+    import resource
+except ImportError:  # Windows'ta resource modülü yok; bellek ölçümü yapılmaz
+    resource = None
+
+QUANTIZATIONS = ('none', 'float16', 'int8')
+
+
+# Kalibrasyon ve karşılaştırma için örnek karolar; eğitimdeki gibi cv2 ile BGR okunur ve 256x256'ya getirilir
+def load_tiles(image_paths):
+    return np.stack([cv2.resize(cv2.imread(path, cv2.IMREAD_COLOR), IMAGE_SIZE) for path in image_paths])
+
+
+def load_masks(mask_paths):
+    return np.stack([cv2.resize(cv2.imread(path, cv2.IMREAD_GRAYSCALE), IMAGE_SIZE) > 128 for path in mask_paths])
+
+
+# Eğitilmiş Keras modelini TFLite'a dönüştürün
+# int8: ağırlıklar ve aktivasyonlar, örnek karolar üzerinde kalibre edilerek 8 bite indirilir (giriş/çıkış float32 kalır)
+# float16: ağırlıklar 16 bit olarak saklanır; model boyutu yarıya iner
+def export_tflite(model, output_path, quantization='int8', calibration_tiles=None):
+    if quantization not in QUANTIZATIONS:
+        raise ValueError(f"Unknown quantization: {quantization}")
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    if quantization != 'none':
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if quantization == 'float16':
+        converter.target_spec.supported_types = [tf.float16]
+    elif quantization == 'int8':
+        if calibration_tiles is None or not len(calibration_tiles):
+            raise ValueError("int8 quantization needs calibration tiles")
+
+        def representative_dataset():
+            for tile in calibration_tiles:
+                yield [tile[np.newaxis].astype(np.float32) / 255.0]
+
+        converter.representative_dataset = representative_dataset
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+
+    with open(output_path, 'wb') as f:
+        f.write(converter.convert())
+    return output_path
+
+
+# TFLite modelini Keras modeli gibi predict ile çağırılabilir hale getirin;
+# böylece inference.predict_large_image ile doğrudan kullanılabilir
+class TFLiteModel:
+    def __init__(self, model_path, num_threads=None):
+        self.interpreter = tf.lite.Interpreter(model_path=model_path, num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+        self.input = self.interpreter.get_input_details()[0]
+        self.output = self.interpreter.get_output_details()[0]
+
+    def predict(self, x, verbose=0):
+        outputs = []
+        for tile in x:
+            self.interpreter.set_tensor(self.input['index'], tile[np.newaxis].astype(self.input['dtype']))
+            self.interpreter.invoke()
+            outputs.append(self.interpreter.get_tensor(self.output['index'])[0])
+        return np.stack(outputs)
+
+
+def load_predictor(model_path, num_threads=None):
+    if model_path.endswith('.tflite'):
+        return TFLiteModel(model_path, num_threads)
+    return tf.keras.models.load_model(model_path, compile=False)
+
+
+# Tahmin ve gerçek maskeler üzerinde vektörel IoU
+def iou_score(predictions, masks, threshold=0.5):
+    predicted = predictions > threshold
+    intersection = np.logical_and(predicted, masks).sum()
+    union = np.logical_or(predicted, masks).sum()
+    return float(intersection / union) if union else 1.0
+
+
+def _peak_rss():
+    # Linux'ta kilobayt, macOS'ta bayt olarak döner
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _measure(model_path, image_paths, mask_paths, num_threads):
+    # Her model ayrı bir süreçte ölçülür; böylece en yüksek bellek kullanımı diğer modellerden etkilenmez
+    tiles = load_tiles(image_paths).astype(np.float32) / 255.0
+    masks = load_masks(mask_paths)
+    baseline_rss = _peak_rss()
+
+    predictor = load_predictor(model_path, num_threads)
+    predictor.predict(tiles[:1], verbose=0)  # ısınma
+
+    latencies = []
+    predictions = []
+    for tile in tiles:
+        start_time = time.perf_counter()
+        predictions.append(predictor.predict(tile[np.newaxis], verbose=0)[0, ..., 0])
+        latencies.append(time.perf_counter() - start_time)
+
+    return {'model': model_path, 'size_bytes': os.path.getsize(model_path) if os.path.isfile(model_path) else None,
+            'latency_ms': float(np.median(latencies) * 1e3), 'tiles_per_second': len(tiles) / sum(latencies),
+            'peak_memory_bytes': _peak_rss() - baseline_rss, 'iou': iou_score(np.stack(predictions), masks)}
+
+
+# Modelleri aynı karolar üzerinde gecikme, bellek ve IoU açısından karşılaştırın
+def benchmark(model_paths, image_paths, mask_paths, num_threads=None):
+    results = []
+    for model_path in model_paths:
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as pool:
+            results.append(pool.submit(_measure, model_path, image_paths, mask_paths, num_threads).result())
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the U-Net to TFLite and benchmark CPU inference.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    export_parser = commands.add_parser('export')
+    export_parser.add_argument('model', help="trained Keras model (.keras / .h5)")
+    export_parser.add_argument('output', help="output .tflite file")
+    export_parser.add_argument('--quantization', choices=QUANTIZATIONS, default='int8')
+    export_parser.add_argument('--calibration-dir', help="folder of *_sat.jpg tiles used for int8 calibration")
+    export_parser.add_argument('--calibration-samples', type=int, default=100)
+
+    benchmark_parser = commands.add_parser('benchmark')
+    benchmark_parser.add_argument('models', nargs='+', help="Keras and/or .tflite models to compare")
+    benchmark_parser.add_argument('--data-dir', required=True, help="folder of *_sat.jpg / *_mask.png pairs")
+    benchmark_parser.add_argument('--samples', type=int, default=32)
+    benchmark_parser.add_argument('--threads', type=int, default=None)
+    args = parser.parse_args()
+
+    if args.command == 'export':
+        calibration_tiles = None
+        if args.calibration_dir:
+            sat_images, _ = list_pairs(args.calibration_dir)
+            rng = np.random.default_rng(0)
+            sample = rng.choice(len(sat_images), min(args.calibration_samples, len(sat_images)), replace=False)
+            calibration_tiles = load_tiles([sat_images[i] for i in sample])
+        model = tf.keras.models.load_model(args.model, compile=False)
+        export_tflite(model, args.output, args.quantization, calibration_tiles)
+        print(f"{args.output} kaydedildi ({os.path.getsize(args.output) / 2 ** 20:.1f} MiB)")
+    else:
+        sat_images, mask_images = list_pairs(args.data_dir)
+        results = benchmark(args.models, sat_images[:args.samples], mask_images[:args.samples], args.threads)
+        print(f"{'model':>40} {'MiB':>8} {'ms/tile':>9} {'tiles/s':>8} {'peak MiB':>9} {'IoU':>6}")
+        for result in results:
+            size = '-' if result['size_bytes'] is None else f"{result['size_bytes'] / 2 ** 20:.1f}"
+            print(f"{os.path.basename(result['model']):>40} {size:>8} {result['latency_ms']:>9.1f} "
+                  f"{result['tiles_per_second']:>8.2f} {result['peak_memory_bytes'] / 2 ** 20:>9.1f} "
+                  f"{result['iou']:>6.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,63 @@
 import cv2
 import numpy as np
-from matplotlib import pyplot as plt
 
-# Görüntüleri yükleyelim
-sat_img_path = 'C:/Users/ata_k/Desktop/Bitirme/Data Set/archive/train/104_sat.jpg'
-mask_img_path = 'C:/Users/ata_k/Desktop/Bitirme/Data Set/archive/train/104_mask.png'
+# Canny kenar algılama eşikleri ve morfolojik işlemlerin varsayılan parametreleri
+LOWER_THRESHOLD = 50
+UPPER_THRESHOLD = 150
+KERNEL_SIZE = 5
+DILATION_ITERATIONS = 2
 
-# Uydu görüntüsü ve maske görüntüsünü okuyalım
-sat_image = cv2.imread(sat_img_path)
-mask_image = cv2.imread(mask_img_path, cv2.IMREAD_GRAYSCALE)
 
-# Görüntülerin boyutlarını kontrol edelim
-sat_image_shape = sat_image.shape[:2]
-mask_image_shape = mask_image.shape
+# Canny kenar algılama ve morfolojik kapatma/genişletme ile uydu görüntüsünden yol maskesi çıkarın
+# Dönüş: yol pikselleri 255, diğerleri 0 olan uint8 maske ve ara adımlar (kenarlar)
+def extract_roads(sat_image, lower_threshold=LOWER_THRESHOLD, upper_threshold=UPPER_THRESHOLD,
+                  kernel_size=KERNEL_SIZE, dilation_iterations=DILATION_ITERATIONS):
+    # Kenar algılama için Canny algoritmasını kullanacağız
+    edges = cv2.Canny(sat_image, lower_threshold, upper_threshold)
+
+    # Morfolojik işlemler için çekirdek (kernel) tanımlayalım
+    kernel = np.ones((kernel_size, kernel_size), np.uint8)
+
+    # Canny kenar algılama sonucunu iyileştirmek için morfolojik kapatma işlemi uygulayalım
+    closing = cv2.morphologyEx(edges, cv2.MORPH_CLOSE, kernel)
+
+    # Kapatma işlemi sonrası elde edilen maskenin üzerinde genişletme işlemi uygulayalım
+    dilation = cv2.dilate(closing, kernel, iterations=dilation_iterations)
+    return dilation, edges
+
+
+# Hough Çizgi Algılama ile kenarlardaki düz çizgileri bulun
+def detect_lines(edges, rho=1, theta=np.pi / 180, threshold=50, min_line_length=100, max_line_gap=10):
+    # rho: çizgilerin çözünürlüğü (pixel cinsinden), theta: açı çözünürlüğü (radyan cinsinden)
+    # threshold: eşik değer, bu değerden daha fazla kesişen noktaları olan çizgiler tespit edilecek
+    return cv2.HoughLinesP(edges, rho, theta, threshold, minLineLength=min_line_length, maxLineGap=max_line_gap)
+
+
+def main():
+    from matplotlib import pyplot as plt
+
+    # Görüntüleri yükleyelim
+    sat_img_path = 'C:/Users/ata_k/Desktop/Bitirme/Data Set/archive/train/104_sat.jpg'
+    mask_img_path = 'C:/Users/ata_k/Desktop/Bitirme/Data Set/archive/train/104_mask.png'
+
+    # Uydu görüntüsü ve maske görüntüsünü okuyalım
+    sat_image = cv2.imread(sat_img_path)
+    mask_image = cv2.imread(mask_img_path, cv2.IMREAD_GRAYSCALE)
 
-# Görüntülerin boyutlarını karşılaştıralım ve eşleşip eşleşmediğine bakalım
-matching_dimensions = sat_image_shape == mask_image_shape
+    # Görüntülerin boyutlarını kontrol edelim
+    sat_image_shape = sat_image.shape[:2]
+    mask_image_shape = mask_image.shape
+
+    # Görüntülerin boyutlarını karşılaştıralım ve eşleşip eşleşmediğine bakalım
+    matching_dimensions = sat_image_shape == mask_image_shape
+
+    # Eşleşme durumuna göre devam edip etmeyeceğimize karar verelim
+    if not matching_dimensions:
+        print(f"Görüntü boyutları uyuşmuyor. Uydu görüntüsü boyutları: {sat_image_shape}, Maske görüntüsü boyutları: {mask_image_shape}")
+        return
+
+    dilation, edges = extract_roads(sat_image)
 
-# Eşleşme durumuna göre devam edip etmeyeceğimize karar verelim
-if not matching_dimensions:
-    print(f"Görüntü boyutları uyuşmuyor. Uydu görüntüsü boyutları: {sat_image_shape}, Maske görüntüsü boyutları: {mask_image_shape}")
-else:
     # İlk görselleştirme (Uydu ve Maske Görüntüsü)
     plt.figure(figsize=(12, 6))
     plt.subplot(2, 2, 1)
@@ -30,11 +67,6 @@ else:
     plt.imshow(mask_image, cmap='gray')
     plt.title('Maske Görüntüsü')
 
-    # Kenar algılama için Canny algoritmasını kullanacağız
-    lower_threshold = 50
-    upper_threshold = 150
-    edges = cv2.Canny(sat_image, lower_threshold, upper_threshold)
-
     # İkinci görselleştirme (Canny Kenar Algılama Sonucu)
     plt.subplot(2, 2, 3)
     plt.imshow(cv2.cvtColor(sat_image, cv2.COLOR_BGR2RGB))
@@ -43,11 +75,7 @@ else:
     plt.imshow(edges, cmap='gray')
     plt.title('Canny Kenar Algılama Sonucu')
 
-    # Hough Çizgi Algılama işlemi için parametreleri belirleyelim
-    rho = 1  # çizgilerin çözünürlüğü (pixel cinsinden)
-    theta = np.pi / 180  # açı çözünürlüğü (radyan cinsinden)
-    threshold = 50  # eşik değer, bu değerden daha fazla kesişen noktaları olan çizgiler tespit edilecek
-    lines = cv2.HoughLinesP(edges, rho, theta, threshold, minLineLength=100, maxLineGap=10)
+    lines = detect_lines(edges)
 
     # Uydu görüntüsünün üzerine çizgileri çizelim
     sat_image_with_lines = sat_image.copy()
@@ -65,15 +93,6 @@ else:
     plt.imshow(mask_image, cmap='gray')
     plt.title('Gerçek Maske Görüntüsü')
 
-    # Morfolojik işlemler için çekirdek (kernel) tanımlayalım
-    kernel = np.ones((5, 5), np.uint8)
-
-    # Canny kenar algılama sonucunu iyileştirmek için morfolojik kapatma işlemi uygulayalım
-    closing = cv2.morphologyEx(edges, cv2.MORPH_CLOSE, kernel)
-
-    # Kapatma işlemi sonrası elde edilen maskenin üzerinde genişletme işlemi uygulayalım
-    dilation = cv2.dilate(closing, kernel, iterations=2)
-
     # Maskenin üzerine orijinal uydu görüntüsünü uygulayarak yolları çıkaralım
     road_extracted = cv2.bitwise_and(sat_image, sat_image, mask=dilation)
 
@@ -89,3 +108,7 @@ else:
     plt.imshow(cv2.cvtColor(road_extracted, cv2.COLOR_BGR2RGB))
     plt.title('Çıkarılmış Yol')
     plt.show()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,44 +1,45 @@
 import os
-import numpy as np
-import cv2
-from glob import glob
-from sklearn.model_selection import train_test_split
 from tensorflow.keras.optimizers import Adam
 from unet_model import unet_model
+from data_pipeline import list_pairs, make_dataset, split_pairs
+from dataset_shards import INDEX_FILE, ShardSequence, load_index, split_range
 
 # Veri yollarını tanımlayın
 data_path = 'C:/Users/ata_k/Desktop/Bitirme/Data Set/archive/train'
-sat_images = glob(os.path.join(data_path, '*_sat.jpg'))
-mask_images = [f.replace('_sat.jpg', '_mask.png') for f in sat_images]
-
-# Görüntüleri okuyun ve işleyin
-def load_image(path):
-    image = cv2.imread(path, cv2.IMREAD_COLOR)
-    image = cv2.resize(image, (256, 256))
-    image = image / 255.0
-    return image
-
-def load_mask(path):
-    mask = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
-    mask = cv2.resize(mask, (256, 256))
-    mask = mask > 128  # ikili maske oluştur
-    return np.expand_dims(mask, axis=-1)
-
-# Veri setlerini oluşturun
-X = np.array([load_image(p) for p in sat_images])
-y = np.array([load_mask(p) for p in mask_images])
-
-# Eğitim ve test setlerine ayırın
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.1)
+# dataset_shards.py ile önceden hazırlanmış parçaların klasörü; varsa görüntüler tekrar çözülmez
+shard_path = 'C:/Users/ata_k/Desktop/Bitirme/Data Set/archive/train_shards'
+batch_size = 32
+# CPU'da daha hızlı çalışan ince model için ör. width_multiplier = 0.25 ve separable = True
+width_multiplier = 1.0
+separable = False
+
+if os.path.exists(os.path.join(shard_path, INDEX_FILE)):
+    # Parçalar hazırlanırken karıştırıldığı için ayrım ardışık indis aralıklarıyla yapılır
+    (train_start, train_stop), (test_start, test_stop) = split_range(load_index(shard_path)['count'], test_size=0.1)
+    (train_start, train_stop), (val_start, val_stop) = split_range(train_stop, test_size=0.1)
+    train_dataset = ShardSequence(shard_path, batch_size, train_start, train_stop)
+    val_dataset = ShardSequence(shard_path, batch_size, val_start, val_stop, shuffle=False)
+    test_dataset = ShardSequence(shard_path, batch_size, test_start, test_stop, shuffle=False)
+else:
+    sat_images, mask_images = list_pairs(data_path)
+
+    # Eğitim, doğrulama ve test setlerine dosya listeleri üzerinden ayırın
+    (train_sat, train_mask), (test_sat, test_mask) = split_pairs(sat_images, mask_images, test_size=0.1)
+    (train_sat, train_mask), (val_sat, val_mask) = split_pairs(train_sat, train_mask, test_size=0.1)
+
+    # Görüntüler belleğe toplu olarak yüklenmek yerine eğitim sırasında akış halinde okunur
+    train_dataset = make_dataset(train_sat, train_mask, batch_size=batch_size)
+    val_dataset = make_dataset(val_sat, val_mask, batch_size=batch_size, shuffle=False)
+    test_dataset = make_dataset(test_sat, test_mask, batch_size=batch_size, shuffle=False)
 
 # Modeli oluşturun (unet_model fonksiyonunuzu buraya koyun)
-unet = unet_model(input_size=(256, 256, 3))
+unet = unet_model(input_size=(256, 256, 3), width_multiplier=width_multiplier, separable=separable)
 
 # Modeli derleyin
 unet.compile(optimizer=Adam(), loss='binary_crossentropy', metrics=['accuracy'])
 
 # Modeli eğitin
-unet.fit(X_train, y_train, batch_size=32, epochs=20, validation_split=0.1)
+unet.fit(train_dataset, epochs=20, validation_data=val_dataset)
 
 # Modeli değerlendirin
-unet.evaluate(X_test, y_test)
+unet.evaluate(test_dataset)
@@ -1,41 +1,51 @@
 import tensorflow as tf
-from tensorflow.keras.layers import Input, Conv2D, MaxPooling2D, UpSampling2D, Concatenate
+from tensorflow.keras.layers import Input, Conv2D, SeparableConv2D, MaxPooling2D, UpSampling2D, Concatenate
 from tensorflow.keras.models import Model
 
-def conv_block(input, num_filters):
-    x = Conv2D(num_filters, 3, activation='relu', padding='same', kernel_initializer='he_normal')(input)
-    x = Conv2D(num_filters, 3, activation='relu', padding='same', kernel_initializer='he_normal')(x)
+# separable=True ise 3x3 evrişimler derinlemesine ayrılabilir (depthwise separable) evrişimlerle değiştirilir;
+# CPU'da işlem ve parametre sayısı yaklaşık 8-9 kat azalır
+def conv_block(input, num_filters, separable=False):
+    layer = SeparableConv2D if separable else Conv2D
+    initializer = {'depthwise_initializer': 'he_normal', 'pointwise_initializer': 'he_normal'} if separable \
+        else {'kernel_initializer': 'he_normal'}
+    x = layer(num_filters, 3, activation='relu', padding='same', **initializer)(input)
+    x = layer(num_filters, 3, activation='relu', padding='same', **initializer)(x)
     return x
 
-def unet_model(input_size=(256, 256, 3)):
+# width_multiplier: bütün katmanlardaki filtre sayılarını ölçekler (ör. 0.25 ile 16 -> 256 filtre)
+def unet_model(input_size=(256, 256, 3), width_multiplier=1.0, separable=False):
+    def filters(count):
+        return max(8, int(round(count * width_multiplier)))
+
     inputs = Input(input_size)
 
     # İndirgeme yolu
-    c1 = conv_block(inputs, 64)
+    # Girişteki 3 kanallı katman ayrılabilir evrişimden kazanç sağlamadığı için her zaman normal evrişimdir
+    c1 = conv_block(inputs, filters(64))
     p1 = MaxPooling2D((2, 2))(c1)
-    c2 = conv_block(p1, 128)
+    c2 = conv_block(p1, filters(128), separable)
     p2 = MaxPooling2D((2, 2))(c2)
-    c3 = conv_block(p2, 256)
+    c3 = conv_block(p2, filters(256), separable)
     p3 = MaxPooling2D((2, 2))(c3)
-    c4 = conv_block(p3, 512)
+    c4 = conv_block(p3, filters(512), separable)
     p4 = MaxPooling2D(pool_size=(2, 2))(c4)
     
     # Köprü
-    c5 = conv_block(p4, 1024)
+    c5 = conv_block(p4, filters(1024), separable)
 
     # Genişleme yolu
     u6 = UpSampling2D((2, 2))(c5)
     u6 = Concatenate()([u6, c4])
-    c6 = conv_block(u6, 512)
+    c6 = conv_block(u6, filters(512), separable)
     u7 = UpSampling2D((2, 2))(c6)
     u7 = Concatenate()([u7, c3])
-    c7 = conv_block(u7, 256)
+    c7 = conv_block(u7, filters(256), separable)
     u8 = UpSampling2D((2, 2))(c7)
     u8 = Concatenate()([u8, c2])
-    c8 = conv_block(u8, 128)
+    c8 = conv_block(u8, filters(128), separable)
     u9 = UpSampling2D((2, 2))(c8)
     u9 = Concatenate()([u9, c1])
-    c9 = conv_block(u9, 64)
+    c9 = conv_block(u9, filters(64), separable)
 
     outputs = Conv2D(1, (1, 1), activation='sigmoid')(c9)
 
@@ -43,5 +53,7 @@ def unet_model(input_size=(256, 256, 3)):
     return model
 
 # Modeli oluştur
-unet = unet_model()
-unet.summary()
+# Diğer betikler bu modülü import ettiğinde model gereksiz yere oluşturulmasın
+if __name__ == "__main__":
+    unet = unet_model()
+    unet.summary()
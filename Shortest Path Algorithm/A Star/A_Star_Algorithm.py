@@ -1,11 +1,19 @@
-import itertools  # Importing itertools for efficient iteration
+import os  # Importing os for file path handling
+import sys  # Importing sys to make the shared modules importable
 import imageio  # Importing imageio for image input/output
 import numpy as np  # Importing NumPy for numerical operations
-from scipy.sparse import lil_matrix, csr_matrix  # Importing sparse matrices for memory efficiency
 from scipy.spatial.distance import cityblock  # Importing Manhattan distance for heuristic
-import matplotlib.pyplot as plt  # Importing matplotlib for visualization
 import heapq  # Importing heapq for the priority queue implementation
 import time  # Importing time for measuring elapsed time
+from functools import partial  # Importing partial to bind the default heuristic to the target
+
+# Modules shared by both path finders live in the "Common" folder
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'Common'))
+from road_graph import NEIGHBOUR_OFFSETS, NeighbourMask, build_adjacency_matrix, csr_neighbours  # Importing the CSR and bit-packed graph representations
+from graph_cache import GraphCache  # Importing the on-disk, memory-mapped graph cache
+from path_output import build_path_output, expand_polyline, reconstruct_path, simplify_polyline  # Importing the shared path output stage
+from road_index import RoadIndex  # Importing the component index used to snap endpoints and reject unreachable pairs
+from instrumentation import graph_footprint  # Importing the graph size measurement used by the stats records
 
 # Function to load an image from a file path
 def load_image(file_path): # - file_path (str): Resim dosyasının bulunduğu dosya yolunu içeren bir string.
@@ -56,50 +64,6 @@ def to_coordinates(index, width):
 # - tuple: Yükseklik (satır) ve genişlik (sütun) koordinatlarını içeren bir tuple.
 
 
-# Function to build an adjacency matrix representing the connectivity of pixels
-def build_adjacency_matrix(img):
-    img_size = img.size
-    adjacency = lil_matrix((img_size, img_size), dtype=bool)
-    # Fonksiyon: build_adjacency_matrix
-    # Açıklama: Resimdeki pikseller arasındaki bağlantıyı temsil eden bir komşuluk matrisi oluşturur.
-    # Parametreler:
-    # - img (ndarray): Giriş olarak verilen resim verisi, NumPy dizisi olarak.
-    # Dönüş:
-    # - csr_matrix: Pikseller arasındaki bağlantıyı temsil eden seyrek bir matris (Compressed Sparse Row formatında).
-
-    # Define 8-connected neighborhood directions
-    directions = list(itertools.product([0, 1, -1], [0, 1, -1]))
-
-    # Iterate over the image pixels
-    for i in range(1, img.shape[0] - 1):
-        for j in range(1, img.shape[1] - 1):
-            if not img[i, j]:
-                continue
-                # Döngü: Piksel İterasyonu
-                # Açıklama: Resimdeki pikselleri gezerek, siyah pikseller hariç olanları işler.
-                # İterasyonlar:
-                # - i: Yükseklik (satır) indeksi, 1'den resmin yüksekliği eksi bir değere kadar.
-                # - j: Genişlik (sütun) indeksi, 1'den resmin genişliği eksi bir değere kadar.
-                # Koşul:
-                # - Eğer piksel siyah değilse devam et, aksi halde geç.
-
-            # Connect the pixel to its neighbors in the adjacency matrix
-            for y_diff, x_diff in directions:
-                if img[i + y_diff, j + x_diff]:
-                    adjacency[to_index(i, j, img.shape[1]),
-                              to_index(i + y_diff, j + x_diff, img.shape[1])] = True
-
-    return adjacency.tocsr()
-# Döngü: Komşuluk Bağlantıları Oluşturma
-# Açıklama: Her pikseli, 8 yönlü komşularıyla bağlantı kurarak komşuluk matrisini oluşturur.
-# İterasyonlar:
-# - y_diff, x_diff: Yükseklik (satır) ve genişlik (sütun) yönlü farklarını temsil eden tuple.
-# Koşul:
-# - Eğer pikselin komşusu siyah ise, komşuluk matrisinde bağlantıyı işaretle (True).
-# Dönüş:
-# - csr_matrix: Pikseller arasındaki bağlantıyı temsil eden seyrek bir matris (Compressed Sparse Row formatında).
-
-
 # Heuristic function: Manhattan distance between two pixels
 def heuristic_cost_estimate(node, goal, flat_img):
     y1, x1 = to_coordinates(node, flat_img.shape[1])
@@ -116,28 +80,75 @@ def heuristic_cost_estimate(node, goal, flat_img):
 
 
 # A* algorithm to find the path between two pixels in the image
-def find_path_a_star(img, source, target):
-    adjacency = build_adjacency_matrix(img)
+def find_path_a_star(img, source, target, cache=None, simplify_tolerance=None, stats=None, road_index=None,
+                     landmarks=None, graph='csr'):
+    # Snap off-road endpoints and reject unreachable pairs before building anything when a RoadIndex is given
+    if road_index is not None:
+        source, target = road_index.resolve(source, target)
+
+    prebuilt_csr = hasattr(graph, 'indptr')
+    if not isinstance(graph, NeighbourMask) and not prebuilt_csr and graph not in ('csr', 'packed'):
+        raise ValueError(f"Unknown graph representation: {graph}")
+
+    # Reuse the graph stored in the cache instead of rebuilding it when a GraphCache is given
+    build_start_time = time.time()
+    if isinstance(graph, NeighbourMask):
+        adjacency = graph
+        neighbours_of = adjacency.neighbours
+    elif prebuilt_csr:
+        adjacency = graph
+        neighbours_of = partial(csr_neighbours, adjacency)
+    elif graph == 'packed':
+        adjacency = NeighbourMask(img)
+        neighbours_of = adjacency.neighbours
+    else:
+        adjacency = cache.get_or_build(img) if cache is not None else build_adjacency_matrix(img)
+        neighbours_of = partial(csr_neighbours, adjacency)
 
     start_time = time.time()
+    # Use the landmark lower bound when a LandmarkIndex is given, otherwise the Manhattan estimate
+    if landmarks is not None:
+        estimate = landmarks.heuristic(target)
+    else:
+        estimate = partial(heuristic_cost_estimate, goal=target, flat_img=img)
+
     queue = [(0, source)]
     closed_set = set()
     predecessors = {source: None}
     g_score = {source: 0}
+    heap_pushes = 1
+    heap_pops = 0
+    stale = 0
+    peak_open = 1
     # Fonksiyon: find_path_a_star
     # Açıklama: A* algoritması kullanarak iki piksel arasındaki yolu bulur ve zamanı ölçer.
     # Parametreler:
     # - img (ndarray): Giriş olarak verilen resim verisi, NumPy dizisi olarak.
     # - source (int): Başlangıç pikselinin 1D dizindeki indeksi.
     # - target (int): Hedef pikselinin 1D dizindeki indeksi.
+    # - cache (GraphCache): Verilirse komşuluk matrisi diskteki önbellekten bellek eşlemeli olarak okunur.
+    # - simplify_tolerance (float): Verilirse yol, Ramer-Douglas-Peucker ile bu toleransta sadeleştirilir.
+    # - stats (dict): Verilirse graf oluşturma, arama ve son işlem süreleri, yığın ve genişletme sayıları, en büyük
+    #   açık liste boyutu ve grafın kenar sayısı ile bellek boyutu yazılır (instrumentation.STAT_FIELDS).
+    # - road_index (RoadIndex): Verilirse yol dışındaki uç noktalar en yakın ulaşılabilir yol pikseline taşınır,
+    #   farklı yol parçalarındaki kaynak ve hedef aramadan önce ValueError ile reddedilir.
+    # - landmarks (LandmarkIndex): Verilirse Manhattan mesafesi yerine yer işaretlerinden üçgen eşitsizliğiyle
+    #   hesaplanan alt sınır kullanılır; yol yine en kısadır, genişletilen piksel sayısı çok daha azdır.
+    # - graph (str): 'csr' komşuluk matrisini, 'packed' ise piksel başına 1 baytlık bit paketli NeighbourMask'i
+    #   kullanır (cache bu durumda kullanılmaz). Önceden oluşturulmuş bir NeighbourMask veya CSR komşuluk matrisi
+    #   de verilebilir; bu durumda graf yeniden oluşturulmaz.
     # Dönüş:
-    # - tuple: Düzleştirilmiş yolu ve algoritmanın çalışma süresini içeren bir tuple.
+    # - tuple: Kaynaktan hedefe (y, x) piksel koordinatlarını ve algoritmanın çalışma süresini içeren bir tuple.
 
     while queue:
         current_cost, current_node = heapq.heappop(queue)
+        heap_pops += 1
 
         if current_node == target:
             break
+        if current_node in closed_set:
+            stale += 1
+            continue
 
         closed_set.add(current_node)
         # Döngü: A* Algoritması İterasyonları
@@ -147,11 +158,12 @@ def find_path_a_star(img, source, target):
         # - current_node: Şu anki pikselin 1D dizindeki indeksi, öncelikli kuyruktan çıkarıldığında elde edilir.
         # Koşul:
         # - Eğer şu anki piksel hedef piksel ise döngüden çık.
+        # - Eğer şu anki piksel daha önce değerlendirilmişse, kuyruktaki eski (stale) kaydı atla.
         # İzleme:
         # - closed_set: Zaten değerlendirilmiş piksellerin kümesi.
 
         # Iterate over neighbors of the current pixel
-        for neighbor in adjacency[current_node].nonzero()[1]:
+        for neighbor in neighbours_of(current_node):
             if neighbor in closed_set:
                 continue
 
@@ -160,16 +172,19 @@ def find_path_a_star(img, source, target):
             # Update the score if the new path to the neighbor is shorter
             if neighbor not in g_score or tentative_g_score < g_score[neighbor]:
                 g_score[neighbor] = tentative_g_score
-                f_score = tentative_g_score + heuristic_cost_estimate(neighbor, target, img)
+                f_score = tentative_g_score + estimate(neighbor)
                 heapq.heappush(queue, (f_score, neighbor))
+                heap_pushes += 1
                 predecessors[neighbor] = current_node
 
-    pixel_index = target
-    pixels_path = []
+        # The open list only grows while pushing, so checking once per expansion finds its peak
+        if len(queue) > peak_open:
+            peak_open = len(queue)
+
     # Döngü: Komşu Pikselleri İterasyonu ve Maliyet Güncelleme
     # Açıklama: Şu anki pikselin komşularını gezerek, maliyet güncellemeleri yapar ve öncelikli kuyruğa ekler.
     # İterasyonlar:
-    # - neighbor: Şu anki pikselin komşuları, komşuluk matrisinden elde edilir.
+    # - neighbor: Şu anki pikselin komşuları, komşuluk matrisinin satırından veya komşuluk baytının bitlerinden elde edilir.
     # Koşul:
     # - Eğer komşu piksel zaten değerlendirilmişse geç.
     # Maliyet Güncelleme:
@@ -178,45 +193,365 @@ def find_path_a_star(img, source, target):
     # - g_score: Başlangıç pikselinden her piksele olan maliyetin toplamını içeren sözlük.
     # - f_score: A* algoritmasındaki toplam maliyet, g_score ve sezgisel tahminin toplamı.
     # - predecessors: Her pikselin önceki pikselini içeren sözlük.
-    # - pixel_index: Hedef pikselin 1D dizindeki indeksi.
-    # - pixels_path: Başlangıç pikselinden hedef piksele olan yolun 1D dizin indekslerini içeren liste.
 
-    # Reconstruct the path from the target to the source
-    while pixel_index != source:
-        pixels_path.append(pixel_index)
-        pixel_index = predecessors[pixel_index]
+    # Reconstruct the path from the source to the target
+    search_end_time = time.time()
+    if stats is not None:
+        graph_nnz, graph_bytes = graph_footprint(adjacency)
+        stats.update(build_time=start_time - build_start_time, search_time=search_end_time - start_time,
+                     heap_pushes=heap_pushes, heap_pops=heap_pops, stale=stale, expanded=len(closed_set),
+                     peak_open=peak_open, graph_nnz=graph_nnz, graph_bytes=graph_bytes)
+
+    pixels_path = reconstruct_path(predecessors, source, target)
+
+    path = build_path_output(pixels_path, img.shape[1], simplify_tolerance)
+    end_time = time.time()
+
+    if stats is not None:
+        stats['postprocess_time'] = end_time - search_end_time
+
+    return path, end_time - start_time
+# Yolu Geri Oluşturma
+# Açıklama: Hedef pikselden başlangıç pikseline kadar önceki pikseller üzerinden geri yürür ve yolu
+# kaynaktan hedefe doğru sıralı, tam piksel zinciri olarak döndürür. Hedefe ulaşılamıyorsa ValueError oluşur.
+# İzleme:
+# - pixels_path: Başlangıç pikselinden hedef piksele olan yolun 1D dizin indeksleri (iki uç dahil).
+# - path: (y, x) koordinat dizisi; simplify_tolerance verilirse sadeleştirilmiş çoklu doğru.
+# - end_time: Algoritmanın tamamlanma zamanı.
+
+
+# Heuristics supported by the grid-native A*
+SQRT2 = 2 ** 0.5
+GRID_HEURISTICS = ('manhattan', 'octile')
+
+
+# Function to pad the mask with a black border so neighbours never need a bounds check
+def pad_road_mask(img):
+    padded_width = img.shape[1] + 2
+    road = np.zeros((img.shape[0] + 2, padded_width), dtype=bool)
+    road[1:-1, 1:-1] = img != 0
+    return road.ravel(), padded_width
+# Fonksiyon: pad_road_mask
+# Açıklama: Maskenin etrafına 1 piksellik siyah bir çerçeve ekler ve düzleştirir.
+# Dönüş:
+# - tuple: Düzleştirilmiş boolean yol maskesi ve çerçeveli resmin genişliği.
+
+
+# Grid-native A*: works directly on the 2D mask without building an adjacency matrix
+def find_path_a_star_grid(img, source, target, heuristic='manhattan', stats=None, simplify_tolerance=None,
+                          road_index=None):
+    if heuristic not in GRID_HEURISTICS:
+        raise ValueError(f"Unknown heuristic: {heuristic}")
+    if road_index is not None:
+        source, target = road_index.resolve(source, target)
+
+    build_start_time = time.time()
+    width = img.shape[1]
+    road, padded_width = pad_road_mask(img)
+    start_time = time.time()
+
+    # Neighbours are fixed offsets of the pixel id in the padded image
+    octile = heuristic == 'octile'
+    steps = [(y_diff * padded_width + x_diff, SQRT2 if octile and y_diff and x_diff else 1)
+             for y_diff, x_diff in NEIGHBOUR_OFFSETS]
+    diagonal_saving = SQRT2 - 2
 
-    pixels_path.reverse()
+    g_score = np.full(road.size, np.inf)
+    predecessors = np.full(road.size, -1, dtype=np.int64)
+    closed = np.zeros(road.size, dtype=bool)
 
-    smoothed_path = []
+    source_y, source_x = to_coordinates(source, width)
+    target_y, target_x = to_coordinates(target, width)
+    padded_source = to_index(source_y + 1, source_x + 1, padded_width)
+    padded_target = to_index(target_y + 1, target_x + 1, padded_width)
 
-    # Interpolate the path for smoother visualization
-    for pixel_index in pixels_path:
-        i, j = to_coordinates(pixel_index, img.shape[1])
-        smoothed_path.extend(zip(np.linspace(i, i + 1, 100), np.linspace(j, j + 1, 100)))
+    g_score[padded_source] = 0
+    queue = [(0, padded_source)]
+    heap_pushes = 1
+    heap_pops = 0
+    expanded = 0
+    peak_open = 1
 
-    smoothed_path = np.array(smoothed_path).astype(int)
+    while queue:
+        _, current_node = heapq.heappop(queue)
+        heap_pops += 1
+
+        if current_node == padded_target:
+            break
+        if closed[current_node]:
+            continue
+
+        closed[current_node] = True
+        current_g_score = g_score[current_node]
+        expanded += 1
+        if len(queue) > peak_open:
+            peak_open = len(queue)
+
+        for offset, step_cost in steps:
+            neighbor = current_node + offset
+            if not road[neighbor] or closed[neighbor]:
+                continue
+
+            tentative_g_score = current_g_score + step_cost
+            if tentative_g_score < g_score[neighbor]:
+                g_score[neighbor] = tentative_g_score
+                predecessors[neighbor] = current_node
+
+                # Inlined heuristic: Manhattan or octile distance to the target
+                neighbor_y, neighbor_x = divmod(neighbor, padded_width)
+                dy = abs(neighbor_y - target_y - 1)
+                dx = abs(neighbor_x - target_x - 1)
+                if octile:
+                    h_score = dy + dx + diagonal_saving * min(dy, dx)
+                else:
+                    h_score = dy + dx
+                heapq.heappush(queue, (tentative_g_score + h_score, neighbor))
+                heap_pushes += 1
+
+    # Reconstruct the path in padded pixel ids and drop the padding when converting to coordinates
+    search_end_time = time.time()
+    if stats is not None:
+        # Every pop that is neither an expansion nor the target is a stale entry of an already closed pixel
+        stats.update(build_time=start_time - build_start_time, search_time=search_end_time - start_time,
+                     heap_pushes=heap_pushes, heap_pops=heap_pops,
+                     stale=heap_pops - expanded - (current_node == padded_target), expanded=expanded,
+                     peak_open=peak_open, graph_nnz=None, graph_bytes=road.nbytes)
+
+    pixels_path = reconstruct_path(predecessors, padded_source, padded_target)
+
+    path = build_path_output(pixels_path, width, simplify_tolerance, padding=1)
     end_time = time.time()
 
-    return smoothed_path, end_time - start_time
-# Döngü: Yolu Geri Oluşturma ve Düzleştirme
-# Açıklama: Hedef pikselden başlangıç pikseline kadar olan yolu önce geriye oluşturur, sonra düzleştirir.
-# İterasyonlar:
-# - pixel_index: Hedef pikselden başlangıç pikseline kadar olan yolu temsil eden piksellerin 1D dizindeki indeksleri.
-# Geri Oluşturma:
-# - Her bir pikselin önceki pikselini kullanarak yolu geriye oluşturur.
-# Düzleştirme:
-# - Her bir pikselin koordinatlarını alarak, 100 ara nokta ile bir çizgi oluşturur.
-# - Oluşturulan çizgileri birleştirerek düzleştirilmiş bir yolu elde eder.
+    if stats is not None:
+        stats['postprocess_time'] = end_time - search_end_time
+
+    return path, end_time - start_time
+# Fonksiyon: find_path_a_star_grid
+# Açıklama: Komşuluk matrisi oluşturmadan, doğrudan 2D maske üzerinde çalışan A* algoritması.
+# Parametreler:
+# - img (ndarray): Giriş olarak verilen resim verisi, NumPy dizisi olarak.
+# - source (int): Başlangıç pikselinin 1D dizindeki indeksi.
+# - target (int): Hedef pikselinin 1D dizindeki indeksi.
+# - heuristic (str): 'manhattan' (her adım 1 maliyetli, find_path_a_star ile aynı) veya
+#   'octile' (çapraz adımlar sqrt(2) maliyetli, sezgisel tahmin octile mesafe).
+# - stats (dict): Verilirse maske hazırlama, arama ve son işlem süreleri, yığına ekleme/çıkarma, eski kayıt ve
+#   genişletilen düğüm sayıları, en büyük açık liste ile maskenin bellek boyutu buraya yazılır.
+# - simplify_tolerance (float): Verilirse yol, Ramer-Douglas-Peucker ile bu toleransta sadeleştirilir.
+# - road_index (RoadIndex): Verilirse uç noktalar yola taşınır ve ulaşılamayan çiftler aramadan önce reddedilir.
 # İzleme:
-# - smoothed_path: Başlangıç pikselinden hedef piksele olan düzleştirilmiş yol.
-# - i, j: Her bir pikselin yükseklik (satır) ve genişlik (sütun) koordinatları.
-# - np.linspace: İki koordinat arasında belirtilen sayıda eşit aralıklı ara nokta oluşturan NumPy fonksiyonu.
-# - end_time: Algoritmanın tamamlanma zamanı.
+# - road: Kenarına siyah çerçeve eklenmiş ve düzleştirilmiş maske; komşular sabit indis kaymalarıyla bulunur.
+# - g_score, predecessors, closed: Piksel indisiyle erişilen, önceden ayrılmış düz NumPy dizileri.
+# Dönüş:
+# - tuple: Kaynaktan hedefe (y, x) piksel koordinatlarını ve algoritmanın çalışma süresini içeren bir tuple.
+
+
+# Jump Point Search: moves in one direction from the padded pixel until a jump point is found
+def _jump(road, padded_width, node, y_diff, x_diff, goal):
+    vertical = y_diff * padded_width
+    step = vertical + x_diff
+
+    while True:
+        node += step
+        if not road[node]:
+            return -1
+        if node == goal:
+            return node
+
+        if y_diff and x_diff:
+            # Diagonal move: stop at forced neighbours or when a straight jump finds something
+            if (not road[node - x_diff] and road[node - x_diff + vertical]) or \
+                    (not road[node - vertical] and road[node + x_diff - vertical]):
+                return node
+            if _jump(road, padded_width, node, 0, x_diff, goal) >= 0 or \
+                    _jump(road, padded_width, node, y_diff, 0, goal) >= 0:
+                return node
+        elif x_diff:
+            # Horizontal move
+            if (not road[node + padded_width] and road[node + padded_width + x_diff]) or \
+                    (not road[node - padded_width] and road[node - padded_width + x_diff]):
+                return node
+        else:
+            # Vertical move
+            if (not road[node + 1] and road[node + 1 + vertical]) or \
+                    (not road[node - 1] and road[node - 1 + vertical]):
+                return node
+# Fonksiyon: _jump
+# Açıklama: Verilen yönde, zorunlu (forced) komşusu olan veya hedef olan ilk piksele kadar atlar.
+# Dönüş:
+# - int: Bulunan atlama noktasının çerçeveli resimdeki indeksi, bulunamazsa -1.
+
+
+# Directions worth searching from a jump point, given the direction it was reached from
+def _pruned_directions(road, padded_width, node, parent):
+    if parent < 0:
+        return [(y_diff, x_diff) for y_diff, x_diff in NEIGHBOUR_OFFSETS
+                if road[node + y_diff * padded_width + x_diff]]
+
+    node_y, node_x = divmod(node, padded_width)
+    parent_y, parent_x = divmod(parent, padded_width)
+    y_diff = (node_y > parent_y) - (node_y < parent_y)
+    x_diff = (node_x > parent_x) - (node_x < parent_x)
+    vertical = y_diff * padded_width
+    directions = []
+
+    if y_diff and x_diff:
+        # Natural neighbours of a diagonal move plus the two possible forced neighbours
+        if road[node + vertical]:
+            directions.append((y_diff, 0))
+        if road[node + x_diff]:
+            directions.append((0, x_diff))
+        if road[node + vertical + x_diff]:
+            directions.append((y_diff, x_diff))
+        if not road[node - x_diff] and road[node - x_diff + vertical]:
+            directions.append((y_diff, -x_diff))
+        if not road[node - vertical] and road[node + x_diff - vertical]:
+            directions.append((-y_diff, x_diff))
+    elif x_diff:
+        if road[node + x_diff]:
+            directions.append((0, x_diff))
+        if not road[node + padded_width] and road[node + padded_width + x_diff]:
+            directions.append((1, x_diff))
+        if not road[node - padded_width] and road[node - padded_width + x_diff]:
+            directions.append((-1, x_diff))
+    else:
+        if road[node + vertical]:
+            directions.append((y_diff, 0))
+        if not road[node + 1] and road[node + 1 + vertical]:
+            directions.append((y_diff, 1))
+        if not road[node - 1] and road[node - 1 + vertical]:
+            directions.append((y_diff, -1))
+
+    return directions
+# Fonksiyon: _pruned_directions
+# Açıklama: Simetrik yolları elemek için yalnızca doğal ve zorunlu komşuların yönlerini döndürür.
+
+
+# Jump Point Search: optimal 8-connected paths with octile costs and far fewer heap operations
+def find_path_jps(img, source, target, stats=None, simplify_tolerance=None, road_index=None):
+    # NumPy integer endpoints would make the direction signs in _pruned_directions NumPy scalars
+    source, target = int(source), int(target)
+    if road_index is not None:
+        source, target = road_index.resolve(source, target)
+    build_start_time = time.time()
+    width = img.shape[1]
+    road, padded_width = pad_road_mask(img)
+    # A bytearray is much faster than a NumPy array for the scalar reads done while jumping
+    road = bytearray(road)
+    start_time = time.time()
+
+    g_score = np.full(len(road), np.inf)
+    predecessors = np.full(len(road), -1, dtype=np.int64)
+    closed = np.zeros(len(road), dtype=bool)
+
+    source_y, source_x = to_coordinates(source, width)
+    target_y, target_x = to_coordinates(target, width)
+    padded_source = to_index(source_y + 1, source_x + 1, padded_width)
+    padded_target = to_index(target_y + 1, target_x + 1, padded_width)
+    diagonal_saving = SQRT2 - 2
+
+    g_score[padded_source] = 0
+    queue = [(0, padded_source)]
+    heap_pushes = 1
+    heap_pops = 0
+    expanded = 0
+    peak_open = 1
+
+    while queue:
+        _, current_node = heapq.heappop(queue)
+        heap_pops += 1
+
+        if current_node == padded_target:
+            break
+        if closed[current_node]:
+            continue
+
+        closed[current_node] = True
+        current_g_score = g_score[current_node]
+        expanded += 1
+        if len(queue) > peak_open:
+            peak_open = len(queue)
+        current_y, current_x = divmod(current_node, padded_width)
+
+        directions = _pruned_directions(road, padded_width, current_node, int(predecessors[current_node]))
+        for y_diff, x_diff in directions:
+            jump_point = _jump(road, padded_width, current_node, y_diff, x_diff, padded_target)
+            if jump_point < 0 or closed[jump_point]:
+                continue
+
+            # Jump points are reached along a straight or diagonal run, so the cost is the octile distance
+            jump_y, jump_x = divmod(jump_point, padded_width)
+            dy = abs(jump_y - current_y)
+            dx = abs(jump_x - current_x)
+            tentative_g_score = current_g_score + dy + dx + diagonal_saving * min(dy, dx)
+
+            if tentative_g_score < g_score[jump_point]:
+                g_score[jump_point] = tentative_g_score
+                predecessors[jump_point] = current_node
+
+                dy = abs(jump_y - target_y - 1)
+                dx = abs(jump_x - target_x - 1)
+                heapq.heappush(queue, (tentative_g_score + dy + dx + diagonal_saving * min(dy, dx), jump_point))
+                heap_pushes += 1
+
+    # Expand the straight and diagonal runs between consecutive jump points back into pixels
+    search_end_time = time.time()
+    if stats is not None:
+        stats.update(build_time=start_time - build_start_time, search_time=search_end_time - start_time,
+                     heap_pushes=heap_pushes, heap_pops=heap_pops,
+                     stale=heap_pops - expanded - (current_node == padded_target), expanded=expanded,
+                     peak_open=peak_open, graph_nnz=None, graph_bytes=len(road))
+
+    jump_points = build_path_output(reconstruct_path(predecessors, padded_source, padded_target), width, padding=1)
+    path = expand_polyline(jump_points)
+    if simplify_tolerance is not None:
+        path = simplify_polyline(path, simplify_tolerance)
+    end_time = time.time()
+
+    if stats is not None:
+        stats['postprocess_time'] = end_time - search_end_time
+
+    return path, end_time - start_time
+# Fonksiyon: find_path_jps
+# Açıklama: Jump Point Search ile, build_adjacency_matrix ile aynı 8 yönlü bağlantıyı kullanarak en kısa yolu bulur.
+# Düz ve çapraz koridorlarda piksel piksel ilerlemek yerine atlama noktalarına sıçrar; simetrik yollar elenir.
+# Çapraz adımlar sqrt(2) maliyetlidir, bu yüzden sonuç find_path_a_star_grid(..., heuristic='octile') ile aynı uzunluktadır.
+# Parametreler:
+# - img (ndarray): Giriş olarak verilen resim verisi, NumPy dizisi olarak.
+# - source (int): Başlangıç pikselinin 1D dizindeki indeksi.
+# - target (int): Hedef pikselinin 1D dizindeki indeksi.
+# - stats (dict): Verilirse maske hazırlama, arama ve son işlem süreleri, yığına ekleme/çıkarma, eski kayıt ve
+#   genişletilen düğüm sayıları, en büyük açık liste ile maskenin bellek boyutu buraya yazılır.
+# - simplify_tolerance (float): Verilirse yol, Ramer-Douglas-Peucker ile bu toleransta sadeleştirilir.
+# - road_index (RoadIndex): Verilirse uç noktalar yola taşınır ve ulaşılamayan çiftler aramadan önce reddedilir.
+# Dönüş:
+# - tuple: Kaynaktan hedefe (y, x) piksel koordinatlarını ve algoritmanın çalışma süresini içeren bir tuple.
+
+
+# Function to compare Jump Point Search against the grid A* on the same queries
+def benchmark_jps(img, pairs):
+    rows = []
+    for source, target in pairs:
+        for name in ('a_star_octile', 'jps'):
+            stats = {}
+            if name == 'jps':
+                path, elapsed_time = find_path_jps(img, source, target, stats=stats)
+            else:
+                path, elapsed_time = find_path_a_star_grid(img, source, target, heuristic='octile', stats=stats)
+
+            rows.append((name, source, target, len(path), elapsed_time,
+                         stats['heap_pushes'], stats['heap_pops'], stats['expanded']))
+            print(f"{name:>14} {source:>9} -> {target:<9} pixels={rows[-1][3]:<6} time={elapsed_time:.4f}s "
+                  f"pushes={stats['heap_pushes']:<8} pops={stats['heap_pops']:<8} expanded={stats['expanded']}")
+    return rows
+# Fonksiyon: benchmark_jps
+# Açıklama: Aynı sorgular üzerinde JPS ile octile A*'ın süresini ve yığın (heap) işlemlerini karşılaştırır.
+# Dönüş:
+# - list: (algoritma, kaynak, hedef, yol piksel sayısı, süre, ekleme, çıkarma, genişletilen) satırları.
 
 
 # Function to visualize the original image and the computed path
 def visualize_path(original_img, path):
+    import matplotlib.pyplot as plt  # Imported here so that path finding alone does not load matplotlib
     plt.imshow(original_img, cmap='gray' if len(original_img.shape) == 2 else None)
 
     path_array = np.array(path)
@@ -227,7 +562,7 @@ def visualize_path(original_img, path):
     # Açıklama: Orijinal resmi ve hesaplanan yolu görselleştirir.
     # Parametreler:
     # - original_img (ndarray): Görselleştirilecek orijinal resim verisi, NumPy dizisi olarak.
-    # - path (ndarray): Görselleştirilecek yolu temsil eden düzleştirilmiş piksel koordinatları, NumPy dizisi olarak.
+    # - path (ndarray): Görselleştirilecek yolun kaynaktan hedefe (y, x) piksel koordinatları, NumPy dizisi olarak.
     # Görselleştirme:
     # - Orijinal resmi gri tonlama (grayscale) veya renkli olarak gösterir.
     # - Hesaplanan yolu mavi renkte ve belirtilen kalınlıkta (linewidth) çizer.
@@ -248,8 +583,11 @@ def main():
     target_x = 930
     target = to_index(target_y, target_x, original_img.shape[1])
 
-    # Find the path and measure the elapsed time
-    path, elapsed_time = find_path_a_star(flat_img, source, target)
+    # Snap off-road endpoints and reject pairs in different road components before searching
+    road_index = RoadIndex(flat_img)
+
+    # Find the path and measure the elapsed time (find_path_a_star uses the adjacency matrix instead)
+    path, elapsed_time = find_path_a_star_grid(flat_img, source, target, heuristic='manhattan', road_index=road_index)
 
     # Visualize the original image with the computed path
     visualize_path(original_img, path)
@@ -263,7 +601,7 @@ def main():
     # - source: Başlangıç noktasının 1D dizindeki indeksi.
     # - target_y, target_x: Hedef noktasının yükseklik (satır) ve genişlik (sütun) koordinatları.
     # - target: Hedef noktasının 1D dizindeki indeksi.
-    # - path: Başlangıç ve hedef noktaları arasındaki yolu içeren düzleştirilmiş piksel koordinatları.
+    # - path: Başlangıç ve hedef noktaları arasındaki yolun (y, x) piksel koordinatları.
     # - elapsed_time: Algoritmanın çalışma süresi.
     # - visualize_path: Hesaplanan yolu ve orijinal resmi görselleştiren fonksiyon.
 
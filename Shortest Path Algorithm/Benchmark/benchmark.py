@@ -0,0 +1,292 @@
+import argparse  # Komut satırı seçenekleri için argparse modülü import ediliyor.
+import json  # Sonuçları makine tarafından okunabilir olarak kaydetmek için json modülü import ediliyor.
+import os  # Dosya yolu işlemleri için os modülü import ediliyor.
+import platform  # Sonuçlara makine bilgisini eklemek için platform modülü import ediliyor.
+import sys  # Yol bulucuların bulunduğu klasörleri arama yoluna eklemek için sys modülü import ediliyor.
+import time  # Zaman ölçümleri için time modülü import ediliyor.
+import tracemalloc  # En yüksek bellek kullanımını ölçmek için tracemalloc modülü import ediliyor.
+from functools import partial  # Yol bulucuları ortak bir imzaya bağlamak için partial import ediliyor.
+import numpy as np  # Sayısal hesaplamalar için numpy modülü import ediliyor.
+from scipy import ndimage  # Bağlı yol parçalarını etiketlemek için ndimage modülü import ediliyor.
+
+# Karşılaştırılan yol bulucular "Dijkstra" ve "A Star" klasörlerinde bulunuyor.
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.append(os.path.join(BASE_DIR, 'Dijkstra'))
+sys.path.append(os.path.join(BASE_DIR, 'A Star'))
+import dijkstra as dijkstra_routing  # Dijkstra tabanlı yol bulucular import ediliyor.
+import A_Star_Algorithm as a_star_routing  # A* ve Jump Point Search yol bulucuları import ediliyor.
+from landmarks import LandmarkIndex  # ALT yer işareti ön işlemesi import ediliyor.
+from instrumentation import STAT_FIELDS  # Yol bulucuların stats sözlüğüne yazdığı alanlar import ediliyor.
+
+
+def _find_path_a_star_landmarks(img, source, target, **kwargs):
+    # Yer işaretleri maske başına bir kez hesaplanır ve tekrarlanan sorgularda yeniden kullanılır;
+    # ön işleme süresi sorgu ölçümlerine dahil edilmez.
+    key = (img.shape, hash(img.tobytes()))
+    if key not in _LANDMARKS:
+        _LANDMARKS.clear()
+        _LANDMARKS[key] = LandmarkIndex(img)
+    return a_star_routing.find_path_a_star(img, source, target, landmarks=_LANDMARKS[key], **kwargs)
+
+
+_LANDMARKS = {}
+
+# Her yol bulucu (img, source, target, stats) imzasıyla çağrılır ve (path, elapsed) döndürür.
+ENGINES = {
+    'dijkstra_full': partial(dijkstra_routing.find_path, mode='full'),
+    'dijkstra_early': partial(dijkstra_routing.find_path, mode='early'),
+    'dijkstra_bidirectional': partial(dijkstra_routing.find_path, mode='bidirectional'),
+    'dijkstra_packed': partial(dijkstra_routing.find_path, mode='early', graph='packed'),
+    'dijkstra_weighted': partial(dijkstra_routing.find_path, mode='weighted'),
+    'a_star_graph': a_star_routing.find_path_a_star,
+    'a_star_landmarks': _find_path_a_star_landmarks,
+    'a_star_packed': partial(a_star_routing.find_path_a_star, graph='packed'),
+    'a_star_grid': partial(a_star_routing.find_path_a_star_grid, heuristic='manhattan'),
+    'a_star_octile': partial(a_star_routing.find_path_a_star_grid, heuristic='octile'),
+    'jps': a_star_routing.find_path_jps,
+}
+
+MASK_KINDS = ('grid', 'streets', 'corridor', 'components')
+DEFAULT_SIZES = (256, 512, 1024)
+DEFAULT_QUERIES = 8
+DEFAULT_SEED = 498
+
+# "components" maskesinde farklı yol ağlarına düşen, yani ulaşılamaz olan sorguların oranı.
+UNREACHABLE_SHARE = {'components': 0.25}
+
+
+def _draw_line(mask, start, end, thickness):
+    # İki nokta arasına verilen kalınlıkta düz bir yol çiz.
+    steps = int(max(abs(end[0] - start[0]), abs(end[1] - start[1]))) + 1
+    y = np.rint(np.linspace(start[0], end[0], steps)).astype(int)
+    x = np.rint(np.linspace(start[1], end[1], steps)).astype(int)
+    for y_diff in range(thickness):
+        for x_diff in range(thickness):
+            mask[np.clip(y + y_diff, 0, mask.shape[0] - 1), np.clip(x + x_diff, 0, mask.shape[1] - 1)] = 255
+
+
+def grid_mask(size, rng, spacing=32, thickness=3):
+    # Düzenli aralıklarla yatay ve dikey yollardan oluşan şehir ızgarası.
+    mask = np.zeros((size, size), dtype=np.uint8)
+    for offset in range(spacing // 2, size, spacing):
+        mask[offset:offset + thickness, :] = 255
+        mask[:, offset:offset + thickness] = 255
+    return mask
+
+
+def streets_mask(size, rng, street_count=None):
+    # Rastgele uzunluk, yön ve kalınlıkta çizilen sokaklardan oluşan düzensiz yol ağı.
+    mask = np.zeros((size, size), dtype=np.uint8)
+    if street_count is None:
+        street_count = size // 8
+    for _ in range(street_count):
+        start = rng.integers(0, size, 2)
+        angle = rng.uniform(0, np.pi)
+        length = rng.uniform(size / 8, size / 2)
+        end = np.clip(start + length * np.array([np.sin(angle), np.cos(angle)]), 0, size - 1)
+        _draw_line(mask, start, end, int(rng.integers(1, 4)))
+    return mask
+
+
+def corridor_mask(size, rng, spacing=16, thickness=2):
+    # Uçtan uca tek bir yılankavi koridor; kısa kuş uçuşu mesafeler çok uzun yollara karşılık gelir.
+    mask = np.zeros((size, size), dtype=np.uint8)
+    rows = list(range(spacing // 2, size - thickness, spacing))
+    for number, row in enumerate(rows):
+        mask[row:row + thickness, spacing // 2:size - spacing // 2] = 255
+        if number + 1 < len(rows):
+            column = size - spacing // 2 - thickness if number % 2 == 0 else spacing // 2
+            mask[row:rows[number + 1] + thickness, column:column + thickness] = 255
+    return mask
+
+
+def components_mask(size, rng, parts=4):
+    # Birbirine bağlı olmayan ayrı yol ağları; sorguların bir kısmı ulaşılamaz olur.
+    mask = np.zeros((size, size), dtype=np.uint8)
+    part_size = size // parts
+    for row in range(parts):
+        for column in range(parts):
+            if (row + column) % 2:
+                continue
+            block = streets_mask(part_size - 4, rng, street_count=max(4, part_size // 8))
+            y0, x0 = row * part_size + 2, column * part_size + 2
+            mask[y0:y0 + block.shape[0], x0:x0 + block.shape[1]] = block
+    return mask
+
+
+MASK_BUILDERS = {
+    'grid': grid_mask,
+    'streets': streets_mask,
+    'corridor': corridor_mask,
+    'components': components_mask,
+}
+
+
+def generate_mask(kind, size, seed=DEFAULT_SEED):
+    # Aynı tür, boyut ve tohum (seed) için her zaman aynı maskeyi üret.
+    rng = np.random.default_rng([seed, MASK_KINDS.index(kind), size])
+    return MASK_BUILDERS[kind](size, rng)
+
+
+def generate_queries(mask, count, seed=DEFAULT_SEED, unreachable_share=0.0):
+    # Yol pikselleri arasından sabit bir (kaynak, hedef) piksel indisi çiftleri kümesi seç.
+    # Ulaşılabilir sorgular aynı 8 yönlü bağlı yol parçasından seçilir; kaynaklar en büyük parçadan alınır.
+    # unreachable_share oranındaki sorgular ise bilerek farklı parçalardan seçilir.
+    labels, component_count = ndimage.label(mask, structure=np.ones((3, 3)))
+    labels = labels.ravel()
+    road_pixels = np.flatnonzero(labels)
+    road_labels = labels[road_pixels]
+    rng = np.random.default_rng([seed, mask.shape[0], mask.shape[1], len(road_pixels)])
+
+    largest = np.argmax(np.bincount(road_labels)[1:]) + 1
+    largest_pixels = road_pixels[road_labels == largest]
+    unreachable_count = int(round(count * unreachable_share)) if component_count > 1 else 0
+    pairs = []
+    for query_number in range(count):
+        if query_number < unreachable_count:
+            source = int(rng.choice(road_pixels))
+            target = int(rng.choice(road_pixels[road_labels != labels[source]]))
+        else:
+            source, target = (int(pixel) for pixel in rng.choice(largest_pixels, 2))
+        pairs.append((source, target))
+    return pairs
+
+
+def run_query(engine, mask, source, target, measure_memory=True):
+    # Tek bir sorguyu çalıştır ve ölçümleri bir sözlük olarak döndür.
+    # Bellek ölçümü zamanlamayı bozmasın diye, istenirse sorgu tracemalloc altında ikinci kez çalıştırılır.
+    stats = {}
+    start_time = time.perf_counter()
+    try:
+        path, _ = ENGINES[engine](mask, source, target, stats=stats)
+    except ValueError:
+        path = None
+    total_time = time.perf_counter() - start_time
+
+    record = {field: stats.get(field) for field in STAT_FIELDS}
+    record.update(total_time=total_time, reachable=path is not None,
+                  path_pixels=None if path is None else len(path), peak_memory=None)
+
+    if measure_memory:
+        tracemalloc.start()
+        try:
+            ENGINES[engine](mask, source, target, stats={})
+        except ValueError:
+            pass
+        record['peak_memory'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return record
+
+
+def run_benchmark(engines, kinds=MASK_KINDS, sizes=DEFAULT_SIZES, queries=DEFAULT_QUERIES,
+                  seed=DEFAULT_SEED, measure_memory=True):
+    # Her maske türü, boyut ve yol bulucu için sabit sorgu kümesini çalıştır.
+    # Dönüş: her sorgu için bir kayıt içeren liste.
+    records = []
+    for kind in kinds:
+        for size in sizes:
+            mask = generate_mask(kind, size, seed)
+            pairs = generate_queries(mask, queries, seed, UNREACHABLE_SHARE.get(kind, 0.0))
+            for engine in engines:
+                for query_number, (source, target) in enumerate(pairs):
+                    record = {'mask': kind, 'size': size, 'engine': engine, 'query': query_number,
+                              'source': source, 'target': target}
+                    record.update(run_query(engine, mask, source, target, measure_memory))
+                    records.append(record)
+    return records
+
+
+def summarize(records):
+    # Kayıtları (maske, boyut, yol bulucu) gruplarına ayır ve medyan değerlerini hesapla.
+    groups = {}
+    for record in records:
+        groups.setdefault((record['mask'], record['size'], record['engine']), []).append(record)
+
+    summary = []
+    for (kind, size, engine), members in groups.items():
+        row = {'mask': kind, 'size': size, 'engine': engine, 'queries': len(members),
+               'reachable': sum(member['reachable'] for member in members)}
+        for field in STAT_FIELDS + ('total_time', 'peak_memory'):
+            values = [member[field] for member in members if member[field] is not None]
+            row[field] = float(np.median(values)) if values else None
+        summary.append(row)
+    return summary
+
+
+def print_summary(summary):
+    # Medyan değerleri okunabilir bir tablo olarak yazdır.
+    def cell(value, scale=1.0, digits=2):
+        return '-' if value is None else f"{value * scale:.{digits}f}"
+
+    print(f"{'mask':>10} {'size':>5} {'engine':>22} {'build ms':>9} {'search ms':>10} {'post ms':>8} "
+          f"{'total ms':>9} {'expanded':>9} {'peak MiB':>9} {'reach':>6}")
+    for row in summary:
+        print(f"{row['mask']:>10} {row['size']:>5} {row['engine']:>22} {cell(row['build_time'], 1e3):>9} "
+              f"{cell(row['search_time'], 1e3):>10} {cell(row['postprocess_time'], 1e3):>8} "
+              f"{cell(row['total_time'], 1e3):>9} {cell(row['expanded'], digits=0):>9} {cell(row['peak_memory'], 1 / 2 ** 20):>9} "
+              f"{row['reachable']:>3}/{row['queries']:<2}")
+
+
+def save_results(output_path, records):
+    # Her sorgunun kaydını JSON Lines biçiminde, ilk satırda çalışma bilgileriyle birlikte kaydet.
+    header = {'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'python': platform.python_version(),
+              'numpy': np.__version__, 'machine': platform.machine(), 'processor': platform.processor()}
+    with open(output_path, 'w') as output_file:
+        output_file.write(json.dumps({'run': header}) + '\n')
+        for record in records:
+            output_file.write(json.dumps(record) + '\n')
+
+
+def load_results(input_path):
+    # save_results ile kaydedilen dosyadaki sorgu kayıtlarını oku.
+    with open(input_path) as input_file:
+        rows = [json.loads(line) for line in input_file if line.strip()]
+    return [row for row in rows if 'run' not in row]
+
+
+def find_regressions(baseline_records, records, field='search_time', tolerance=0.25):
+    # Medyan değeri temel ölçüme göre tolerance oranından fazla artan grupları döndür.
+    baseline = {(row['mask'], row['size'], row['engine']): row for row in summarize(baseline_records)}
+    regressions = []
+    for row in summarize(records):
+        previous = baseline.get((row['mask'], row['size'], row['engine']))
+        if previous is None or previous[field] is None or row[field] is None or not previous[field]:
+            continue
+        ratio = row[field] / previous[field]
+        if ratio > 1 + tolerance:
+            regressions.append((row['mask'], row['size'], row['engine'], previous[field], row[field], ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the shortest path engines on synthetic road masks.")
+    parser.add_argument('--engines', nargs='+', choices=sorted(ENGINES), default=list(ENGINES))
+    parser.add_argument('--masks', nargs='+', choices=MASK_KINDS, default=list(MASK_KINDS))
+    parser.add_argument('--sizes', nargs='+', type=int, default=list(DEFAULT_SIZES))
+    parser.add_argument('--queries', type=int, default=DEFAULT_QUERIES, help="queries per mask")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc peak memory pass")
+    parser.add_argument('--output', help="write per-query results as JSON lines to this file")
+    parser.add_argument('--baseline', help="compare median search times against a previous --output file")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed slowdown against the baseline")
+    args = parser.parse_args()
+
+    records = run_benchmark(args.engines, args.masks, args.sizes, args.queries, args.seed,
+                            measure_memory=not args.no_memory)
+    print_summary(summarize(records))
+
+    if args.output:
+        save_results(args.output, records)
+        print(f"Saved {len(records)} results to {args.output}")
+
+    if args.baseline:
+        regressions = find_regressions(load_results(args.baseline), records, tolerance=args.tolerance)
+        for kind, size, engine, previous, current, ratio in regressions:
+            print(f"Regression: {engine} on {kind} {size}: {previous * 1e3:.2f} ms -> {current * 1e3:.2f} ms "
+                  f"({ratio:.2f}x)")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import time  # Zaman ölçümleri için time modülü import ediliyor.
+import numpy as np  # Sayısal hesaplamalar için numpy modülü import ediliyor.
+
+from path_output import build_path_output  # Ortak yol çıktı aşaması import ediliyor.
+from road_graph import NEIGHBOUR_OFFSETS, NeighbourMask  # Bit paketli komşuluk gösterimi import ediliyor.
+
+# Yön haritasında 0: kaynak (seed) pikseli veya ulaşılamayan piksel; k + 1: NEIGHBOUR_OFFSETS[k] yönüne adım.
+NO_DIRECTION = 0
+
+
+class DistanceField:
+    # Bir veya birden çok kaynaktan (ör. depo) tüm yol piksellerine olan adım sayısı. Arama, graf oluşturulmadan
+    # doğrudan maske üzerinde, her seviyede tüm sınırı (frontier) NumPy işlemleriyle genişleten bir BFS dalgasıdır.
+    # Mesafeler find_path(mode='early') ile aynı birim adımlı 8 yönlü grafa göredir.
+    # Her piksel için en yakın kaynağa doğru atılacak adım yön haritasında saklanır; bu sayede istenen sayıda
+    # başlangıç noktasının yolu, yeniden arama yapılmadan yol uzunluğuyla orantılı sürede çıkarılır.
+    # distances: int32 (H, W), ulaşılamayan pikseller -1. directions: uint8 (H, W).
+    # nearest_seed: int32 (H, W), pikselin bağlandığı kaynağın seeds içindeki sırası, ulaşılamayanlar -1.
+
+    def __init__(self, flat_img, seeds, stats=None):
+        start_time = time.time()
+        road = np.asarray(flat_img)
+        if road.ndim == 3:
+            road = road[:, :, 0]
+        height, width = road.shape
+        self.shape = (height, width)
+
+        # Komşuluk baytları resim dışındaki yönleri hiç içermediği için çerçeve eklemeye gerek yoktur.
+        neighbours = NeighbourMask(road)
+        offsets = neighbours.offsets
+
+        seeds = np.atleast_1d(np.asarray(seeds, dtype=np.int64))
+        if not (road.ravel()[seeds] != 0).all():
+            raise ValueError("Every seed must be a road pixel")
+
+        distances = np.full(road.size, -1, dtype=np.int32)
+        directions = np.zeros(road.size, dtype=np.uint8)
+        nearest_seed = np.full(road.size, -1, dtype=np.int32)
+        # Bir seviyede birden çok kez bulunan pikselleri sıralamadan elemek için kullanılan yardımcı dizi.
+        slot = np.zeros(road.size, dtype=np.int32)
+        # Aynı piksel birden çok kez verilirse ilk sıradaki kaynak kullanılır.
+        frontier, first = np.unique(seeds.astype(neighbours.index_dtype), return_index=True)
+        distances[frontier] = 0
+        nearest_seed[frontier] = first
+
+        depth = 0
+        peak_open = frontier.size
+        while frontier.size:
+            depth += 1
+            # Sınırın tüm kenarları tek seferde: (sınırdaki sıra, yön) çiftleri.
+            rows, steps = np.nonzero(np.unpackbits(neighbours.bits[frontier][:, None], axis=1, bitorder='little'))
+            candidates = frontier[rows] + offsets[steps]
+            is_new = distances[candidates] < 0
+            candidates, rows, steps = candidates[is_new], rows[is_new], steps[is_new]
+            # Birden çok sınır pikselinden ulaşılan piksel için tek bir kenar seçilir: her pikselin slot değerine
+            # kenar sırası yazılır ve yalnızca kendi sırası kalan kenarlar tutulur.
+            order = np.arange(candidates.size, dtype=np.int32)
+            slot[candidates] = order
+            keep = slot[candidates] == order
+            candidates, rows, steps = candidates[keep], rows[keep], steps[keep]
+            distances[candidates] = depth
+            # Yeni pikselden sınırdaki piksele dönen adım ters yöndür (NEIGHBOUR_OFFSETS simetrik sıralı).
+            directions[candidates] = len(NEIGHBOUR_OFFSETS) - steps
+            nearest_seed[candidates] = nearest_seed[frontier[rows]]
+            frontier = candidates
+            peak_open = max(peak_open, frontier.size)
+
+        self.distances = distances.reshape(height, width)
+        self.directions = directions.reshape(height, width)
+        self.nearest_seed = nearest_seed.reshape(height, width)
+        self.seeds = seeds
+
+        # Yol çıkarma tek tek okumalarla yapıldığı için yön haritası bir memoryview üzerinden okunur.
+        self._steps = (0,) + tuple(y_diff * width + x_diff for y_diff, x_diff in NEIGHBOUR_OFFSETS)
+        self._directions = memoryview(self.directions.ravel())
+
+        if stats is not None:
+            stats.update(search_time=time.time() - start_time, expanded=int(np.count_nonzero(self.distances >= 0)),
+                         peak_open=int(peak_open), levels=depth - 1, graph_nnz=neighbours.nnz,
+                         graph_bytes=neighbours.nbytes)
+
+    def distance(self, pixel_index):
+        # Pikselden en yakın kaynağa adım sayısı; ulaşılamıyorsa -1.
+        return int(self.distances.flat[pixel_index])
+
+    def route(self, origin, simplify_tolerance=None):
+        # Başlangıç pikselinden en yakın kaynağa giden yolu yön haritasını izleyerek çıkar.
+        # Dönüş: başlangıçtan kaynağa (y, x) piksel koordinatları (iki uç dahil).
+        origin = int(origin)
+        length = self.distance(origin)
+        if length < 0:
+            raise ValueError("Target pixel is not reachable from the source pixel")
+
+        pixels_path = [origin]
+        node = origin
+        directions, steps = self._directions, self._steps
+        for _ in range(length):
+            node += steps[directions[node]]
+            pixels_path.append(node)
+        return build_path_output(pixels_path, self.shape[1], simplify_tolerance)
+
+    def routes(self, origins, simplify_tolerance=None):
+        # Birden çok başlangıç noktası için yollar; ulaşılamayan noktalar için None.
+        paths = []
+        for origin in origins:
+            try:
+                paths.append(self.route(origin, simplify_tolerance))
+            except ValueError:
+                paths.append(None)
+        return paths
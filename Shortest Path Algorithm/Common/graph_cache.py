@@ -0,0 +1,105 @@
+import hashlib  # Maske içeriğinden anahtar üretmek için hashlib modülü import ediliyor.
+import os  # Dosya ve klasör işlemleri için os modülü import ediliyor.
+import shutil  # Önbellekten kayıt silmek için shutil modülü import ediliyor.
+import uuid  # Geçici klasör isimleri için uuid modülü import ediliyor.
+import numpy as np  # Sayısal hesaplamalar için numpy modülü import ediliyor.
+from scipy.sparse import csr_matrix  # CSR formatındaki sparse matris sınıfı import ediliyor.
+
+from road_graph import build_adjacency_matrix  # Vektörel bitişiklik matrisi oluşturucu import ediliyor.
+
+# Grafı oluşturan ayarlar. Bu ayarlardan biri değişirse eski kayıtlar otomatik olarak geçersiz olur.
+GRAPH_SETTINGS = b'connectivity=8;self_loops=0;border=1'
+
+# Her kayıt için diske yazılan CSR dizileri.
+CSR_ARRAYS = ('indptr', 'indices', 'data')
+
+
+def mask_key(flat_img, settings=GRAPH_SETTINGS):
+    # create_flat_image ile elde edilen maskenin yol piksellerinden ve graf ayarlarından bir anahtar üret.
+    road = np.asarray(flat_img) != 0
+    digest = hashlib.sha256(settings)
+    digest.update(np.asarray(road.shape, dtype=np.int64).tobytes())
+    digest.update(np.packbits(road).tobytes())
+    return digest.hexdigest()
+
+
+class GraphCache:
+    # Oluşturulan yol graflarını diskte .npy dosyaları olarak saklayan ve bellek eşlemeli
+    # (memory-mapped) olarak geri açan önbellek. Boyut veya kayıt sayısı sınırı aşılınca
+    # en uzun süredir kullanılmayan (LRU) kayıtlar silinir.
+
+    def __init__(self, cache_dir, max_bytes=None, max_entries=None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _entry_dir(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def load(self, key):
+        # Kayıt varsa CSR dizilerini bellek eşlemeli olarak aç, yoksa None döndür.
+        entry_dir = self._entry_dir(key)
+        if not os.path.isdir(entry_dir):
+            return None
+
+        arrays = {name: np.load(os.path.join(entry_dir, name + '.npy'), mmap_mode='r')
+                  for name in CSR_ARRAYS}
+        node_count = arrays['indptr'].shape[0] - 1
+
+        # Son kullanım zamanını güncelle; LRU silme işlemi bu zamana göre yapılır.
+        os.utime(entry_dir)
+        return csr_matrix((arrays['data'], arrays['indices'], arrays['indptr']),
+                          shape=(node_count, node_count), copy=False)
+
+    def store(self, key, adjacency):
+        # CSR dizilerini önce geçici bir klasöre yaz, sonra tek adımda yerine taşı.
+        # Böylece yarım kalan bir yazma işlemi başka bir süreç tarafından okunmaz.
+        temp_dir = self._entry_dir(f".{key}.{uuid.uuid4().hex}.tmp")
+        os.makedirs(temp_dir)
+        for name in CSR_ARRAYS:
+            np.save(os.path.join(temp_dir, name + '.npy'), getattr(adjacency, name))
+
+        try:
+            os.replace(temp_dir, self._entry_dir(key))
+        except OSError:
+            # Aynı kayıt başka bir süreç tarafından zaten yazılmış.
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+        self.evict()
+
+    def get_or_build(self, flat_img, builder=build_adjacency_matrix):
+        # Maskenin grafı önbellekte varsa onu döndür, yoksa oluştur, kaydet ve bellek eşlemeli aç.
+        key = mask_key(flat_img)
+        adjacency = self.load(key)
+        if adjacency is not None:
+            return adjacency
+
+        adjacency = builder(flat_img)
+        self.store(key, adjacency)
+        cached = self.load(key)
+        return cached if cached is not None else adjacency
+
+    def entries(self):
+        # Önbellekteki kayıtları (son kullanım zamanı, boyut, klasör) olarak, eskiden yeniye sıralı döndür.
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            entry_dir = self._entry_dir(name)
+            if name.startswith('.') or not os.path.isdir(entry_dir):
+                continue
+            size = sum(os.path.getsize(os.path.join(entry_dir, file_name))
+                       for file_name in os.listdir(entry_dir))
+            entries.append((os.path.getmtime(entry_dir), size, entry_dir))
+        entries.sort()
+        return entries
+
+    def evict(self):
+        # Boyut ve kayıt sayısı sınırları sağlanana kadar en eski kayıtları sil.
+        entries = self.entries()
+        total_bytes = sum(size for _, size, _ in entries)
+
+        while entries and ((self.max_bytes is not None and total_bytes > self.max_bytes) or
+                           (self.max_entries is not None and len(entries) > self.max_entries)):
+            _, size, entry_dir = entries.pop(0)
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total_bytes -= size
@@ -0,0 +1,316 @@
+import heapq  # Soyut graf üzerindeki A* araması için heapq modülü import ediliyor.
+import time  # Zaman ölçümleri için time modülü import ediliyor.
+from collections import OrderedDict, defaultdict  # Küme önbelleği ve giriş listeleri için import ediliyor.
+import numpy as np  # Sayısal hesaplamalar için numpy modülü import ediliyor.
+from scipy.sparse import csr_matrix  # Küme içi ağırlıklı graf için csr_matrix import ediliyor.
+from scipy.sparse.csgraph import dijkstra  # Küme içi en kısa yollar için dijkstra fonksiyonu import ediliyor.
+
+from path_output import build_path_output, reconstruct_path  # Ortak yol çıktı aşaması import ediliyor.
+from road_graph import build_adjacency_matrix  # Vektörel bitişiklik matrisi oluşturucu import ediliyor.
+
+SQRT2 = 2 ** 0.5
+
+# Bu uzunluktan daha uzun sınır geçişlerine, iki uca birer giriş (entrance) konulur.
+LONG_ENTRANCE = 6
+
+
+def open_mask(file_path):
+    # Büyük bir .npy maske mozaiğini belleğe yüklemeden, bellek eşlemeli olarak aç.
+    # Kümeler yalnızca ihtiyaç duyulduğunda diskten okunur.
+    mask = np.load(file_path, mmap_mode='r')
+    return mask[:, :, 0] if mask.ndim == 3 else mask
+
+
+def octile_length(pixels, width):
+    # Piksel indisi dizisinin uzunluğu: düz adımlar 1, çapraz adımlar sqrt(2).
+    y, x = np.divmod(np.asarray(pixels, dtype=np.int64), width)
+    diagonal = (np.diff(y) != 0) & (np.diff(x) != 0)
+    return float(np.where(diagonal, SQRT2, 1.0).sum())
+
+
+def build_weighted_graph(road):
+    # Küme içi 8 yönlü graf: düz adımlar 1, çapraz adımlar sqrt(2) maliyetlidir.
+    adjacency = build_adjacency_matrix(road)
+    width = road.shape[1]
+    rows = np.repeat(np.arange(adjacency.shape[0]), np.diff(adjacency.indptr))
+    diagonal = (rows % width != adjacency.indices % width) & (rows // width != adjacency.indices // width)
+    return csr_matrix((np.where(diagonal, SQRT2, 1.0), adjacency.indices, adjacency.indptr),
+                      shape=adjacency.shape)
+
+
+class HierarchicalRouter:
+    # HPA* tarzı hiyerarşik yol bulucu. Maske sabit boyutlu kümelere bölünür, kümeler arası sınırlardaki
+    # geçiş noktaları (giriş) soyut grafın düğümleri olur ve aynı kümedeki girişler arasındaki mesafeler
+    # önceden hesaplanır. Sorgu önce soyut graf üzerinde çözülür, sonra yalnızca yol üzerindeki kümeler
+    # piksel seviyesinde iyileştirilir. Kümeler tembel (lazy) yüklenir ve az sayıda küme önbellekte tutulur.
+    # Bulunan yol en kısa yol olmak zorunda değildir. Kümeler arası geçişler yalnızca giriş piksellerinden
+    # yapılabildiği için, özellikle küçük kümelerde ve kısa sorgularda yol en kısa octile yoldan belirgin şekilde
+    # uzun olabilir (rastgele maskelerde 4-16 piksellik kümelerle %90'a kadar ölçülmüştür). Bu nedenle find_path
+    # varsayılan olarak her sınır geçişini, geçtiği iki kümenin tamamında yeniden arayan bir düzeltme (smoothing)
+    # adımı uygular. Bu adım yolu hiçbir zaman uzatmaz, ancak kesin bir üst sınır da vermez; ölçülen değerler
+    # find_path açıklamasındadır.
+
+    def __init__(self, mask, cluster_size=256, max_cached_clusters=8):
+        self.mask = mask
+        self.height, self.width = mask.shape
+        self.cluster_size = cluster_size
+        self.cluster_rows = -(-self.height // cluster_size)
+        self.cluster_cols = -(-self.width // cluster_size)
+        self.max_cached_clusters = max_cached_clusters
+        self._tiles = OrderedDict()
+
+        # Soyut graf: düğüm -> [(komşu düğüm, maliyet)], düğüm -> global piksel indisi.
+        self._node_of_pixel = {}
+        self.node_pixels = []
+        self._neighbours = []
+        self._cluster_entrances = defaultdict(list)
+
+        self._find_entrances()
+        self._connect_entrances()
+
+    def _cluster_of(self, pixel_index):
+        y, x = divmod(int(pixel_index), self.width)
+        return y // self.cluster_size, x // self.cluster_size
+
+    def _cluster_bounds(self, cluster):
+        y0 = cluster[0] * self.cluster_size
+        x0 = cluster[1] * self.cluster_size
+        return y0, min(y0 + self.cluster_size, self.height), x0, min(x0 + self.cluster_size, self.width)
+
+    def _road(self, y0, y1, x0, x1):
+        return np.asarray(self.mask[y0:y1, x0:x1]) != 0
+
+    def _tile(self, cluster):
+        # Kümenin ağırlıklı grafını ve konumunu döndür; en son kullanılan kümeler önbellekte tutulur.
+        if cluster in self._tiles:
+            self._tiles.move_to_end(cluster)
+            return self._tiles[cluster]
+
+        y0, y1, x0, x1 = self._cluster_bounds(cluster)
+        road = self._road(y0, y1, x0, x1)
+        tile = (build_weighted_graph(road), y0, x0, x1 - x0)
+        self._tiles[cluster] = tile
+        if len(self._tiles) > self.max_cached_clusters:
+            self._tiles.popitem(last=False)
+        return tile
+
+    def _to_local(self, pixel_index, tile):
+        _, y0, x0, tile_width = tile
+        y, x = divmod(int(pixel_index), self.width)
+        return (y - y0) * tile_width + (x - x0)
+
+    def _to_global(self, local_indices, tile):
+        _, y0, x0, tile_width = tile
+        y, x = np.divmod(np.asarray(local_indices, dtype=np.int64), tile_width)
+        return (y + y0) * self.width + (x + x0)
+
+    def _node(self, pixel_index):
+        if pixel_index not in self._node_of_pixel:
+            self._node_of_pixel[pixel_index] = len(self.node_pixels)
+            self.node_pixels.append(pixel_index)
+            self._neighbours.append([])
+            self._cluster_entrances[self._cluster_of(pixel_index)].append(self._node_of_pixel[pixel_index])
+        return self._node_of_pixel[pixel_index]
+
+    def _add_edge(self, first_pixel, second_pixel, cost):
+        first, second = self._node(int(first_pixel)), self._node(int(second_pixel))
+        self._neighbours[first].append((second, cost))
+        self._neighbours[second].append((first, cost))
+
+    def _add_border_entrances(self, first_line, second_line, first_pixels, second_pixels):
+        # İki komşu kümenin karşılıklı sınır çizgileri arasındaki geçişleri soyut grafa ekle.
+        straight = first_line & second_line
+
+        # Kesintisiz düz geçişlerin her biri için bir giriş; uzun geçişlerde iki uca birer giriş.
+        edges = np.diff(np.concatenate([[0], straight.view(np.int8), [0]]))
+        for start, end in zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)):
+            rows = (start, end - 1) if end - start >= LONG_ENTRANCE else ((start + end - 1) // 2,)
+            for row in rows:
+                self._add_edge(first_pixels[row], second_pixels[row], 1.0)
+
+        # Yalnızca çapraz olarak mümkün olan geçişler; düz geçişe komşu olanlar zaten kapsanıyor.
+        no_straight = ~straight[:-1] & ~straight[1:]
+        for row in np.flatnonzero(first_line[:-1] & second_line[1:] & no_straight):
+            self._add_edge(first_pixels[row], second_pixels[row + 1], SQRT2)
+        for row in np.flatnonzero(first_line[1:] & second_line[:-1] & no_straight):
+            self._add_edge(first_pixels[row + 1], second_pixels[row], SQRT2)
+
+    def _find_entrances(self):
+        # Her kümenin sağ ve alt komşusuyla olan sınırlarını ve köşe geçişlerini tara.
+        for cluster_y in range(self.cluster_rows):
+            for cluster_x in range(self.cluster_cols):
+                y0, y1, x0, x1 = self._cluster_bounds((cluster_y, cluster_x))
+
+                if cluster_x + 1 < self.cluster_cols:
+                    border = self._road(y0, y1, x1 - 1, x1 + 1)
+                    rows = np.arange(y0, y1)
+                    self._add_border_entrances(border[:, 0], border[:, 1],
+                                               rows * self.width + x1 - 1, rows * self.width + x1)
+                if cluster_y + 1 < self.cluster_rows:
+                    border = self._road(y1 - 1, y1 + 1, x0, x1)
+                    cols = np.arange(x0, x1)
+                    self._add_border_entrances(border[0], border[1],
+                                               (y1 - 1) * self.width + cols, y1 * self.width + cols)
+                if cluster_x + 1 < self.cluster_cols and cluster_y + 1 < self.cluster_rows:
+                    corner = self._road(y1 - 1, y1 + 1, x1 - 1, x1 + 1)
+                    if corner[0, 0] and corner[1, 1]:
+                        self._add_edge((y1 - 1) * self.width + x1 - 1, y1 * self.width + x1, SQRT2)
+                    if corner[0, 1] and corner[1, 0]:
+                        self._add_edge((y1 - 1) * self.width + x1, y1 * self.width + x1 - 1, SQRT2)
+
+    def _connect_entrances(self):
+        # Aynı kümedeki girişler arasındaki en kısa mesafeleri küme içinde hesapla ve soyut kenar olarak ekle.
+        for cluster, nodes in self._cluster_entrances.items():
+            if len(nodes) < 2:
+                continue
+            tile = self._tile(cluster)
+            local = [self._to_local(self.node_pixels[node], tile) for node in nodes]
+            distances = dijkstra(tile[0], directed=True, indices=local)
+            for i, first in enumerate(nodes):
+                for j in range(i + 1, len(nodes)):
+                    if np.isfinite(distances[i, local[j]]):
+                        self._neighbours[first].append((nodes[j], distances[i, local[j]]))
+                        self._neighbours[nodes[j]].append((first, distances[i, local[j]]))
+        # Önişleme sırasında yüklenen kümeleri bellekte tutma.
+        self._tiles.clear()
+
+    def _endpoint_edges(self, pixel_index):
+        # Kaynak/hedef pikselinden kendi kümesindeki girişlere olan mesafeler.
+        cluster = self._cluster_of(pixel_index)
+        tile = self._tile(cluster)
+        distances = dijkstra(tile[0], directed=True, indices=self._to_local(pixel_index, tile))
+        nodes = self._cluster_entrances.get(cluster, [])
+        edges = [(node, distances[self._to_local(self.node_pixels[node], tile)]) for node in nodes]
+        return [(node, cost) for node, cost in edges if np.isfinite(cost)], distances, tile
+
+    def _refine(self, first_pixel, second_pixel):
+        # Aynı kümedeki iki piksel arasındaki piksel seviyesinde yolu küme içinde bul.
+        tile = self._tile(self._cluster_of(first_pixel))
+        first_local, second_local = self._to_local(first_pixel, tile), self._to_local(second_pixel, tile)
+        _, predecessors = dijkstra(tile[0], directed=True, indices=first_local, return_predecessors=True)
+        return self._to_global(reconstruct_path(predecessors, first_local, second_local), tile)
+
+    def _smooth(self, pixels):
+        # Her küme sınırı geçişinde, yolun geçişin iki tarafındaki kümelerde kalan kesintisiz parçasını bu iki
+        # kümeyi kapsayan pencerede yeniden ara ve daha kısaysa yerine koy. Pencereler birbirini izlediği için
+        # bir geçişteki düzeltme bir sonraki geçişin penceresine de taşınır. Bellek kullanımı en fazla dört
+        # küme boyutundadır.
+        position = 0
+        while True:
+            y, x = np.divmod(pixels, self.width)
+            cluster_y, cluster_x = y // self.cluster_size, x // self.cluster_size
+            crossings = np.flatnonzero((np.diff(cluster_y) != 0) | (np.diff(cluster_x) != 0))
+            crossings = crossings[crossings >= position]
+            if not crossings.size:
+                return pixels
+            crossing = crossings[0]
+
+            # İki kümeyi (köşe geçişlerinde dört kümeyi) kapsayan dikdörtgen pencere.
+            rows = sorted((cluster_y[crossing], cluster_y[crossing + 1]))
+            cols = sorted((cluster_x[crossing], cluster_x[crossing + 1]))
+            y0, y1 = rows[0] * self.cluster_size, min((rows[1] + 1) * self.cluster_size, self.height)
+            x0, x1 = cols[0] * self.cluster_size, min((cols[1] + 1) * self.cluster_size, self.width)
+            outside = np.flatnonzero((y < y0) | (y >= y1) | (x < x0) | (x >= x1))
+            start = outside[outside < crossing].max(initial=-1) + 1
+            end = outside[outside > crossing].min(initial=len(pixels)) - 1
+
+            window_width = x1 - x0
+            graph = build_weighted_graph(self._road(y0, y1, x0, x1))
+            start_local = (y[start] - y0) * window_width + x[start] - x0
+            end_local = (y[end] - y0) * window_width + x[end] - x0
+            distances, predecessors = dijkstra(graph, directed=True, indices=start_local, return_predecessors=True)
+            if distances[end_local] < octile_length(pixels[start:end + 1], self.width) - 1e-9:
+                local_path = np.asarray(reconstruct_path(predecessors, start_local, end_local), dtype=np.int64)
+                window_y, window_x = np.divmod(local_path, window_width)
+                segment = (window_y + y0) * self.width + window_x + x0
+                pixels = np.concatenate([pixels[:start], segment, pixels[end + 1:]])
+                end = start + len(segment) - 1
+            position = end
+
+    def find_path(self, source, target, simplify_tolerance=None, smooth=True):
+        # Kaynak ve hedef piksel indisleri arasındaki yolu hiyerarşik olarak bul.
+        # smooth=True: sınır geçişleri _smooth ile yeniden aranır. En kısa octile yola göre ölçülen fark:
+        # - 96x96 rastgele maskelerde (yol yoğunluğu %55-75, 12 pikselden yakın uç noktalar) en kötü durum
+        #   4 piksellik kümelerde %32, 8 piksellik kümelerde %23, 16 piksellik kümelerde %6; ortalama %1'in
+        #   altında (düzeltme olmadan en kötü durum %91, ortalama %3-6).
+        # - 128-256 piksellik rastgele, sokak, ızgara ve koridor maskelerindeki uzun sorgularda en kötü durum
+        #   8 piksellik kümelerde %3, 16 ve üzeri kümelerde %2 (düzeltme olmadan %6).
+        # Dönüş: kaynaktan hedefe (y, x) koordinat dizisi ve işlem süresi.
+        start_time = time.time()
+        source, target = int(source), int(target)
+        for pixel_index in (source, target):
+            if not self.mask[divmod(pixel_index, self.width)]:
+                raise ValueError("Source and target pixels must be road pixels")
+
+        source_node, target_node = -1, -2
+        source_edges, source_distances, source_tile = self._endpoint_edges(source)
+        target_edges = dict(self._endpoint_edges(target)[0])
+        if self._cluster_of(source) == self._cluster_of(target):
+            # Aynı kümedeyse doğrudan küme içi yol da bir aday.
+            direct = source_distances[self._to_local(target, source_tile)]
+            if np.isfinite(direct):
+                source_edges.append((target_node, direct))
+
+        # Soyut graf üzerinde octile sezgisel tahminli A*.
+        target_y, target_x = divmod(target, self.width)
+
+        def estimate(node):
+            if node < 0:
+                return 0.0 if node == target_node else estimate_source
+            y, x = divmod(self.node_pixels[node], self.width)
+            dy, dx = abs(y - target_y), abs(x - target_x)
+            return dy + dx + (SQRT2 - 2) * min(dy, dx)
+
+        source_y, source_x = divmod(source, self.width)
+        estimate_source = abs(source_y - target_y) + abs(source_x - target_x) + \
+            (SQRT2 - 2) * min(abs(source_y - target_y), abs(source_x - target_x))
+
+        g_score = {source_node: 0.0}
+        parents = {source_node: None}
+        queue = [(estimate(source_node), source_node)]
+        closed = set()
+        while queue:
+            _, node = heapq.heappop(queue)
+            if node == target_node:
+                break
+            if node in closed:
+                continue
+            closed.add(node)
+
+            neighbours = source_edges if node == source_node else self._neighbours[node]
+            if node in target_edges:
+                neighbours = neighbours + [(target_node, target_edges[node])]
+            for neighbour, cost in neighbours:
+                tentative_g_score = g_score[node] + cost
+                if neighbour not in closed and tentative_g_score < g_score.get(neighbour, np.inf):
+                    g_score[neighbour] = tentative_g_score
+                    parents[neighbour] = node
+                    heapq.heappush(queue, (tentative_g_score + estimate(neighbour), neighbour))
+
+        if target_node not in parents:
+            raise ValueError("Target pixel is not reachable from the source pixel")
+
+        # Soyut yolu piksellere çevir: kümeler arası geçişler komşu pikseller, küme içi parçalar iyileştirilir.
+        abstract_path = []
+        node = target_node
+        while node is not None:
+            abstract_path.append(target if node == target_node else
+                                 source if node == source_node else self.node_pixels[node])
+            node = parents[node]
+        abstract_path.reverse()
+
+        pixels = [np.array([source], dtype=np.int64)]
+        for first_pixel, second_pixel in zip(abstract_path[:-1], abstract_path[1:]):
+            if first_pixel == second_pixel:
+                continue
+            if self._cluster_of(first_pixel) == self._cluster_of(second_pixel):
+                pixels.append(self._refine(first_pixel, second_pixel)[1:])
+            else:
+                pixels.append(np.array([second_pixel], dtype=np.int64))
+
+        pixels = np.concatenate(pixels)
+        if smooth:
+            pixels = self._smooth(pixels)
+        path = build_path_output(pixels, self.width, simplify_tolerance)
+        end_time = time.time()
+        return path, end_time - start_time
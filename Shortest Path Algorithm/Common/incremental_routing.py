@@ -0,0 +1,177 @@
+import heapq  # Öncelik kuyruğu için heapq modülü import ediliyor.
+import time  # Zaman ölçümleri için time modülü import ediliyor.
+import numpy as np  # Sayısal hesaplamalar için numpy modülü import ediliyor.
+
+from path_output import build_path_output  # Ortak yol çıktı aşaması import ediliyor.
+from road_graph import NEIGHBOUR_OFFSETS  # 8 yönlü komşuluk kaymaları import ediliyor.
+
+# Maliyetler tam sayı olarak tutulur: düz adım 10^6, çapraz adım round(10^6 * sqrt(2)).
+# Kayan noktalı toplamlardaki yuvarlama farkları g ve rhs karşılaştırmalarını bozup onarımı yarıda
+# bırakabildiği için D* Lite tam sayı aritmetiğiyle çalışır.
+STRAIGHT_COST = 1000000
+DIAGONAL_COST = 1414214
+INFINITY = float('inf')
+
+
+class DStarLite:
+    # Yol maskesi değiştiğinde (yol kapanması, yeni maske parçaları) önceki arama sonucunu onararak
+    # yeniden planlayan D* Lite. Arama hedeften kaynağa doğru yapılır; düz adımlar 1, çapraz adımlar sqrt(2)
+    # maliyetlidir ve sezgisel tahmin octile mesafedir (find_path_a_star_grid(heuristic='octile') ile aynı uzunlukta yollar).
+    # Graf ayrıca tutulmaz: komşular kenarına siyah çerçeve eklenmiş maskede sabit indis kaymalarıyla bulunur,
+    # g ve rhs değerleri yalnızca aramanın dokunduğu pikseller için sözlüklerde saklanır. Böylece bir
+    # değişikliğin maliyeti resmin boyutuyla değil, değişikliğin etkilediği bölgeyle orantılıdır.
+
+    def __init__(self, img, source, target):
+        self.width = img.shape[1]
+        self.padded_width = self.width + 2
+        padded = np.zeros((img.shape[0] + 2, self.padded_width), dtype=np.uint8)
+        padded[1:-1, 1:-1] = np.asarray(img) != 0
+        # Tek tek okunan ve değiştirilen değerler için bytearray, NumPy dizisinden çok daha hızlıdır.
+        self.road = bytearray(padded.ravel())
+        self.steps = [(y_diff * self.padded_width + x_diff, DIAGONAL_COST if y_diff and x_diff else STRAIGHT_COST)
+                      for y_diff, x_diff in NEIGHBOUR_OFFSETS]
+
+        self.start = self._to_padded(source)
+        self.goal = self._to_padded(target)
+        self.last_start = self.start
+        self.km = 0
+        self.g = {}
+        self.rhs = {self.goal: 0}
+        self.queue = []
+        self.open = {}
+        self.stats = {'heap_pushes': 0, 'heap_pops': 0, 'stale': 0, 'expanded': 0}
+        self._push(self.goal)
+
+    def _to_padded(self, pixel_index):
+        y, x = divmod(int(pixel_index), self.width)
+        return (y + 1) * self.padded_width + x + 1
+
+    def _heuristic(self, first, second):
+        # Octile mesafe: çapraz adım * kısa kenar + düz adım * (uzun kenar - kısa kenar).
+        first_y, first_x = divmod(first, self.padded_width)
+        second_y, second_x = divmod(second, self.padded_width)
+        dy, dx = abs(first_y - second_y), abs(first_x - second_x)
+        return STRAIGHT_COST * (dy + dx) + (DIAGONAL_COST - 2 * STRAIGHT_COST) * min(dy, dx)
+
+    def _key(self, node):
+        best = min(self.g.get(node, INFINITY), self.rhs.get(node, INFINITY))
+        return (best + self._heuristic(self.start, node) + self.km, best)
+
+    def _push(self, node):
+        key = self._key(node)
+        self.open[node] = key
+        heapq.heappush(self.queue, (key, node))
+        self.stats['heap_pushes'] += 1
+
+    def _update_vertex(self, node):
+        # rhs: en iyi komşu üzerinden hedefe olan tek adımlık tahmin. g ile tutarsızsa düğüm kuyruğa girer.
+        if node != self.goal:
+            best = INFINITY
+            if self.road[node]:
+                g = self.g
+                road = self.road
+                for offset, step_cost in self.steps:
+                    neighbor = node + offset
+                    if road[neighbor]:
+                        cost = step_cost + g.get(neighbor, INFINITY)
+                        if cost < best:
+                            best = cost
+            self.rhs[node] = best
+
+        if self.g.get(node, INFINITY) != self.rhs.get(node, INFINITY):
+            self._push(node)
+        else:
+            self.open.pop(node, None)
+
+    def _top_key(self):
+        # Kuyruğun başındaki geçersiz (güncellenmiş veya kuyruktan çıkmış) kayıtları at.
+        while self.queue:
+            key, node = self.queue[0]
+            if self.open.get(node) == key:
+                return key
+            heapq.heappop(self.queue)
+            self.stats['stale'] += 1
+        return (INFINITY, INFINITY)
+
+    def compute_shortest_path(self):
+        while (self._top_key() < self._key(self.start) or
+               self.rhs.get(self.start, INFINITY) != self.g.get(self.start, INFINITY)):
+            if not self.queue:
+                break
+            old_key, node = heapq.heappop(self.queue)
+            self.stats['heap_pops'] += 1
+            new_key = self._key(node)
+            if old_key < new_key:
+                self._push(node)
+                continue
+
+            del self.open[node]
+            self.stats['expanded'] += 1
+            g_value, rhs_value = self.g.get(node, INFINITY), self.rhs.get(node, INFINITY)
+            if g_value > rhs_value:
+                self.g[node] = rhs_value
+                affected = []
+            else:
+                self.g[node] = INFINITY
+                affected = [node]
+            affected.extend(node + offset for offset, _ in self.steps if self.road[node + offset])
+            for neighbor in affected:
+                self._update_vertex(neighbor)
+
+    def update_pixels(self, changes):
+        # Değişen pikselleri maskeye uygula ve yalnızca etkilenen düğümleri güncelle.
+        # changes: (y, x, yol_mu) üçlüleri; yol_mu False ise piksel kapatılır, True ise yol olarak açılır.
+        touched = set()
+        for y, x, is_road in changes:
+            node = (y + 1) * self.padded_width + x + 1
+            value = 1 if is_road else 0
+            if self.road[node] == value:
+                continue
+            self.road[node] = value
+            touched.add(node)
+            touched.update(node + offset for offset, _ in self.steps)
+
+        if touched:
+            for node in touched:
+                self._update_vertex(node)
+        return len(touched)
+
+    def move_source(self, source):
+        # Araç ilerlediğinde kaynağı taşı; km ile kuyruktaki anahtarlar yeniden hesaplanmadan geçerli kalır.
+        self.start = self._to_padded(source)
+        self.km += self._heuristic(self.last_start, self.start)
+        self.last_start = self.start
+
+    def find_path(self, simplify_tolerance=None):
+        # Önceki arama sonucunu onar ve kaynaktan hedefe yolu çıkar.
+        # Dönüş: kaynaktan hedefe (y, x) piksel koordinatları ve işlem süresi.
+        start_time = time.time()
+        self.compute_shortest_path()
+
+        if self.g.get(self.start, INFINITY) == INFINITY or not self.road[self.start]:
+            raise ValueError("Target pixel is not reachable from the source pixel")
+
+        # g değerleri hedefe olan mesafe olduğundan her adımda maliyeti en düşük komşuya geçilir.
+        pixels_path = [self.start]
+        node = self.start
+        limit = len(self.g) + 1
+        while node != self.goal:
+            best, best_neighbor = INFINITY, None
+            for offset, step_cost in self.steps:
+                neighbor = node + offset
+                if self.road[neighbor]:
+                    cost = step_cost + self.g.get(neighbor, INFINITY)
+                    if cost < best:
+                        best, best_neighbor = cost, neighbor
+            if best_neighbor is None or len(pixels_path) > limit:
+                raise ValueError("Target pixel is not reachable from the source pixel")
+            pixels_path.append(best_neighbor)
+            node = best_neighbor
+
+        path = build_path_output(pixels_path, self.width, simplify_tolerance, padding=1)
+        end_time = time.time()
+        return path, end_time - start_time
+
+    def path_cost(self):
+        # Kaynaktan hedefe yolun uzunluğu (düz adım = 1).
+        return self.g.get(self.start, INFINITY) / STRAIGHT_COST
@@ -0,0 +1,81 @@
+import json  # Kayıtları JSON satırı olarak yazmak için json modülü import ediliyor.
+import sys  # Varsayılan çıktı akışı için sys modülü import ediliyor.
+import time  # Kayıt zaman damgası için time modülü import ediliyor.
+import numpy as np  # NumPy sayı türlerini JSON'a çevirmek için numpy modülü import ediliyor.
+
+from road_graph import NeighbourMask  # Bit paketli komşuluk gösterimi import ediliyor.
+
+# Yol bulucuların stats sözlüğüne yazdığı alanlar. Bir yol bulucu için anlamı olmayan alan (ör. scipy
+# dijkstra için yığın sayıları) kayıtta None olarak kalır.
+# - build_time, search_time, postprocess_time: graf oluşturma, arama ve yol çıkarma süreleri (saniye).
+# - expanded: genişletilen (kuyruktan çıkarılıp komşuları dolaşılan) düğüm sayısı.
+# - heap_pushes, heap_pops: öncelik kuyruğuna ekleme ve çıkarma sayıları.
+# - stale: kuyruktan çıkan ama daha iyi bir değerle zaten işlenmiş olduğu için atlanan kayıtlar.
+# - peak_open: açık listenin (öncelik kuyruğu veya BFS sınırı) en büyük boyutu.
+# - graph_nnz, graph_bytes: aramanın kullandığı graf yapısının kenar sayısı ve bellek boyutu.
+STAT_FIELDS = ('build_time', 'search_time', 'postprocess_time', 'expanded', 'heap_pushes', 'heap_pops',
+               'stale', 'peak_open', 'graph_nnz', 'graph_bytes')
+
+
+def graph_footprint(graph):
+    # CSR komşuluk matrisi, bit paketli komşuluk maskesi veya piksel maskesi için (kenar sayısı, bayt) çifti.
+    # Piksel maskeleri kenarları saklamadığı için kenar sayısı None döner.
+    if hasattr(graph, 'indptr'):
+        return int(graph.nnz), int(graph.data.nbytes + graph.indices.nbytes + graph.indptr.nbytes)
+    if isinstance(graph, NeighbourMask):
+        return graph.nnz, graph.nbytes
+    if isinstance(graph, (bytes, bytearray)):
+        return None, len(graph)
+    return None, int(np.asarray(graph).nbytes)
+
+
+def search_record(stats, engine, **context):
+    # stats sözlüğünden sabit alanlı, izleme sistemlerinin okuyabileceği bir kayıt oluştur.
+    # context: sorguyu tanımlayan ek alanlar (ör. harita, kaynak, hedef).
+    record = {'timestamp': time.time(), 'engine': engine}
+    record.update(context)
+    for field in STAT_FIELDS:
+        record[field] = stats.get(field)
+    timings = [stats[field] for field in ('build_time', 'search_time', 'postprocess_time') if field in stats]
+    record['total_time'] = sum(timings) if timings else None
+    return record
+
+
+def _json_default(value):
+    # NumPy sayıları ve dizileri standart JSON türlerine çevrilir.
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def to_json_line(record):
+    return json.dumps(record, default=_json_default, separators=(',', ':'))
+
+
+class JsonLineSink:
+    # Kayıtları bir dosyaya veya akışa satır başına bir JSON nesnesi olarak yazar.
+    # Dosya ekleme (append) kipinde açılır; her kayıttan sonra tampon boşaltılır.
+
+    def __init__(self, target=None):
+        if target is None:
+            self._stream, self._owned = sys.stdout, False
+        elif isinstance(target, str):
+            self._stream, self._owned = open(target, 'a'), True
+        else:
+            self._stream, self._owned = target, False
+
+    def write(self, record):
+        self._stream.write(to_json_line(record) + '\n')
+        self._stream.flush()
+
+    def close(self):
+        if self._owned:
+            self._stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
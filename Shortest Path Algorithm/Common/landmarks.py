@@ -0,0 +1,97 @@
+import time  # Zaman ölçümleri için time modülü import ediliyor.
+import numpy as np  # Sayısal hesaplamalar için numpy modülü import ediliyor.
+from scipy.sparse.csgraph import dijkstra  # Yer işaretlerinden mesafeleri hesaplamak için dijkstra import ediliyor.
+
+from road_graph import build_adjacency_matrix  # 8 yönlü CSR graf oluşturucu import ediliyor.
+
+LANDMARK_COUNT = 8
+
+# uint16 dizilerde ulaşılamayan pikseller için ayrılan değer.
+UNREACHABLE = np.iinfo(np.uint16).max
+
+
+class LandmarkIndex:
+    # ALT (A*, Landmarks, Triangle inequality) ön işlemesi. Aynı maske üzerinde tekrar tekrar yapılan
+    # A* sorguları için bir kez oluşturulur. Birkaç yer işaretinden (landmark) her yol pikseline olan adım
+    # sayısı saklanır; üçgen eşitsizliğinden |d(L, t) - d(L, v)| <= d(v, t) olduğu için bu farkların
+    # en büyüğü hedefe olan mesafenin alt sınırıdır. Tutarlı (consistent) bir sezgisel olduğundan
+    # find_path_a_star en kısa yolu bulmaya devam eder, ancak kıvrımlı yollarda çok daha az piksel genişletir.
+    # Mesafeler yalnızca yol pikselleri için, piksel başına yer işareti sayısı kadar uint16 olarak tutulur.
+
+    def __init__(self, flat_img, landmark_count=LANDMARK_COUNT, seed=0, adjacency=None):
+        start_time = time.time()
+        road = np.asarray(flat_img)
+        if road.ndim == 3:
+            road = road[:, :, 0]
+        road = road != 0
+        self.shape = road.shape
+
+        road_pixels = np.flatnonzero(road)
+        if not road_pixels.size:
+            raise ValueError("Mask does not contain any road pixels")
+        if adjacency is None:
+            adjacency = build_adjacency_matrix(road)
+
+        # Piksel indisinden yol pikseli sırasına (rank) dönüşüm; yol dışındaki pikseller -1.
+        self.rank = np.full(road.size, -1, dtype=np.int32 if road.size < np.iinfo(np.int32).max else np.int64)
+        self.rank[road_pixels] = np.arange(road_pixels.size)
+
+        # En uzak nokta seçimi: ilk yer işareti rastgele bir yol pikseline en uzak piksel, sonrakiler
+        # seçilmiş yer işaretlerine en uzak olan yol pikselleridir. Yer işaretleri böylece ağın uçlarına dağılır.
+        rng = np.random.default_rng(seed)
+        start = road_pixels[rng.integers(road_pixels.size)]
+        nearest = self._distances(adjacency, start, road_pixels)
+        nearest[~np.isfinite(nearest)] = -1
+
+        landmarks = []
+        columns = []
+        for _ in range(landmark_count):
+            candidate = int(np.argmax(nearest))
+            if nearest[candidate] <= 0 and landmarks:
+                break
+            landmarks.append(int(road_pixels[candidate]))
+            distances = self._distances(adjacency, landmarks[-1], road_pixels)
+            columns.append(distances)
+            reached = np.isfinite(distances)
+            # Ulaşılamayan pikseller -1 olarak kalır; yer işaretleri küçük kopuk parçalara harcanmaz.
+            nearest[reached] = np.where(nearest[reached] < 0, distances[reached],
+                                        np.minimum(nearest[reached], distances[reached]))
+
+        distances = np.stack(columns, axis=1)
+        finite = np.isfinite(distances)
+        if distances[finite].max(initial=0) >= UNREACHABLE:
+            raise ValueError("Road network is too long for 16-bit landmark distances")
+        distances[~finite] = UNREACHABLE
+        self.distances = distances.astype(np.uint16)
+        self.landmarks = np.array(landmarks)
+        self.build_time = time.time() - start_time
+
+    @staticmethod
+    def _distances(adjacency, pixel_index, road_pixels):
+        # Tek bir pikselden tüm yol piksellerine adım sayısı (kenar ağırlıkları 1).
+        return dijkstra(adjacency, directed=False, indices=pixel_index, unweighted=True)[road_pixels]
+
+    @property
+    def nbytes(self):
+        return self.distances.nbytes + self.rank.nbytes
+
+    def heuristic(self, target):
+        # Hedefe olan mesafenin alt sınırını veren fonksiyon. Yer işareti sınırı, 8 yönlü birim adımlar için
+        # kabul edilebilir olan Chebyshev mesafesiyle birleştirilir.
+        # Hedefle aynı parçadaki her piksel, bir yer işaretine ya hedefle birlikte ulaşır ya da hiç ulaşmaz;
+        # iki tarafta da UNREACHABLE bulunan sütunların farkı 0 olduğundan ayrıca maskelemeye gerek yoktur.
+        width = self.shape[1]
+        target_y, target_x = divmod(int(target), width)
+        rank = self.rank[target]
+        if rank < 0:
+            raise ValueError("Target pixel is not a road pixel")
+        target_distances = self.distances[rank].astype(np.int32)
+        distances = self.distances
+        ranks = self.rank
+
+        def estimate(node):
+            node_y, node_x = divmod(int(node), width)
+            bound = int(np.abs(distances[ranks[node]] - target_distances).max())
+            return max(bound, abs(node_y - target_y), abs(node_x - target_x))
+
+        return estimate
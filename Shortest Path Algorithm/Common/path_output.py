@@ -0,0 +1,99 @@
+import numpy as np  # Sayısal hesaplamalar için numpy modülü import ediliyor.
+
+
+def reconstruct_path(predecessors, source, target):
+    # Önceki düğümler (predecessors) üzerinden hedeften kaynağa geri yürü ve yolu
+    # kaynaktan hedefe doğru sıralı, önceden ayrılmış bir indis dizisine yaz.
+    # predecessors: piksel indisiyle erişilen dizi (ulaşılamayan düğümler negatif) veya sözlük.
+    # Dönüş: kaynak ve hedef dahil, kaynaktan hedefe piksel indisleri.
+    is_mapping = isinstance(predecessors, dict)
+    limit = len(predecessors)
+
+    # Önce yolun uzunluğunu bul; böylece dizi tek seferde doğru boyutta ayrılır.
+    length = 1
+    pixel_index = target
+    while pixel_index != source:
+        pixel_index = predecessors.get(pixel_index) if is_mapping else predecessors[pixel_index]
+        if pixel_index is None or pixel_index < 0 or length > limit:
+            raise ValueError("Target pixel is not reachable from the source pixel")
+        length += 1
+
+    path = np.empty(length, dtype=np.int64)
+    pixel_index = target
+    for position in range(length - 1, -1, -1):
+        path[position] = pixel_index
+        if position:
+            pixel_index = predecessors[pixel_index]
+    return path
+
+
+def to_coordinate_array(pixels_path, width, padding=0):
+    # Piksel indislerini (y, x) koordinat dizisine dönüştür.
+    # padding: indisler çerçevelenmiş (padded) bir resme aitse çerçeve kalınlığı.
+    y, x = np.divmod(np.asarray(pixels_path, dtype=np.int64), width + 2 * padding)
+    return np.stack([y - padding, x - padding], axis=1)
+
+
+def expand_polyline(vertices):
+    # Aralarında yalnızca yatay, dikey veya 45 derecelik çapraz doğrular bulunan köşe noktalarını
+    # (örneğin JPS atlama noktaları) aradaki bütün piksellerle birlikte tam piksel zincirine genişlet.
+    vertices = np.asarray(vertices, dtype=np.int64)
+    if len(vertices) < 2:
+        return vertices.copy()
+
+    deltas = np.diff(vertices, axis=0)
+    steps = np.abs(deltas).max(axis=1)
+    directions = np.sign(deltas)
+
+    # Her parçadaki adım numarası: 0, 1, ..., steps - 1.
+    counts = np.repeat(np.arange(len(steps)), steps)
+    offsets = np.arange(steps.sum()) - np.repeat(np.cumsum(steps) - steps, steps)
+    pixels = vertices[:-1][counts] + directions[counts] * offsets[:, None]
+    return np.vstack([pixels, vertices[-1:]])
+
+
+def simplify_polyline(coordinates, tolerance):
+    # Ramer-Douglas-Peucker algoritması ile yolu, en fazla tolerance piksel sapacak şekilde
+    # daha az noktadan oluşan bir çoklu doğruya (polyline) indir. Uç noktalar her zaman korunur.
+    coordinates = np.asarray(coordinates)
+    if len(coordinates) < 3:
+        return coordinates.copy()
+
+    points = coordinates.astype(float)
+    keep = np.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+
+    # Özyineleme yerine yığın (stack) kullanılıyor; uzun yollarda özyineleme sınırına takılmaz.
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+
+        start, end = points[first], points[last]
+        segment = end - start
+        inner = points[first + 1:last] - start
+        segment_length = np.hypot(*segment)
+        if segment_length:
+            # Ara noktaların uç noktaları birleştiren doğruya olan dik uzaklıkları.
+            distances = np.abs(segment[0] * inner[:, 1] - segment[1] * inner[:, 0]) / segment_length
+        else:
+            distances = np.hypot(inner[:, 0], inner[:, 1])
+
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > tolerance:
+            split = first + 1 + farthest
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+
+    return coordinates[keep]
+
+
+def build_path_output(pixels_path, width, simplify_tolerance=None, padding=0):
+    # Yol bulucuların ortak çıktı aşaması: kaynaktan hedefe tam piksel zinciri (y, x) olarak,
+    # simplify_tolerance verilirse Ramer-Douglas-Peucker ile sadeleştirilmiş çoklu doğru.
+    path = to_coordinate_array(pixels_path, width, padding)
+    if simplify_tolerance is not None:
+        path = simplify_polyline(path, simplify_tolerance)
+    return path
@@ -0,0 +1,136 @@
+import numpy as np  # Sayısal hesaplamalar için numpy modülü import ediliyor.
+from scipy.sparse import csr_matrix  # Sıkıştırılmış satır (CSR) formatındaki sparse matris sınıfı import ediliyor.
+
+# 8 yönlü komşuluk için (satır, sütun) kaymaları. (0, 0) yönü, yani pikselin kendisine olan
+# bağlantı (self-loop) bilerek listede yok. Sıralama (dy, dx) şeklinde olduğu için her satırdaki
+# komşu indisleri küçükten büyüğe sıralı üretilir.
+NEIGHBOUR_OFFSETS = ((-1, -1), (-1, 0), (-1, 1),
+                     (0, -1), (0, 1),
+                     (1, -1), (1, 0), (1, 1))
+
+
+def _shifted_windows(height, width, y_diff, x_diff):
+    # Verilen kayma için kaynak ve komşu piksel pencerelerini (slice) döndür.
+    # Pencereler resmin dışına taşmadığı için kenar pikselleri de doğru şekilde işlenir
+    # ve satır sonunda bir sonraki satıra "sarma" oluşmaz.
+    source = (slice(max(0, -y_diff), height - max(0, y_diff)),
+              slice(max(0, -x_diff), width - max(0, x_diff)))
+    neighbour = (slice(max(0, y_diff), height - max(0, -y_diff)),
+                 slice(max(0, x_diff), width - max(0, -x_diff)))
+    return source, neighbour
+
+
+def build_adjacency_matrix(img):
+    # Resmin 8 yönlü bitişiklik matrisini tek seferde, kaydırılmış boolean görünümlerden oluştur.
+    # Her yol pikseli (sıfırdan farklı piksel), yine yol pikseli olan komşularına bağlanır.
+    road = np.asarray(img) != 0
+    height, width = road.shape
+    img_size = road.size
+
+    # Büyük resimlerde bellek kullanımını düşürmek için mümkünse 32 bitlik indisler kullan.
+    index_dtype = np.int32 if img_size < np.iinfo(np.int32).max else np.int64
+    pixel_index = np.arange(img_size, dtype=index_dtype).reshape(height, width)
+
+    rows = []
+    cols = []
+    for y_diff, x_diff in NEIGHBOUR_OFFSETS:
+        source, neighbour = _shifted_windows(height, width, y_diff, x_diff)
+        # Hem piksel hem de ilgili yöndeki komşusu yol ise bu iki piksel arasında bir kenar vardır.
+        connected = road[source] & road[neighbour]
+        rows.append(pixel_index[source][connected])
+        cols.append(pixel_index[neighbour][connected])
+
+    rows = np.concatenate(rows)
+    cols = np.concatenate(cols)
+
+    # Kenarları satıra göre kararlı (stable) sırala. Yönler sütun indisine göre artan sırada
+    # eklendiği için her satırın içindeki komşu indisleri de sıralı kalır.
+    order = np.argsort(rows, kind='stable')
+    indices = cols[order]
+    # indptr kümülatif kenar sayılarını tutar; kenar sayısı piksel sayısının 8 katına kadar çıkabildiği için
+    # türü piksel sayısına göre değil, kenar sayısına göre seçilir (aksi halde cumsum sessizce taşar).
+    indptr_dtype = np.int32 if rows.size < np.iinfo(np.int32).max else np.int64
+    indptr = np.zeros(img_size + 1, dtype=indptr_dtype)
+    np.cumsum(np.bincount(rows, minlength=img_size), out=indptr[1:])
+    data = np.ones(indices.size, dtype=bool)
+
+    # Oluşturulan bitişiklik matrisi CSR formatında döndürülüyor.
+    return csr_matrix((data, indices, indptr), shape=(img_size, img_size))
+
+
+def csr_neighbours(adjacency, node):
+    # CSR matrisinde bir düğümün komşuları: indices dizisinin ilgili satır dilimi (kopyalanmadan).
+    return adjacency.indices[adjacency.indptr[node]:adjacency.indptr[node + 1]]
+
+
+def _pack_neighbours(road):
+    # Komşuluk baytlarını ve toplam kenar sayısını birlikte hesapla.
+    height, width = road.shape
+    bits = np.zeros((height, width), dtype=np.uint8)
+    edge_count = 0
+    for bit, (y_diff, x_diff) in enumerate(NEIGHBOUR_OFFSETS):
+        source, neighbour = _shifted_windows(height, width, y_diff, x_diff)
+        connected = road[source] & road[neighbour]
+        bits[source] |= connected.view(np.uint8) << np.uint8(bit)
+        edge_count += int(np.count_nonzero(connected))
+    return bits, edge_count
+
+
+def build_neighbour_mask(img):
+    # Her piksel için 8 yönlü komşuluğu tek bir bayta sıkıştır: bit k, NEIGHBOUR_OFFSETS[k] yönündeki
+    # komşunun (ve pikselin kendisinin) yol olduğunu gösterir. Yol olmayan piksellerin baytı 0'dır.
+    return _pack_neighbours(np.asarray(img) != 0)[0]
+
+
+class NeighbourMask:
+    # build_adjacency_matrix ile aynı grafın bit paketli gösterimi. CSR matrisi yol pikseli başına 9'a kadar
+    # 32/64 bitlik sütun indisi ve her piksel için indptr saklarken, burada piksel başına yalnızca 1 bayt tutulur;
+    # komşular bitlerden ve sabit indis kaymalarından (y_diff * width + x_diff) hesaplanır.
+    # Kenarlardaki pikseller için resim dışındaki yönlerin bitleri hiçbir zaman 1 olmadığından satır sonunda
+    # bir sonraki satıra sarma oluşmaz.
+    # shape ve nnz (yönlü kenar sayısı) CSR matrisiyle aynıdır; BFS tabanlı Dijkstra modları ve A* her iki
+    # gösterimi de kullanabilir.
+
+    def __init__(self, img):
+        bits, nnz = _pack_neighbours(np.asarray(img) != 0)
+        self._attach(bits.ravel(), bits.shape[1], nnz)
+
+    @classmethod
+    def from_bits(cls, bits, width, nnz):
+        # Başka bir NeighbourMask'in baytlarından (ör. ortak bellekteki bir kopyadan) yeniden paketlemeden oluştur.
+        neighbours = cls.__new__(cls)
+        neighbours._attach(np.asarray(bits, dtype=np.uint8).ravel(), width, nnz)
+        return neighbours
+
+    def _attach(self, bits, width, nnz):
+        self.bits = bits
+        self.nnz = nnz
+        self.width = width
+        self.shape = (self.bits.size, self.bits.size)
+        # Yalnızca piksel indisleri ve kaymaları için; kenar sayıları (nnz) Python int olarak tutulur.
+        self.index_dtype = np.int32 if self.bits.size < np.iinfo(np.int32).max else np.int64
+        self.offsets = np.array([y_diff * width + x_diff for y_diff, x_diff in NEIGHBOUR_OFFSETS],
+                                dtype=self.index_dtype)
+
+        # 256 olası bayt değerinin her biri için komşu kaymaları; tek düğümlü gezinme tablo okumasıyla yapılır.
+        offsets = [int(offset) for offset in self.offsets]
+        self._table = tuple(tuple(offset for bit, offset in enumerate(offsets) if value >> bit & 1)
+                            for value in range(256))
+        # memoryview üzerinden tek tek okunan değerler, NumPy skalerlerinden çok daha hızlı Python int'leri döner.
+        self._view = memoryview(self.bits)
+
+    @property
+    def nbytes(self):
+        return self.bits.nbytes
+
+    def neighbours(self, node):
+        return [node + offset for offset in self._table[self._view[node]]]
+
+    def expand(self, frontier):
+        # Sınırdaki tüm düğümlerin komşularını ve onlara ulaşılan düğümleri vektörel olarak döndür
+        # (dijkstra.expand_frontier ile aynı sözleşme).
+        # Baytlar (düğüm, bit) tablosuna açılır; 1 olan her hücre bir kenardır. Sonuç düğüm sırasına göredir.
+        bits = np.unpackbits(self.bits[frontier][:, None], axis=1, bitorder='little')
+        rows, directions = np.nonzero(bits)
+        parents = frontier[rows]
+        return parents + self.offsets[directions], parents
@@ -0,0 +1,98 @@
+import numpy as np  # Sayısal hesaplamalar için numpy modülü import ediliyor.
+from scipy import ndimage  # Bağlı yol parçalarını etiketlemek için ndimage modülü import ediliyor.
+from scipy.spatial import cKDTree  # En yakın yol pikselini bulmak için cKDTree import ediliyor.
+
+
+class RoadIndex:
+    # Maske başına bir kez oluşturulan bağlı parça (connected component) etiketleri ve en yakın yol pikseli
+    # araması. Farklı parçalardaki kaynak ve hedef, arama başlamadan O(1) sürede reddedilir; yol dışındaki
+    # uç noktalar diğer uçtan ulaşılabilen en yakın yol pikseline taşınır.
+    # Etiketler build_adjacency_matrix ile aynı 8 yönlü komşuluğu kullanır.
+
+    def __init__(self, flat_img):
+        road = np.asarray(flat_img)
+        if road.ndim == 3:
+            road = road[:, :, 0]
+        road = road != 0
+        self.shape = road.shape
+
+        labels, self.component_count = ndimage.label(road, structure=np.ones((3, 3), dtype=bool))
+        self.labels = labels.ravel()
+        road_pixels = np.flatnonzero(self.labels)
+        if not road_pixels.size:
+            raise ValueError("Mask does not contain any road pixels")
+
+        # Parça numarasına göre sıralı yol pikselleri; her parçanın pikselleri ardışık bir dilimdir.
+        self.component_sizes = np.bincount(self.labels, minlength=self.component_count + 1)
+        self._component_start = np.concatenate([[0], np.cumsum(self.component_sizes[1:])])
+        self._pixels_by_component = road_pixels[np.argsort(self.labels[road_pixels], kind='stable')]
+
+        self._road_pixels = road_pixels
+        self._tree = cKDTree(np.stack(np.divmod(road_pixels, self.shape[1]), axis=1))
+        # Parça başına KD-ağaçları yalnızca gerektiğinde oluşturulur.
+        self._component_trees = {}
+
+    @property
+    def nbytes(self):
+        # Etiketler, piksel listeleri ve KD-ağaçlarının yaklaşık bellek boyutu.
+        trees = [self._tree] + [tree for tree, _ in self._component_trees.values()]
+        return (self.labels.nbytes + self.component_sizes.nbytes + self._component_start.nbytes +
+                self._pixels_by_component.nbytes + self._road_pixels.nbytes +
+                sum(tree.data.nbytes + tree.indices.nbytes for tree in trees))
+
+    def component(self, pixel_index):
+        # Pikselin parça numarası; yol dışındaki pikseller için 0.
+        return int(self.labels[pixel_index])
+
+    def connected(self, source, target):
+        label = self.labels[source]
+        return bool(label) and label == self.labels[target]
+
+    def _component_tree(self, component):
+        if component not in self._component_trees:
+            pixels = self._pixels_by_component[self._component_start[component - 1]:self._component_start[component]]
+            self._component_trees[component] = (cKDTree(np.stack(np.divmod(pixels, self.shape[1]), axis=1)), pixels)
+        return self._component_trees[component]
+
+    def nearest(self, pixel_index, component=None):
+        # En yakın yol pikseli ve ona olan Öklid uzaklığı. component verilirse yalnızca o parçada aranır.
+        point = divmod(int(pixel_index), self.shape[1])
+        if component is None:
+            tree, pixels = self._tree, self._road_pixels
+        else:
+            tree, pixels = self._component_tree(component)
+        distance, nearest = tree.query(point)
+        return int(pixels[nearest]), float(distance)
+
+    def resolve(self, source, target, max_snap_distance=None):
+        # Kaynak ve hedefi aramaya hazırla: yol dışındaki uçları taşı, ulaşılamayan çiftleri reddet.
+        # Dönüş: (kaynak, hedef) piksel indisleri. Ulaşılamıyorsa ValueError oluşur.
+        source, target = int(source), int(target)
+        source_label, target_label = self.labels[source], self.labels[target]
+        source_distance = target_distance = 0.0
+
+        if source_label and target_label:
+            if source_label != target_label:
+                raise ValueError("Target pixel is not reachable from the source pixel")
+            return source, target
+
+        if source_label:
+            target, target_distance = self.nearest(target, source_label)
+        elif target_label:
+            source, source_distance = self.nearest(source, target_label)
+        else:
+            snapped_source, source_distance = self.nearest(source)
+            snapped_target, target_distance = self.nearest(target)
+            if self.labels[snapped_source] != self.labels[snapped_target]:
+                # İki uç farklı parçalara düştü; toplam taşıma mesafesi en küçük olan seçenek kullanılır.
+                moved_target, moved_target_distance = self.nearest(target, self.labels[snapped_source])
+                moved_source, moved_source_distance = self.nearest(source, self.labels[snapped_target])
+                if source_distance + moved_target_distance <= moved_source_distance + target_distance:
+                    snapped_target, target_distance = moved_target, moved_target_distance
+                else:
+                    snapped_source, source_distance = moved_source, moved_source_distance
+            source, target = snapped_source, snapped_target
+
+        if max_snap_distance is not None and max(source_distance, target_distance) > max_snap_distance:
+            raise ValueError("No reachable road pixel within the snap distance")
+        return source, target
@@ -0,0 +1,267 @@
+import time  # Zaman ölçümleri için time modülü import ediliyor.
+from collections import deque  # Uç noktaları iskelete bağlayan BFS kuyruğu için deque import ediliyor.
+import numpy as np  # Sayısal hesaplamalar için numpy modülü import ediliyor.
+from scipy.sparse import csr_matrix  # Sıkıştırılmış yol ağı grafı için csr_matrix import ediliyor.
+from scipy.sparse.csgraph import dijkstra  # Ağırlıklı en kısa yol için dijkstra fonksiyonu import ediliyor.
+
+from path_output import build_path_output  # Ortak yol çıktı aşaması import ediliyor.
+from road_graph import NEIGHBOUR_OFFSETS  # 8 yönlü komşuluk kaymaları import ediliyor.
+
+SQRT2 = 2 ** 0.5
+
+
+def _neighbour_views(padded):
+    # Çerçevelenmiş (padded) resmin her piksel için P2..P9 komşularını saat yönünde döndür.
+    # Sıra: kuzey, kuzeydoğu, doğu, güneydoğu, güney, güneybatı, batı, kuzeybatı.
+    center = padded[1:-1, 1:-1]
+    height, width = center.shape
+    order = ((-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1))
+    return [padded[1 + y_diff:1 + y_diff + height, 1 + x_diff:1 + x_diff + width] for y_diff, x_diff in order]
+
+
+def skeletonize(mask):
+    # Zhang-Suen inceltme algoritması ile yol maskesini 1 piksel kalınlığında bir iskelete dönüştür.
+    # Her alt adım, bütün resim üzerinde vektörel olarak uygulanır.
+    padded = np.zeros((mask.shape[0] + 2, mask.shape[1] + 2), dtype=bool)
+    padded[1:-1, 1:-1] = np.asarray(mask) != 0
+    skeleton = padded[1:-1, 1:-1]
+
+    changed = True
+    while changed:
+        changed = False
+        for step in range(2):
+            p2, p3, p4, p5, p6, p7, p8, p9 = [view.astype(np.uint8) for view in _neighbour_views(padded)]
+            neighbours = [p2, p3, p4, p5, p6, p7, p8, p9, p2]
+
+            # B: siyah olmayan komşu sayısı, A: P2..P9 sırasındaki 0->1 geçiş sayısı.
+            count = p2 + p3 + p4 + p5 + p6 + p7 + p8 + p9
+            transitions = sum((a == 0) & (b == 1) for a, b in zip(neighbours[:-1], neighbours[1:]))
+
+            if step == 0:
+                side_conditions = (p2 * p4 * p6 == 0) & (p4 * p6 * p8 == 0)
+            else:
+                side_conditions = (p2 * p4 * p8 == 0) & (p2 * p6 * p8 == 0)
+
+            removable = skeleton & (count >= 2) & (count <= 6) & (transitions == 1) & side_conditions
+            if removable.any():
+                skeleton[removable] = False
+                changed = True
+
+    return skeleton.copy()
+
+
+class RoadTopology:
+    # Yol maskesinin piksel yerine kavşak ve yol parçaları üzerinden ifade edilen sıkıştırılmış grafı.
+    # Düğümler: iskeletteki uç noktalar ve kavşaklar (komşu sayısı 2'den farklı pikseller).
+    # Kenarlar: iki düğüm arasındaki iskelet parçaları; ağırlık, parçanın piksel cinsinden uzunluğu.
+
+    def __init__(self, flat_img):
+        self.shape = flat_img.shape
+        width = self.shape[1]
+        skeleton = skeletonize(flat_img)
+        # Uç noktaları iskelete bağlarken tek tek okunan yol pikselleri.
+        self._road = bytearray((np.asarray(flat_img) != 0).ravel())
+
+        # İskelet piksellerinin 8 yönlü komşu sayıları.
+        padded = np.zeros((self.shape[0] + 2, width + 2), dtype=np.uint8)
+        padded[1:-1, 1:-1] = skeleton
+        degree = sum(view for view in _neighbour_views(padded)) * skeleton
+
+        skeleton_pixels = np.flatnonzero(skeleton)
+        if not skeleton_pixels.size:
+            raise ValueError("Mask does not contain any road pixels")
+        self._skeleton = set(skeleton_pixels.tolist())
+
+        node_pixels = np.flatnonzero(skeleton & (degree != 2)).tolist()
+        self._node_of_pixel = {pixel: node for node, pixel in enumerate(node_pixels)}
+        self.node_pixels = node_pixels
+
+        # Parçalar: (başlangıç düğümü, bitiş düğümü, uzunluk, piksel dizisi).
+        self.segments = []
+        # Parça üzerindeki her ara piksel için (parça numarası, parça içindeki sırası).
+        self._chain_position = {}
+
+        for pixel in node_pixels:
+            self._trace_from(pixel)
+
+        # Hiç düğümü olmayan kapalı halkalar için halkadan bir pikseli düğüm yap.
+        for pixel in skeleton_pixels.tolist():
+            if pixel not in self._node_of_pixel and pixel not in self._chain_position:
+                self._add_node(pixel)
+                self._trace_from(pixel)
+
+        self.graph = self._build_graph()
+
+    def _add_node(self, pixel):
+        self._node_of_pixel[pixel] = len(self.node_pixels)
+        self.node_pixels.append(pixel)
+
+    def _skeleton_neighbours(self, pixel):
+        y, x = divmod(pixel, self.shape[1])
+        for y_diff, x_diff in NEIGHBOUR_OFFSETS:
+            neighbour_y, neighbour_x = y + y_diff, x + x_diff
+            if 0 <= neighbour_y < self.shape[0] and 0 <= neighbour_x < self.shape[1]:
+                neighbour = neighbour_y * self.shape[1] + neighbour_x
+                if neighbour in self._skeleton:
+                    yield neighbour, (SQRT2 if y_diff and x_diff else 1.0)
+
+    def _trace_from(self, start):
+        # Verilen düğümden çıkan her iskelet parçasını bir sonraki düğüme kadar takip et.
+        for first, step_length in self._skeleton_neighbours(start):
+            if first in self._node_of_pixel:
+                # Doğrudan komşu iki düğüm; kenarı yalnızca bir kez ekle.
+                if start < first:
+                    self.segments.append((self._node_of_pixel[start], self._node_of_pixel[first],
+                                          step_length, [start, first]))
+                continue
+            if first in self._chain_position:
+                # Bu parça diğer ucundan zaten takip edildi.
+                continue
+
+            polyline = [start, first]
+            length = step_length
+            segment_number = len(self.segments)
+            previous, current = start, first
+            while current not in self._node_of_pixel:
+                self._chain_position[current] = (segment_number, len(polyline) - 1)
+                following = [(pixel, step) for pixel, step in self._skeleton_neighbours(current)
+                             if pixel != previous and pixel not in self._chain_position]
+                if not following:
+                    # Halka başlangıç düğümüne geri döndü.
+                    following = [(pixel, step) for pixel, step in self._skeleton_neighbours(current)
+                                 if pixel != previous and pixel in self._node_of_pixel]
+                next_pixel, step_length = following[0]
+                polyline.append(next_pixel)
+                length += step_length
+                previous, current = current, next_pixel
+
+            self.segments.append((self._node_of_pixel[start], self._node_of_pixel[current], length, polyline))
+
+    def _build_graph(self):
+        # Aynı iki düğüm arasında birden fazla parça varsa en kısasını kullan.
+        self._best_segment = {}
+        for segment_number, (start, end, length, _) in enumerate(self.segments):
+            if start == end:
+                continue
+            key = (min(start, end), max(start, end))
+            if key not in self._best_segment or length < self.segments[self._best_segment[key]][2]:
+                self._best_segment[key] = segment_number
+
+        node_count = len(self.node_pixels)
+        if not self._best_segment:
+            return csr_matrix((node_count, node_count))
+        starts, ends = np.array(list(self._best_segment.keys())).T
+        lengths = np.array([self.segments[number][2] for number in self._best_segment.values()])
+        return csr_matrix((np.concatenate([lengths, lengths]),
+                           (np.concatenate([starts, ends]), np.concatenate([ends, starts]))),
+                          shape=(node_count, node_count))
+
+    def _link(self, pixel):
+        # Yol pikselinden en yakın iskelet pikseline yalnızca yol piksellerinden geçen 8 yönlü yol (BFS).
+        # Böylece geniş yollarda uç nokta ile iskelet arasında atlama olmaz ve yol aynı parçada kalır.
+        # Dönüş: pikselden iskelet pikseline piksel listesi (iki uç dahil).
+        if not self._road[pixel]:
+            raise ValueError("Source and target must be road pixels")
+        height, width = self.shape
+        parents = {pixel: None}
+        queue = deque([pixel])
+        while queue:
+            current = queue.popleft()
+            if current in self._skeleton:
+                chain = [current]
+                while parents[chain[-1]] is not None:
+                    chain.append(parents[chain[-1]])
+                return chain[::-1]
+            y, x = divmod(current, width)
+            for y_diff, x_diff in NEIGHBOUR_OFFSETS:
+                neighbour_y, neighbour_x = y + y_diff, x + x_diff
+                if 0 <= neighbour_y < height and 0 <= neighbour_x < width:
+                    neighbour = neighbour_y * width + neighbour_x
+                    if self._road[neighbour] and neighbour not in parents:
+                        parents[neighbour] = current
+                        queue.append(neighbour)
+        # İnceltme sırasında iskeleti tamamen silinen çok küçük bir parça.
+        raise ValueError("Target pixel is not reachable from the source pixel")
+
+    def _exits(self, pixel):
+        # İskelet pikselinden grafın düğümlerine çıkış yolları: (düğüm, mesafe, pikselden düğüme piksel listesi).
+        if pixel in self._node_of_pixel:
+            return [(self._node_of_pixel[pixel], 0.0, [pixel])]
+
+        segment_number, position = self._chain_position[pixel]
+        start, end, _, polyline = self.segments[segment_number]
+        return [(start, self._polyline_length(polyline[:position + 1]), polyline[position::-1]),
+                (end, self._polyline_length(polyline[position:]), polyline[position:])]
+
+    def _polyline_length(self, polyline):
+        y, x = np.divmod(np.asarray(polyline), self.shape[1])
+        diagonal = (np.diff(y) != 0) & (np.diff(x) != 0)
+        return float(np.where(diagonal, SQRT2, 1.0).sum())
+
+    def _segment_pixels(self, start, end):
+        # İki komşu düğüm arasındaki en kısa parçanın piksellerini start -> end yönünde döndür.
+        segment_start, _, _, polyline = self.segments[self._best_segment[(min(start, end), max(start, end))]]
+        return polyline if segment_start == start else polyline[::-1]
+
+    def find_path(self, source, target, simplify_tolerance=None, road_index=None):
+        # Sıkıştırılmış graf üzerinde en kısa yolu bul ve piksel koordinatlarına geri genişlet.
+        # Kaynak ve hedef yol pikseli olmalıdır (değilse ValueError); road_index (RoadIndex) verilirse yol dışındaki
+        # uç noktalar diğer motorlarda olduğu gibi önce en yakın ulaşılabilir yol pikseline taşınır.
+        # Dönüş: visualize_path ile uyumlu (y, x) koordinat dizisi ve işlem süresi. Ardışık pikseller 8 yönlü
+        # komşudur ve yolun tamamı maskenin içindedir.
+        # simplify_tolerance verilirse yol, Ramer-Douglas-Peucker ile sadeleştirilir.
+        start_time = time.time()
+        if road_index is not None:
+            source, target = road_index.resolve(source, target)
+        source, target = int(source), int(target)
+        # Uç noktalar iskelete maske içinden bağlanır; bağlantının iskelet ucu aramanın başladığı pikseldir.
+        source_link, target_link = self._link(source), self._link(target)
+        snapped_source, snapped_target = source_link[-1], target_link[-1]
+        source_exits = self._exits(snapped_source)
+        target_exits = self._exits(snapped_target)
+
+        best_length, best_pixels = np.inf, None
+
+        # Kaynak ve hedef aynı yol parçasındaysa doğrudan parça üzerinden git.
+        if snapped_source in self._chain_position and snapped_target in self._chain_position:
+            source_segment, source_position = self._chain_position[snapped_source]
+            target_segment, target_position = self._chain_position[snapped_target]
+            if source_segment == target_segment:
+                polyline = self.segments[source_segment][3]
+                if source_position <= target_position:
+                    best_pixels = polyline[source_position:target_position + 1]
+                else:
+                    best_pixels = polyline[target_position:source_position + 1][::-1]
+                best_length = self._polyline_length(best_pixels)
+
+        start_nodes = [node for node, _, _ in source_exits]
+        distances, predecessors = dijkstra(self.graph, directed=True, indices=start_nodes,
+                                           return_predecessors=True)
+
+        for row, (start_node, source_length, source_pixels) in enumerate(source_exits):
+            for end_node, target_length, target_pixels in target_exits:
+                length = source_length + distances[row, end_node] + target_length
+                if length >= best_length:
+                    continue
+
+                # Düğüm dizisini önceki düğümler üzerinden geri yürüyerek çıkar.
+                nodes = [end_node]
+                while nodes[-1] != start_node:
+                    nodes.append(predecessors[row, nodes[-1]])
+                nodes.reverse()
+
+                pixels = list(source_pixels)
+                for start, end in zip(nodes[:-1], nodes[1:]):
+                    pixels.extend(self._segment_pixels(start, end)[1:])
+                pixels.extend(target_pixels[::-1][1:])
+                best_length, best_pixels = length, pixels
+
+        if best_pixels is None:
+            raise ValueError("Target pixel is not reachable from the source pixel")
+
+        # İskelete bağlanan uç noktaları maske içindeki bağlantı yollarıyla birleştir.
+        best_pixels = source_link[:-1] + list(best_pixels) + target_link[::-1][1:]
+
+        path = build_path_output(best_pixels, self.shape[1], simplify_tolerance)
+        end_time = time.time()
+        return path, end_time - start_time
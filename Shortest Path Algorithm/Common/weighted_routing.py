@@ -0,0 +1,122 @@
+import time  # Zaman ölçümleri için time modülü import ediliyor.
+import numpy as np  # Sayısal hesaplamalar için numpy modülü import ediliyor.
+
+from path_output import build_path_output, reconstruct_path  # Ortak yol çıktı aşaması import ediliyor.
+from road_graph import NEIGHBOUR_OFFSETS  # 8 yönlü komşuluk kaymaları import ediliyor.
+
+# Adım maliyetleri tam sayıdır: düz adım 5, çapraz adım 7 (7 / 5 = 1.4, sqrt(2)'ye yakın).
+STRAIGHT_COST = 5
+DIAGONAL_COST = 7
+
+# Yol olasılığı eşikten 1'e çıktıkça piksel çarpanı 1 + PENALTY_LEVELS'tan 1'e iner.
+PENALTY_LEVELS = 4
+
+
+def quantize_costs(probability, threshold=0.5, levels=PENALTY_LEVELS):
+    # Segmentasyon olasılık haritasından piksel başına tam sayı maliyet çarpanı üret.
+    # probability: [0, 1] aralığında float olasılık haritası, [0, 255] aralığında 8 bitlik olasılık resmi
+    # (ör. create_flat_image çıktısı) veya ikili maske. bool ya da en büyük değeri 1 olan tam sayı maskeler,
+    # reponun geri kalanındaki gibi sıfırdan farklı her pikseli kesin yol olarak kabul eder.
+    # Dönüş: uint8 dizi; 0 yol olmayan pikseller, 1 (kesin yol) ile 1 + levels (eşikteki yol) arası yol pikselleri.
+    probability = np.asarray(probability)
+    if probability.ndim == 3:
+        probability = probability[:, :, 0]
+    if probability.dtype == bool or (np.issubdtype(probability.dtype, np.integer) and probability.max(initial=0) <= 1):
+        probability = (probability != 0).astype(np.float64)
+    elif np.issubdtype(probability.dtype, np.integer):
+        probability = probability / 255.0
+
+    road = (probability >= threshold) & (probability > 0)
+    uncertainty = (1.0 - np.clip(probability, threshold, 1.0)) / max(1.0 - threshold, 1e-9)
+    costs = np.zeros(probability.shape, dtype=np.uint8)
+    costs[road] = 1 + np.rint(levels * uncertainty[road]).astype(np.uint8)
+    return costs
+
+
+def find_path_dial(probability, source, target, threshold=0.5, levels=PENALTY_LEVELS, stats=None,
+                   simplify_tolerance=None):
+    # Dial algoritması: tam sayı kenar maliyetleri için, ikili yığın (heapq) yerine kova kuyruğu (bucket queue)
+    # kullanan Dijkstra. Kenar maliyeti = adım maliyeti * (iki uç pikselin maliyet çarpanlarının toplamı);
+    # böylece graf simetrik kalır ve düşük güvenli yol pikselleri pahalılaşır.
+    # Ekleme ve çıkarma O(1)'dir; kovalar en büyük kenar maliyeti + 1 uzunluğunda dairesel bir dizi oluşturur.
+    # Dönüş: kaynaktan hedefe (y, x) piksel koordinatları ve işlem süresi.
+    build_start_time = time.time()
+    costs = quantize_costs(probability, threshold, levels)
+    width = costs.shape[1]
+    padded_width = width + 2
+    padded = np.zeros((costs.shape[0] + 2, padded_width), dtype=np.uint8)
+    padded[1:-1, 1:-1] = costs
+    # Tek tek okunan değerler için bytearray, NumPy dizisinden çok daha hızlıdır.
+    costs = bytearray(padded.ravel())
+    start_time = time.time()
+
+    steps = [(y_diff * padded_width + x_diff, DIAGONAL_COST if y_diff and x_diff else STRAIGHT_COST)
+             for y_diff, x_diff in NEIGHBOUR_OFFSETS]
+    bucket_count = DIAGONAL_COST * 2 * (1 + levels) + 1
+    buckets = [[] for _ in range(bucket_count)]
+
+    source_y, source_x = divmod(source, width)
+    target_y, target_x = divmod(target, width)
+    padded_source = (source_y + 1) * padded_width + source_x + 1
+    padded_target = (target_y + 1) * padded_width + target_x + 1
+
+    infinity = float('inf')
+    distances = [infinity] * len(costs)
+    predecessors = [-1] * len(costs)
+    distances[padded_source] = 0
+    buckets[0].append(padded_source)
+    queued = 1
+    cursor = 0
+    pushes, pops, stale, expanded = 1, 0, 0, 0
+    peak_open = 1
+
+    if costs[padded_source] and costs[padded_target]:
+        while queued:
+            bucket = buckets[cursor % bucket_count]
+            if not bucket:
+                cursor += 1
+                continue
+
+            node = bucket.pop()
+            queued -= 1
+            pops += 1
+            # Mesafesi bu kovaya eklendikten sonra azalmış düğüm zaten işlendi.
+            if distances[node] != cursor:
+                stale += 1
+                continue
+            if node == padded_target:
+                break
+            expanded += 1
+            # Kuyruk yalnızca ekleme yapılırken büyüdüğü için en büyük boyut genişletme başına bir kez kontrol edilir.
+            if queued > peak_open:
+                peak_open = queued
+
+            node_cost = costs[node]
+            for offset, step_cost in steps:
+                neighbor = node + offset
+                neighbor_cost = costs[neighbor]
+                if not neighbor_cost:
+                    continue
+                distance = cursor + step_cost * (node_cost + neighbor_cost)
+                if distance < distances[neighbor]:
+                    distances[neighbor] = distance
+                    predecessors[neighbor] = node
+                    buckets[distance % bucket_count].append(neighbor)
+                    queued += 1
+                    pushes += 1
+
+    search_end_time = time.time()
+    if stats is not None:
+        # Kova kuyruğu işlemleri, yığın kullanan yol bulucularla aynı anahtarlarla yazılır.
+        stats.update(build_time=start_time - build_start_time, search_time=search_end_time - start_time,
+                     heap_pushes=pushes, heap_pops=pops, stale=stale, expanded=expanded, peak_open=peak_open,
+                     graph_nnz=None, graph_bytes=len(costs), cost=distances[padded_target])
+
+    # Hedefe ulaşılamıyorsa ValueError oluşur.
+    pixels_path = reconstruct_path(predecessors, padded_source, padded_target)
+    path = build_path_output(pixels_path, width, simplify_tolerance, padding=1)
+    end_time = time.time()
+
+    if stats is not None:
+        stats['postprocess_time'] = end_time - search_end_time
+    return path, end_time - start_time
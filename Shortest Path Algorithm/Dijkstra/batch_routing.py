@@ -0,0 +1,165 @@
+import os  # İşlemci sayısını öğrenmek için os modülü import ediliyor.
+import time  # Zaman ölçümleri için time modülü import ediliyor.
+from collections import defaultdict  # Çiftleri kaynağa göre gruplamak için defaultdict import ediliyor.
+from concurrent.futures import ProcessPoolExecutor  # Süreç havuzu için ProcessPoolExecutor import ediliyor.
+from multiprocessing import shared_memory  # Süreçler arası ortak bellek için import ediliyor.
+import numpy as np  # Sayısal hesaplamalar için numpy modülü import ediliyor.
+from scipy.sparse import csr_matrix  # CSR formatındaki sparse matris sınıfı import ediliyor.
+from scipy.sparse.csgraph import dijkstra  # Dijkstra algoritması için dijkstra fonksiyonu import ediliyor.
+
+from dijkstra import build_adjacency_matrix, create_flat_image, load_image, to_index
+from path_output import build_path_output, reconstruct_path
+from distance_field import DistanceField
+
+# Havuzdaki her sürecin ortak bellekten okuduğu graf ve resim genişliği.
+_worker_graph = None
+_worker_width = None
+_worker_tolerance = None
+_worker_blocks = []
+
+
+def share_array(array):
+    # Diziyi bir ortak bellek (shared memory) bloğuna kopyala.
+    # Dönüş: blok ve alt süreçlerin bloğa bağlanması için gereken (isim, şekil, veri tipi) bilgisi.
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+    return block, (block.name, array.shape, array.dtype.str)
+
+
+def attach_array(descriptor):
+    # share_array ile paylaşılan diziye kopyalamadan bağlan.
+    name, shape, dtype = descriptor
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+
+
+def _init_worker(descriptors, node_count, width, simplify_tolerance):
+    # Havuzdaki her süreç başlarken grafın CSR dizilerine ortak bellek üzerinden bağlanır.
+    global _worker_graph, _worker_width, _worker_tolerance
+    arrays = []
+    for descriptor in descriptors:
+        block, array = attach_array(descriptor)
+        _worker_blocks.append(block)
+        arrays.append(array)
+    _worker_graph = csr_matrix(tuple(arrays), shape=(node_count, node_count), copy=False)
+    _worker_width = width
+    _worker_tolerance = simplify_tolerance
+
+
+def route_from_source(adjacency, width, source, targets, simplify_tolerance=None):
+    # Tek bir kaynaktan en kısa yol ağacını bir kez hesapla ve bütün hedeflerin yollarını çıkar.
+    # Graf simetrik olduğu için directed=True kullanılır; böylece her çağrıda graf tekrar simetrikleştirilmez.
+    # Kenar ağırlıkları zaten 1.0 (float64) olduğundan unweighted=True verilmez: bu seçenek ve bool ağırlıklar
+    # scipy'nin her çağrıda grafın float64 bir kopyasını oluşturmasına yol açar.
+    distances, predecessors = dijkstra(adjacency, directed=True, indices=source, return_predecessors=True)
+    results = []
+    for target in targets:
+        if not np.isfinite(distances[target]):
+            # Hedef kaynakla aynı yol parçasında değil.
+            results.append((None, np.inf))
+            continue
+
+        pixels_path = reconstruct_path(predecessors, source, target)
+        path = build_path_output(pixels_path, width, simplify_tolerance)
+        results.append((path, distances[target]))
+    return results
+
+
+def _route_group(group):
+    # Süreç havuzunda çalışan görev: bir kaynak ve onun hedefleri.
+    source, targets = group
+    return route_from_source(_worker_graph, _worker_width, source, targets, _worker_tolerance)
+
+
+def route_batch(img, pairs, processes=None, adjacency=None, simplify_tolerance=None):
+    # Tek bir maske üzerinde çok sayıda (kaynak, hedef) piksel indisi çifti için en kısa yolları bul.
+    # Graf bir kez oluşturulur ve çiftler kaynağa göre gruplanır; her kaynak için Dijkstra bir kez çalışır.
+    # Farklı kaynaklar, grafı ortak bellekten kopyalamadan okuyan bir süreç havuzuna dağıtılır.
+    # Dönüş: her çift için kaynaktan hedefe (y, x) koordinat dizisi (ulaşılamıyorsa None) ve yol uzunlukları.
+    # simplify_tolerance verilirse yollar Ramer-Douglas-Peucker ile sadeleştirilmiş çoklu doğru olarak döner.
+    if adjacency is None:
+        adjacency = build_adjacency_matrix(img)
+    # scipy'nin csgraph fonksiyonları float64 ağırlık bekler. Ağırlıklar burada bir kez dönüştürülür; böylece
+    # süreçler ortak bellekteki dizileri kaynak başına kopyalamadan doğrudan kullanır.
+    if adjacency.data.dtype != np.float64:
+        adjacency = csr_matrix((adjacency.data.astype(np.float64), adjacency.indices, adjacency.indptr),
+                               shape=adjacency.shape)
+    width = img.shape[1]
+
+    groups = defaultdict(list)
+    for pair_number, (source, target) in enumerate(pairs):
+        groups[int(source)].append((pair_number, int(target)))
+    tasks = [(source, [target for _, target in members]) for source, members in groups.items()]
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = min(processes, len(tasks))
+
+    if processes <= 1:
+        # Tek süreçte ortak belleğe gerek yok.
+        task_results = [route_from_source(adjacency, width, source, targets, simplify_tolerance)
+                        for source, targets in tasks]
+    else:
+        blocks = []
+        try:
+            descriptors = []
+            for array in (adjacency.data, adjacency.indices, adjacency.indptr):
+                block, descriptor = share_array(np.asarray(array))
+                blocks.append(block)
+                descriptors.append(descriptor)
+
+            with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                     initargs=(descriptors, adjacency.shape[0], width, simplify_tolerance)) as pool:
+                chunksize = max(1, len(tasks) // (processes * 4))
+                task_results = list(pool.map(_route_group, tasks, chunksize=chunksize))
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    # Sonuçları çiftlerin ilk verildiği sıraya geri yerleştir.
+    paths = [None] * sum(len(members) for members in groups.values())
+    lengths = np.full(len(paths), np.inf)
+    for members, results in zip(groups.values(), task_results):
+        for (pair_number, _), (path, length) in zip(members, results):
+            paths[pair_number] = path
+            lengths[pair_number] = length
+    return paths, lengths
+
+
+def route_to_depots(img, depots, origins, simplify_tolerance=None):
+    # Çok sayıda başlangıç noktasından en yakın depoya (bir veya birden çok yol pikseli) giden yollar.
+    # Graf ve Dijkstra yerine depolardan maske üzerinde tek bir vektörel BFS dalgası çalıştırılır; her yol
+    # yön haritası izlenerek yol uzunluğuyla orantılı sürede çıkarılır.
+    # Dönüş: her başlangıç için başlangıçtan depoya (y, x) koordinat dizisi (ulaşılamıyorsa None), yol uzunlukları
+    # ve yolun ulaştığı deponun depots içindeki sırası (ulaşılamıyorsa -1).
+    field = DistanceField(img, depots)
+    origins = np.asarray(origins, dtype=np.int64)
+    paths = field.routes(origins, simplify_tolerance)
+    lengths = field.distances.ravel()[origins].astype(float)
+    lengths[lengths < 0] = np.inf
+    return paths, lengths, field.nearest_seed.ravel()[origins]
+
+
+def main():
+    # Örnek: aynı resim üzerinde rastgele seçilen yol pikselleri arasında toplu yol bulma.
+    file_path = r"E:\Desktop\University classes and homeworks\Season 4 Episode 2\FENG-498\Images\183.jpg"  # Sabit dosya yolu
+    flat_img = create_flat_image(load_image(file_path))
+
+    road_pixels = np.flatnonzero(flat_img)
+    rng = np.random.default_rng(0)
+    sources = rng.choice(road_pixels, 64)
+    pairs = [(source, target) for source in sources for target in rng.choice(road_pixels, 16)]
+    pairs.append((to_index(39, 429, flat_img.shape[1]), to_index(442, 930, flat_img.shape[1])))
+
+    start_time = time.time()
+    paths, lengths = route_batch(flat_img, pairs)
+    elapsed_time = time.time() - start_time
+
+    reachable = np.isfinite(lengths).sum()
+    print(f"Routed {len(pairs)} pairs ({reachable} reachable) in {elapsed_time:.2f} seconds, "
+          f"{len(pairs) / elapsed_time:.1f} pairs/second")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,19 @@
-import itertools  # Iterasyon işlemleri için itertools modülü import ediliyor.
+import os  # Dosya yolu işlemleri için os modülü import ediliyor.
+import sys  # Ortak modüllerin bulunduğu klasörü arama yoluna eklemek için sys modülü import ediliyor.
 import imageio  # Resim okuma işlemleri için imageio modülü import ediliyor.
 import numpy as np  # Sayısal hesaplamalar için numpy modülü import ediliyor.
-from scipy.sparse import dok_matrix  # Sparse matris işlemleri için dok_matrix sınıfı import ediliyor.
 from scipy.sparse.csgraph import dijkstra  # Dijkstra algoritması için dijkstra fonksiyonu import ediliyor.
-import matplotlib.pyplot as plt  # Grafik çizimleri için matplotlib modülü import ediliyor.
 import time  # Zaman ölçümleri için time modülü import ediliyor.
 
+# İki algoritmanın ortak kullandığı modüller "Common" klasöründe bulunuyor.
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'Common'))
+from road_graph import NeighbourMask, build_adjacency_matrix  # CSR ve bit paketli graf gösterimleri import ediliyor.
+from graph_cache import GraphCache  # Oluşturulan grafları diskte saklayan önbellek import ediliyor.
+from path_output import build_path_output, reconstruct_path  # Ortak yol çıktı aşaması import ediliyor.
+from weighted_routing import find_path_dial  # Olasılık ağırlıklı, kova kuyruklu Dijkstra import ediliyor.
+from road_index import RoadIndex  # Uç noktaları yola taşıyan ve ulaşılamayan çiftleri reddeden indeks import ediliyor.
+from instrumentation import graph_footprint  # Graf boyutunu ölçüm kayıtlarına eklemek için import ediliyor.
+
 def load_image(file_path):
     # Belirtilen dosya yolundaki resmi yükle ve döndür.
     return imageio.v2.imread(file_path)
@@ -26,91 +34,200 @@ def to_coordinates(index, width):
     y, x = divmod(index, width)
     return y, x
 
-def build_adjacency_matrix(img):
-    # Verilen resmin bitişiklik matrisini oluştur ve dok_matrix formatında sakla.
-    img_size = img.size
-    adjacency = dok_matrix((img_size, img_size), dtype=bool)
-
-    # Pikseller arası bitişiklik ilişkilerini kontrol et.
-    # Her yönde (0, 1, -1) birer birim kayma sağlayan koordinat çiftlerini içeren bir liste oluşturuluyor.
-    directions = list(itertools.product([0, 1, -1], [0, 1, -1]))
-
-    # Resmin kenar piksellerini kontrol etmek ve bitişiklik ilişkilerini oluşturmak için iki döngü kullanılıyor.
-    for i in range(1, img.shape[0] - 1):
-        for j in range(1, img.shape[1] - 1):
-            # Eğer piksel siyah (0) ise, bu pikseli görmezden gel ve diğerlerine geç.
-            if not img[i, j]:
-                continue
-
-            # Her bir yönde (komşu pikseller) dolaşarak bitişiklik ilişkilerini kontrol et.
-            for y_diff, x_diff in directions:
-                # Eğer komşu piksel siyah (1) ise, bu iki piksel arasında bir bitişiklik ilişkisi vardır.
-                if img[i + y_diff, j + x_diff]:
-                    # Bitişiklik matrisinde ilgili indisleri True olarak işaretle.
-                    adjacency[to_index(i, j, img.shape[1]),
-                    to_index(i + y_diff, j + x_diff, img.shape[1])] = True
-
-    # Oluşturulan bitişiklik matrisi döndürülüyor.
-    return adjacency
-
-def find_path(img, source, target):
+def index_dtype(adjacency):
+    # Graf gösteriminin düğüm indisleri için kullandığı tam sayı türü.
+    if isinstance(adjacency, NeighbourMask):
+        return adjacency.index_dtype
+    return adjacency.indices.dtype
+
+def expand_frontier(adjacency, frontier):
+    # Sınırdaki (frontier) tüm düğümlerin komşularını CSR dizilerinden tek seferde topla.
+    # Her komşu için, ona ulaşılan düğüm de (parent) aynı sırada döndürülür.
+    # Bit paketli NeighbourMask verilirse komşular baytlardaki bitlerden hesaplanır.
+    if isinstance(adjacency, NeighbourMask):
+        return adjacency.expand(frontier)
+    starts = adjacency.indptr[frontier]
+    counts = adjacency.indptr[frontier + 1] - starts
+    parents = np.repeat(frontier, counts)
+
+    # Her düğümün komşu aralığındaki sıra numarasını hesapla ve indices dizisinden komşuları oku.
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    neighbours = adjacency.indices[np.repeat(starts, counts) + offsets]
+    return neighbours, parents
+
+def bfs_predecessors(adjacency, source, target, stats=None):
+    # Graf ağırlıksız olduğu için Dijkstra, seviye seviye ilerleyen bir BFS'e denktir.
+    # Arama hedef piksele ulaşıldığı anda durdurulur; resmin geri kalanı dolaşılmaz.
+    predecessors = np.full(adjacency.shape[0], -9999, dtype=index_dtype(adjacency))
+    visited = np.zeros(adjacency.shape[0], dtype=bool)
+    visited[source] = True
+
+    frontier = np.array([source], dtype=index_dtype(adjacency))
+    peak_open = 1
+    while frontier.size and not visited[target]:
+        peak_open = max(peak_open, frontier.size)
+        neighbours, parents = expand_frontier(adjacency, frontier)
+
+        # Daha önce ziyaret edilmemiş komşuları işaretle ve önceki düğümlerini kaydet.
+        is_new = ~visited[neighbours]
+        neighbours, parents = neighbours[is_new], parents[is_new]
+        predecessors[neighbours] = parents
+        visited[neighbours] = True
+        frontier = np.unique(neighbours)
+
+    if stats is not None:
+        stats.update(expanded=int(visited.sum()), peak_open=int(peak_open))
+
+    # scipy'nin dijkstra fonksiyonu ile aynı şekilde, ulaşılamayan düğümler -9999 olarak kalır.
+    return predecessors
+
+def bidirectional_bfs_path(adjacency, source, target, stats=None):
+    # Kaynaktan ve hedeften aynı anda büyüyen iki BFS ile en kısa yolu bul.
+    # Her adımda daha küçük olan sınır bir seviye genişletilir; iki arama buluştuğunda durulur.
+    # Dönüş: kaynaktan hedefe doğru (iki uç dahil) piksel indisleri.
+    node_count = adjacency.shape[0]
+    predecessors = [np.full(node_count, -9999, dtype=index_dtype(adjacency)) for _ in range(2)]
+    distances = [np.full(node_count, -1, dtype=np.int64) for _ in range(2)]
+    frontiers = [np.array([source], dtype=index_dtype(adjacency)),
+                 np.array([target], dtype=index_dtype(adjacency))]
+    distances[0][source] = 0
+    distances[1][target] = 0
+    depths = [0, 0]
+    peak_open = 2
+
+    meeting = source if source == target else None
+    while meeting is None and frontiers[0].size and frontiers[1].size:
+        # 0: kaynak tarafı, 1: hedef tarafı. Küçük olan sınırı genişlet.
+        side = 0 if frontiers[0].size <= frontiers[1].size else 1
+        other = 1 - side
+        peak_open = max(peak_open, frontiers[0].size + frontiers[1].size)
+
+        neighbours, parents = expand_frontier(adjacency, frontiers[side])
+        is_new = distances[side][neighbours] < 0
+        neighbours, parents = neighbours[is_new], parents[is_new]
+
+        depths[side] += 1
+        predecessors[side][neighbours] = parents
+        distances[side][neighbours] = depths[side]
+        frontiers[side] = np.unique(neighbours)
+
+        # Diğer aramanın da ulaştığı pikseller arasından toplam mesafesi en kısa olanı seç.
+        met = frontiers[side][distances[other][frontiers[side]] >= 0]
+        if met.size:
+            meeting = met[np.argmin(distances[other][met])]
+
+    if stats is not None:
+        stats.update(expanded=int((distances[0] >= 0).sum() + (distances[1] >= 0).sum()), peak_open=int(peak_open))
+
+    if meeting is None:
+        raise ValueError("Target pixel is not reachable from the source pixel")
+
+    # Buluşma noktasının iki tarafındaki yarıları birleştir: kaynak -> buluşma -> hedef.
+    source_half = reconstruct_path(predecessors[0], source, meeting)
+    target_half = reconstruct_path(predecessors[1], target, meeting)
+    return np.concatenate([source_half, target_half[::-1][1:]])
+
+def find_path(img, source, target, mode='full', cache=None, simplify_tolerance=None, stats=None, road_index=None,
+              graph='csr'):
     # Verilen resimdeki başlangıç ve hedef noktalar arasındaki en kısa yolu bul.
-    adjacency = build_adjacency_matrix(img)
+    # mode='full': scipy dijkstra ile kaynaktan tüm resmi dolaşır. Arama C içinde yapıldığı için genellikle en
+    # hızlı seçenektir ve varsayılan olarak kullanılır.
+    # mode='early': hedefe ulaşıldığı anda duran BFS kullanır. Her BFS seviyesi ayrı NumPy işlemleriyle
+    # genişletildiğinden yalnızca hedef kaynağa çok yakınken 'full' moddan hızlıdır; uzun ve dar yollarda
+    # (ör. koridorlar) birkaç kat yavaştır.
+    # mode='bidirectional': kaynak ve hedeften aynı anda büyüyen iki yönlü BFS kullanır.
+    # mode='weighted': img yol olasılık haritası olarak kullanılır; çapraz adımlar ve düşük olasılıklı pikseller
+    # daha pahalıdır ve arama kova kuyruklu Dial algoritması ile yapılır (graf oluşturulmaz).
+    # cache: GraphCache verilirse graf her seferinde yeniden oluşturulmaz, önbellekten okunur.
+    # simplify_tolerance: verilirse yol, Ramer-Douglas-Peucker ile bu toleransta sadeleştirilir.
+    # stats: sözlük verilirse graf oluşturma, arama ve son işlem süreleri, ziyaret edilen düğüm sayısı, en büyük
+    # BFS sınırı ve grafın kenar sayısı ile bellek boyutu yazılır (alanlar için instrumentation.STAT_FIELDS).
+    # Arama alanları yol çıkarılmadan önce yazıldığı için hedefe ulaşılamadığında da doldurulmuş olur.
+    # road_index: RoadIndex verilirse yol dışındaki uç noktalar en yakın ulaşılabilir yol pikseline taşınır ve
+    # farklı yol parçalarındaki kaynak ve hedef, graf oluşturulmadan ValueError ile reddedilir.
+    # graph='packed': CSR matrisi yerine piksel başına 1 baytlık NeighbourMask kullanılır ('early' ve
+    # 'bidirectional' modları için; bellek kullanımı yaklaşık bir kat daha azdır, cache kullanılmaz).
+    # Önceden oluşturulmuş bir NeighbourMask veya CSR komşuluk matrisi de verilebilir; bu durumda graf yeniden
+    # oluşturulmaz ve cache kullanılmaz.
+    # Dönüş: kaynaktan hedefe (y, x) piksel koordinatları ve işlem süresi.
+    if mode not in ('full', 'early', 'bidirectional', 'weighted'):
+        raise ValueError(f"Unknown search mode: {mode}")
+    prebuilt = isinstance(graph, NeighbourMask) or hasattr(graph, 'indptr')
+    if not prebuilt and graph not in ('csr', 'packed'):
+        raise ValueError(f"Unknown graph representation: {graph}")
+    packed = isinstance(graph, NeighbourMask) or (not prebuilt and graph == 'packed')
+    if packed and mode == 'full':
+        raise ValueError("mode='full' runs scipy's dijkstra and needs the CSR graph")
+    if road_index is not None:
+        source, target = road_index.resolve(source, target)
+    if mode == 'weighted':
+        return find_path_dial(img, source, target, stats=stats, simplify_tolerance=simplify_tolerance)
+
+    build_start_time = time.time()
+    if prebuilt:
+        adjacency = graph
+    elif packed:
+        adjacency = NeighbourMask(img)
+    elif cache is not None:
+        adjacency = cache.get_or_build(img)
+    else:
+        adjacency = build_adjacency_matrix(img)
 
     start_time = time.time()  # Zaman ölçümü başlatılıyor.
-    # Dijkstra algoritması kullanılarak en kısa yolu ve önceki düğümleri bul.
-    _, predecessors = dijkstra(adjacency, directed=False, indices=[source],
-                               unweighted=True, return_predecessors=True)
-    # Burada, adjacency matrisi üzerinde Dijkstra algoritması kullanılıyor.
-    # directed=False, çizgesinin yönlendirilmemiş olduğunu belirtir.
-    # indices=[source], başlangıç düğümünü belirtir.
-    # unweighted=True, ağırlıkların kullanılmadığını ve tüm kenarların aynı uzunluğa sahip olduğunu belirtir.
-    # return_predecessors=True, Dijkstra'nın önceki düğümleri de döndürmesini sağlar.
-
-    # Dijkstra algoritması sonucunda elde edilen en kısa yolu ve önceki düğümleri içeren
-    # predecessors değişkeni kullanılabilir. Bu bilgiler daha sonra en kısa yolun oluşturulması için kullanılacaktır.
-
-    print("Shape of predecessors array:", predecessors.shape)
-
-    pixel_index = target
-    pixels_path = []
-    while pixel_index != source:
-        # Hedeften başlayarak geriye doğru yol üzerindeki pikselleri bul.
-        pixels_path.append(pixel_index)
-
-        # Eğer pixel_index geçerli bir aralıkta değilse, hata mesajı yazdır ve döngüyü kır.
-        if pixel_index < 0 or pixel_index >= predecessors.shape[1]:
-            print(f"Invalid pixel_index: {pixel_index}")
-            break
-
-        # Bir önceki düğümü bulmak için predecessors matrisini kullan.
-        pixel_index = predecessors[0, pixel_index]
-
-    # Yolu içeren piksel dizisi oluşturuluyor.
-    smoothed_path = []
-    for pixel_index in pixels_path:
-        # Bulunan yolun her pikselini daha düzgün bir yola dönüştür.
-        i, j = to_coordinates(pixel_index, img.shape[1])
-
-        # Yolu daha düzgün hale getirmek için piksel aralıklarını lineer bir şekilde böler.
-        smoothed_path.extend(zip(np.linspace(i, i + 1, 100), np.linspace(j, j + 1, 100)))
-
-    # Elde edilen düzgün yolu içeren array'i oluştur ve tamsayıya dönüştür.
-    smoothed_path = np.array(smoothed_path).astype(int)
+
+    if mode == 'bidirectional':
+        pixels_path = bidirectional_bfs_path(adjacency, source, target, stats)
+    elif mode == 'early':
+        # Hedefe ulaşıldığında duran BFS ile önceki düğümleri bul.
+        predecessors = bfs_predecessors(adjacency, source, target, stats)
+    else:
+        # Dijkstra algoritması kullanılarak en kısa yolu ve önceki düğümleri bul.
+        distances, predecessors = dijkstra(adjacency, directed=True, indices=[source], return_predecessors=True)
+        # Burada, adjacency matrisi üzerinde Dijkstra algoritması kullanılıyor.
+        # directed=True: graf zaten simetrik olduğu için scipy'nin her çağrıda grafın simetrik bir kopyasını
+        # oluşturması önlenir; sonuç directed=False ile aynıdır.
+        # indices=[source], başlangıç düğümünü belirtir.
+        # Tüm kenar ağırlıkları 1 olduğundan unweighted=True verilmez; bu seçenek grafın bir kopyasını oluşturur.
+        # return_predecessors=True, Dijkstra'nın önceki düğümleri de döndürmesini sağlar.
+
+        # Dijkstra algoritması sonucunda elde edilen en kısa yolu ve önceki düğümleri içeren
+        # predecessors değişkeni kullanılabilir. Bu bilgiler daha sonra en kısa yolun oluşturulması için kullanılacaktır.
+
+        predecessors = predecessors[0]
+        if stats is not None:
+            stats['expanded'] = int(np.isfinite(distances).sum())
+
+    search_end_time = time.time()
+    if stats is not None:
+        graph_nnz, graph_bytes = graph_footprint(adjacency)
+        stats.update(build_time=start_time - build_start_time, search_time=search_end_time - start_time,
+                     graph_nnz=graph_nnz, graph_bytes=graph_bytes)
+
+    if mode != 'bidirectional':
+        # Hedeften kaynağa geri yürüyerek yolu kaynaktan hedefe doğru sıralı olarak çıkar.
+        # Hedefe ulaşılamıyorsa ValueError oluşur.
+        pixels_path = reconstruct_path(predecessors, source, target)
+
+    path = build_path_output(pixels_path, img.shape[1], simplify_tolerance)
     end_time = time.time()  # Zaman ölçümü sona eriyor.
 
-    # Düzgün yolu ve işlem süresini döndür.
-    return smoothed_path, end_time - start_time
+    if stats is not None:
+        stats['postprocess_time'] = end_time - search_end_time
+
+    # Yolu ve işlem süresini döndür.
+    return path, end_time - start_time
 
 
 def visualize_path(original_img, path):
     # Verilen resmi ve bulunan yolu görselleştir.
+    # matplotlib yalnızca burada gerektiği için fonksiyon içinde import edilir; yol bulma için yüklenmez.
+    import matplotlib.pyplot as plt
 
     # Resmi matplotlib kütüphanesini kullanarak görselleştir. Eğer resim siyah-beyaz (2D) ise 'gray',
     # renkli (3D) ise renkleri koru şeklinde renklendirme yapılır.
     plt.imshow(original_img, cmap='gray' if len(original_img.shape) == 2 else None)
 
-    # Yolu içeren array'i kullanarak grafiği çiz. Yol, mavi renkte, kalınlığı 3 piksel olarak belirtilmiştir.
+    # Yolu içeren (y, x) koordinat dizisini kullanarak grafiği çiz. Yol, mavi renkte, kalınlığı 3 piksel olarak belirtilmiştir.
     path_array = np.array(path)
     plt.plot(path_array[:, 1], path_array[:, 0], color='blue', linewidth=3)
 
@@ -138,8 +255,15 @@ def main():
     target_x = 930
     target = to_index(target_y, target_x, original_img.shape[1])
 
-    # En kısa yolu ve geçen süreyi hesapla.
-    path, elapsed_time = find_path(flat_img, source, target)
+    # Oluşturulan graflar script'in yanındaki klasörde saklanır; aynı harita için tekrar oluşturulmaz.
+    cache = GraphCache(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'graph_cache'),
+                       max_bytes=2 * 1024 ** 3)
+
+    # Yol dışındaki veya farklı yol parçalarındaki noktalar arama başlamadan ele alınır.
+    road_index = RoadIndex(flat_img)
+
+    # En kısa yolu ve geçen süreyi hesapla. scipy dijkstra kullanılıyor.
+    path, elapsed_time = find_path(flat_img, source, target, mode='full', cache=cache, road_index=road_index)
 
     # Bulunan yolu ve resmi görselleştir.
     visualize_path(original_img, path)
@@ -0,0 +1,276 @@
+import argparse  # Komut satırı seçenekleri için argparse modülü import ediliyor.
+import glob  # Toplu modda klasördeki sahneleri bulmak için glob modülü import ediliyor.
+import hashlib  # Girdilerden önbellek anahtarı üretmek için hashlib modülü import ediliyor.
+import json  # Parametreleri ve sonuçları kaydetmek için json modülü import ediliyor.
+import os  # Dosya yolu işlemleri için os modülü import ediliyor.
+import sys  # Diğer klasörlerdeki modülleri arama yoluna eklemek için sys modülü import ediliyor.
+import time  # Aşama sürelerini ölçmek için time modülü import ediliyor.
+import uuid  # Geçici dosya isimleri için uuid modülü import ediliyor.
+import numpy as np  # Sayısal hesaplamalar için numpy modülü import ediliyor.
+
+# Yol bulucular "Common", "Dijkstra" ve "A Star" klasörlerinde, yol çıkarıcılar "Image Segmentation" klasöründe.
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.append(os.path.join(BASE_DIR, 'Common'))
+sys.path.append(os.path.join(BASE_DIR, 'Dijkstra'))
+sys.path.append(os.path.join(BASE_DIR, 'A Star'))
+sys.path.append(os.path.join(BASE_DIR, os.pardir, 'Image Segmentation', 'Python Code'))
+from graph_cache import GraphCache, mask_key  # Graf önbelleği ve maske anahtarı import ediliyor.
+from road_index import RoadIndex  # Uç noktaları yola taşıyan bağlı parça indeksi import ediliyor.
+from instrumentation import JsonLineSink, search_record  # Sorgu ölçümlerini JSON satırı olarak yazmak için import ediliyor.
+import dijkstra as dijkstra_routing  # Dijkstra tabanlı yol bulucular import ediliyor.
+import A_Star_Algorithm as a_star_routing  # A* ve Jump Point Search yol bulucuları import ediliyor.
+
+EXTRACTORS = ('mask', 'canny', 'unet')
+ENGINES = ('dijkstra', 'bidirectional', 'a_star', 'a_star_grid', 'jps')
+SCENE_PATTERNS = ('*.jpg', '*.jpeg', '*.png', '*.tif', '*.tiff')
+
+# Aşamaların çıktı biçimi değişirse eski önbellek kayıtları bu sürüm ile geçersiz olur.
+PIPELINE_VERSION = 2
+
+
+def file_digest(file_path):
+    # Dosya içeriğinin sha256 özetini parça parça okuyarak hesapla.
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as input_file:
+        for chunk in iter(lambda: input_file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def stage_key(stage, **parameters):
+    # Aşama adı ve parametrelerinden (girdi özetleri dahil) kararlı bir önbellek anahtarı üret.
+    payload = json.dumps({'stage': stage, 'version': PIPELINE_VERSION, **parameters}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class StageCache:
+    # Aşama çıktılarını cache_dir/<aşama>/<anahtar>.npy olarak saklayan basit önbellek.
+    # Graf aşaması, bellek eşlemeli okuma yapan GraphCache ile cache_dir/graph altında saklanır.
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.graphs = GraphCache(os.path.join(cache_dir, 'graph'), max_bytes=2 * 1024 ** 3)
+
+    def _path(self, stage, key):
+        return os.path.join(self.cache_dir, stage, key + '.npy')
+
+    def load(self, stage, key):
+        file_path = self._path(stage, key)
+        if not os.path.isfile(file_path):
+            return None
+        return np.load(file_path, mmap_mode='r')
+
+    def store(self, stage, key, array):
+        # Önce geçici dosyaya yaz, sonra tek adımda yerine taşı; yarım yazılmış kayıt okunmaz.
+        file_path = self._path(stage, key)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        temp_path = f"{file_path}.{uuid.uuid4().hex}.tmp.npy"
+        np.save(temp_path, np.asarray(array))
+        os.replace(temp_path, file_path)
+
+
+def extract_mask(image_path, extractor='mask', model_path=None, threshold=0.5):
+    # Uydu görüntüsünden yol maskesi çıkar. Dönüş: yol pikselleri sıfırdan farklı olan 2D maske.
+    if extractor == 'mask':
+        # Girdi zaten bir yol maskesi; yol bulucu betiklerindeki gibi ilk kanal kullanılır.
+        return np.ascontiguousarray(dijkstra_routing.create_flat_image(dijkstra_routing.load_image(image_path)))
+
+    import cv2  # OpenCV yalnızca görüntüden maske çıkarılırken gerekiyor.
+    sat_image = cv2.imread(image_path, cv2.IMREAD_COLOR)
+    if sat_image is None:
+        raise ValueError(f"Could not read image: {image_path}")
+
+    if extractor == 'canny':
+        from road_extraction import extract_roads
+        mask, _ = extract_roads(sat_image)
+        return mask
+
+    if model_path is None:
+        raise ValueError("The unet extractor needs a model path")
+    from inference import predict_large_image
+    from model_export import load_predictor
+    _, mask, _ = predict_large_image(load_predictor(model_path), sat_image, threshold=threshold)
+    return mask
+
+
+def find_route(flat_img, source, target, engine, adjacency=None, simplify_tolerance=None, stats=None):
+    # Seçilen yol bulucu ile (y, x) koordinat dizisi olarak yolu bul.
+    # adjacency: sahne için bir kez açılmış CSR komşuluk matrisi; verilmezse graf yol bulucu içinde oluşturulur.
+    # stats: sözlük verilirse yol bulucunun ölçümleri buraya yazılır.
+    graph = adjacency if adjacency is not None else 'csr'
+    if engine == 'dijkstra':
+        return dijkstra_routing.find_path(flat_img, source, target, mode='full', graph=graph,
+                                          simplify_tolerance=simplify_tolerance, stats=stats)
+    if engine == 'bidirectional':
+        return dijkstra_routing.find_path(flat_img, source, target, mode='bidirectional', graph=graph,
+                                          simplify_tolerance=simplify_tolerance, stats=stats)
+    if engine == 'a_star':
+        return a_star_routing.find_path_a_star(flat_img, source, target, graph=graph,
+                                               simplify_tolerance=simplify_tolerance, stats=stats)
+    if engine == 'a_star_grid':
+        return a_star_routing.find_path_a_star_grid(flat_img, source, target, heuristic='octile',
+                                                    simplify_tolerance=simplify_tolerance, stats=stats)
+    return a_star_routing.find_path_jps(flat_img, source, target, simplify_tolerance=simplify_tolerance,
+                                        stats=stats)
+
+
+def run_scene(image_path, queries, cache, extractor='mask', model_path=None, engine='dijkstra',
+              threshold=0.5, simplify_tolerance=None, metrics=None):
+    # Tek bir sahne için görüntü -> maske -> graf -> yol aşamalarını çalıştır.
+    # queries: ((source_y, source_x), (target_y, target_x)) çiftleri.
+    # metrics: JsonLineSink verilirse önbellekten gelmeyen her arama için bir ölçüm kaydı yazılır.
+    # Dönüş: her sorgu için sonuç sözlükleri ve aşama süreleri.
+    timings = {}
+
+    start_time = time.perf_counter()
+    parameters = {'image': file_digest(image_path), 'extractor': extractor}
+    if extractor == 'unet':
+        parameters.update(model=file_digest(model_path), threshold=threshold)
+    key = stage_key('mask', **parameters)
+    flat_img = cache.load('mask', key)
+    timings['mask_cached'] = flat_img is not None
+    if flat_img is None:
+        flat_img = extract_mask(image_path, extractor, model_path, threshold)
+        cache.store('mask', key, flat_img)
+    timings['mask'] = time.perf_counter() - start_time
+
+    # Graf önbelleği maskenin içeriğiyle anahtarlanır; aynı maske farklı sahnelerden gelse de tekrar oluşturulmaz.
+    start_time = time.perf_counter()
+    graph_key = mask_key(flat_img)
+    adjacency = None
+    if engine in ('dijkstra', 'bidirectional', 'a_star'):
+        # Graf sahne başına bir kez açılır ve sorgulara doğrudan verilir; böylece her sorguda maske yeniden
+        # özetlenmez ve önbellek kaydı yeniden açılmaz.
+        adjacency = cache.graphs.load(graph_key)
+        timings['graph_cached'] = adjacency is not None
+        if adjacency is None:
+            adjacency = cache.graphs.get_or_build(flat_img)
+    timings['graph'] = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    width = flat_img.shape[1]
+    # Yol dışındaki uç noktalar en yakın ulaşılabilir yol pikseline taşınır; farklı parçalardaki çiftler
+    # arama yapılmadan reddedilir.
+    road_index = RoadIndex(flat_img)
+    results = []
+    for (source_y, source_x), (target_y, target_x) in queries:
+        result = {'source': [source_y, source_x], 'target': [target_y, target_x]}
+        path_key = stage_key('path', graph=graph_key, engine=engine, source=result['source'],
+                             target=result['target'], simplify_tolerance=simplify_tolerance)
+        path = cache.load('path', path_key)
+        result['cached'] = path is not None
+        if path is None:
+            stats = {} if metrics is not None else None
+            try:
+                source, target = road_index.resolve(dijkstra_routing.to_index(source_y, source_x, width),
+                                                    dijkstra_routing.to_index(target_y, target_x, width))
+                path, _ = find_route(flat_img, source, target, engine, adjacency, simplify_tolerance, stats)
+            except ValueError as error:
+                result['error'] = str(error)
+            if metrics is not None:
+                metrics.write(search_record(stats, engine, scene=os.path.basename(image_path),
+                                            source=result['source'], target=result['target'],
+                                            error=result.get('error')))
+            if path is None:
+                results.append(result)
+                continue
+            cache.store('path', path_key, path)
+        result['path'] = np.asarray(path).tolist()
+        results.append(result)
+    timings['path'] = time.perf_counter() - start_time
+    return results, timings
+
+
+def plot_routes(image_path, results, output_path):
+    # Sahneyi ve bulunan yolları bir resim dosyasına çiz. matplotlib yalnızca burada gerekiyor.
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    original_img = dijkstra_routing.load_image(image_path)
+    plt.figure()
+    plt.imshow(original_img, cmap='gray' if len(original_img.shape) == 2 else None)
+    for result in results:
+        if 'path' in result:
+            path_array = np.array(result['path'])
+            plt.plot(path_array[:, 1], path_array[:, 0], color='blue', linewidth=3)
+    plt.savefig(output_path, bbox_inches='tight')
+    plt.close()
+
+
+def load_queries(queries_path):
+    # Toplu mod sorgu dosyası: {"sahne_dosyası": [[source_y, source_x, target_y, target_x], ...], ...}
+    with open(queries_path) as queries_file:
+        raw_queries = json.load(queries_file)
+    return {name: [((query[0], query[1]), (query[2], query[3])) for query in queries]
+            for name, queries in raw_queries.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Satellite image -> road mask -> graph -> shortest path.")
+    parser.add_argument('input', help="scene image, or a folder of scenes with --batch")
+    parser.add_argument('--batch', action='store_true', help="process every image in the input folder")
+    parser.add_argument('--source', nargs=2, type=int, metavar=('Y', 'X'))
+    parser.add_argument('--target', nargs=2, type=int, metavar=('Y', 'X'))
+    parser.add_argument('--queries', help="JSON file mapping scene file names to [sy, sx, ty, tx] queries")
+    parser.add_argument('--extractor', choices=EXTRACTORS, default='mask',
+                        help="'mask' if the input already is a road mask")
+    parser.add_argument('--model', help="U-Net model (.keras / .h5 / .tflite) for --extractor unet")
+    parser.add_argument('--threshold', type=float, default=0.5)
+    parser.add_argument('--engine', choices=ENGINES, default='dijkstra')
+    parser.add_argument('--simplify', type=float, default=None, help="Ramer-Douglas-Peucker tolerance in pixels")
+    parser.add_argument('--cache-dir', default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                            'pipeline_cache'))
+    parser.add_argument('--output-dir', default='.', help="where the result JSON (and plots) are written")
+    parser.add_argument('--plot', action='store_true', help="also save an image of every routed scene")
+    parser.add_argument('--metrics', help="append one JSON line of search statistics per routed query to this file "
+                                          "('-' for stdout)")
+    args = parser.parse_args()
+
+    if args.extractor == 'unet' and args.model is None:
+        parser.error("--extractor unet needs --model")
+    per_scene_queries = load_queries(args.queries) if args.queries else None
+    if per_scene_queries is None and (args.source is None or args.target is None):
+        parser.error("give --source and --target, or a --queries file")
+    default_queries = [(tuple(args.source), tuple(args.target))] if args.source and args.target else []
+
+    if args.batch:
+        scenes = sorted({path for pattern in SCENE_PATTERNS for path in glob.glob(os.path.join(args.input, pattern))})
+    else:
+        scenes = [args.input]
+
+    cache = StageCache(args.cache_dir)
+    os.makedirs(args.output_dir, exist_ok=True)
+    metrics = None
+    progress = sys.stdout
+    if args.metrics:
+        metrics = JsonLineSink(None if args.metrics == '-' else args.metrics)
+        if args.metrics == '-':
+            # Ölçüm kayıtları stdout'a yazılırken ilerleme satırları JSON akışını bozmaması için stderr'e gider.
+            progress = sys.stderr
+    for image_path in scenes:
+        name = os.path.basename(image_path)
+        queries = per_scene_queries.get(name, default_queries) if per_scene_queries else default_queries
+        if not queries:
+            continue
+
+        results, timings = run_scene(image_path, queries, cache, args.extractor, args.model, args.engine,
+                                     args.threshold, args.simplify, metrics)
+        stem = os.path.splitext(name)[0]
+        with open(os.path.join(args.output_dir, stem + '_routes.json'), 'w') as output_file:
+            json.dump({'scene': image_path, 'extractor': args.extractor, 'engine': args.engine,
+                       'timings': timings, 'routes': results}, output_file)
+        if args.plot:
+            plot_routes(image_path, results, os.path.join(args.output_dir, stem + '_routes.png'))
+
+        routed = sum('path' in result for result in results)
+        print(f"{name}: {routed}/{len(results)} routes, mask {timings['mask']:.2f}s"
+              f"{' (cached)' if timings['mask_cached'] else ''}, graph {timings['graph']:.2f}s, "
+              f"path {timings['path']:.2f}s", file=progress)
+
+    if metrics is not None:
+        metrics.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,407 @@
+import argparse  # Komut satırı seçenekleri için argparse modülü import ediliyor.
+import asyncio  # Eşzamanlı bağlantılar için asyncio modülü import ediliyor.
+import json  # İstek ve yanıt gövdeleri için json modülü import ediliyor.
+import math  # Sayı doğrulaması için math modülü import ediliyor.
+import os  # Dosya yolu işlemleri için os modülü import ediliyor.
+import signal  # SIGTERM ile düzgün kapanmak için signal modülü import ediliyor.
+import multiprocessing  # Arama süreçlerinin başlatma yöntemini seçmek için multiprocessing modülü import ediliyor.
+import sys  # Yol bulucuların bulunduğu klasörleri arama yoluna eklemek için sys modülü import ediliyor.
+from collections import OrderedDict  # LRU sırası için OrderedDict import ediliyor.
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor  # Arama ve yükleme havuzları import ediliyor.
+import numpy as np  # Sayısal hesaplamalar için numpy modülü import ediliyor.
+from scipy.sparse import csr_matrix  # Ortak bellekteki CSR dizilerinden matris oluşturmak için import ediliyor.
+
+# Yol bulucular "Common", "Dijkstra" ve "A Star" klasörlerinde. matplotlib bu modüllerde yalnızca
+# visualize_path içinde import edildiği için servis açılışında yüklenmez.
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.append(os.path.join(BASE_DIR, 'Common'))
+sys.path.append(os.path.join(BASE_DIR, 'Dijkstra'))
+sys.path.append(os.path.join(BASE_DIR, 'A Star'))
+from road_graph import NeighbourMask, build_adjacency_matrix  # CSR ve bit paketli graf gösterimleri import ediliyor.
+from road_index import RoadIndex  # Uç noktaları yola taşıyan bağlı parça indeksi import ediliyor.
+from instrumentation import search_record, to_json_line  # Sorgu ölçümleri için import ediliyor.
+import dijkstra as dijkstra_routing  # Dijkstra tabanlı yol bulucular import ediliyor.
+import A_Star_Algorithm as a_star_routing  # A* ve Jump Point Search yol bulucuları import ediliyor.
+from batch_routing import attach_array, share_array  # Süreçler arası ortak bellek yardımcıları import ediliyor.
+
+ENGINES = ('dijkstra', 'bidirectional', 'a_star', 'a_star_grid', 'jps')
+DEFAULT_PORT = 8765
+DEFAULT_CACHE_MB = 1024
+MAX_BODY_BYTES = 1024 * 1024
+
+HTTP_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+                413: 'Payload Too Large', 422: 'Unprocessable Entity', 500: 'Internal Server Error'}
+
+
+class MapEntry:
+    # Bellekte tutulan bir harita. Maske, bit paketli komşuluk baytları ve scipy dijkstra için CSR grafı, arama
+    # süreçlerinin kopyalamadan bağlanabilmesi için ortak bellekte tutulur; uç noktaları yola taşıyan indeks
+    # yalnızca ana süreçtedir.
+    # Önbellekten çıkarılan haritanın blokları, o haritada çalışan son arama bitince serbest bırakılır.
+
+    def __init__(self, key, flat_img):
+        self.key = key
+        self.shape = flat_img.shape
+        graph = NeighbourMask(flat_img)
+        self.road_index = RoadIndex(flat_img)
+        adjacency = build_adjacency_matrix(flat_img)
+        # Ağırlıklar bir kez float64'e çevrilir; aksi halde scipy her aramada grafın bir kopyasını oluşturur.
+        csr_arrays = (adjacency.data.astype(np.float64), adjacency.indices, adjacency.indptr)
+        mask_block, mask_descriptor = share_array(flat_img)
+        bits_block, bits_descriptor = share_array(graph.bits)
+        self.blocks = [mask_block, bits_block]
+        csr_descriptors = []
+        for array in csr_arrays:
+            block, descriptor = share_array(array)
+            self.blocks.append(block)
+            csr_descriptors.append(descriptor)
+        # Arama süreçlerine gönderilen bilgi; ilk alan süreçlerdeki bağlantılar için anahtardır.
+        self.descriptor = (mask_block.name, mask_descriptor, bits_descriptor, graph.width, graph.nnz,
+                           csr_descriptors)
+        self.nbytes = (flat_img.nbytes + graph.nbytes + self.road_index.nbytes +
+                       sum(array.nbytes for array in csr_arrays))
+        self.users = 0
+        self.evicted = False
+
+    def acquire(self):
+        self.users += 1
+
+    def release(self):
+        self.users -= 1
+        self._free_if_unused()
+
+    def evict(self):
+        self.evicted = True
+        self._free_if_unused()
+
+    def _free_if_unused(self):
+        if self.evicted and not self.users:
+            for block in self.blocks:
+                block.close()
+                block.unlink()
+            self.blocks = []
+
+
+def load_map(key, map_path):
+    # Maskeyi dosyadan oku ve aramaya hazır hale getir (havuzdaki bir iş parçacığında çalışır).
+    flat_img = np.ascontiguousarray(dijkstra_routing.create_flat_image(dijkstra_routing.load_image(map_path)))
+    return MapEntry(key, flat_img)
+
+
+class MapCache:
+    # Haritaları ilk istendiklerinde yükleyen ve toplam boyutu max_bytes ile sınırlı tutan LRU önbellek.
+    # Aynı harita için eşzamanlı gelen istekler tek bir yüklemeyi bekler.
+
+    def __init__(self, maps_dir, max_bytes, executor):
+        self.maps_dir = os.path.realpath(maps_dir)
+        self.max_bytes = max_bytes
+        self.executor = executor
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.loading = {}
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def resolve(self, name):
+        # Harita adını maps_dir içindeki bir dosyaya çevir; klasör dışına çıkan yollar reddedilir.
+        map_path = os.path.realpath(os.path.join(self.maps_dir, name))
+        if os.path.commonpath([self.maps_dir, map_path]) != self.maps_dir or not os.path.isfile(map_path):
+            raise FileNotFoundError(f"Unknown map: {name}")
+        # Dosya değişirse değiştirilme zamanı anahtarı değiştirir ve harita yeniden yüklenir.
+        return (map_path, os.stat(map_path).st_mtime_ns), map_path
+
+    async def get(self, name):
+        key, map_path = self.resolve(name)
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return self.entries[key]
+
+        if key not in self.loading:
+            self.stats['misses'] += 1
+            loop = asyncio.get_running_loop()
+            self.loading[key] = loop.run_in_executor(self.executor, load_map, key, map_path)
+        future = self.loading[key]
+        try:
+            entry = await asyncio.shield(future)
+        finally:
+            if future.done():
+                self.loading.pop(key, None)
+
+        if key not in self.entries:
+            self._insert(entry)
+        return entry
+
+    def _insert(self, entry):
+        self.entries[entry.key] = entry
+        self.total_bytes += entry.nbytes
+        # En uzun süredir kullanılmayan haritaları sınır altına inene kadar çıkar; yeni harita her zaman kalır.
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            _, evicted = self.entries.popitem(last=False)
+            self.total_bytes -= evicted.nbytes
+            self.stats['evictions'] += 1
+            evicted.evict()
+
+    def live(self):
+        # Önbellekteki haritaların ortak bellek anahtarları; arama süreçleri diğer bağlantılarını kapatır.
+        return frozenset(entry.descriptor[0] for entry in self.entries.values())
+
+    def close(self):
+        for entry in self.entries.values():
+            entry.evict()
+        self.entries.clear()
+        self.total_bytes = 0
+
+    def describe(self):
+        return dict(self.stats, maps=len(self.entries), bytes=self.total_bytes, max_bytes=self.max_bytes,
+                    loading=len(self.loading))
+
+
+# Arama süreçlerinin ortak bellekten bağlandığı haritalar: anahtar -> (bloklar, maske, NeighbourMask, CSR grafı).
+_worker_maps = {}
+
+
+def _attach_map(descriptor, live):
+    # Haritaya ilk sorguda bağlan. Ana süreçte önbellekten çıkarılmış haritaların bağlantıları kapatılır.
+    name, mask_descriptor, bits_descriptor, width, nnz, csr_descriptors = descriptor
+    for stale in [stale for stale in _worker_maps if stale not in live and stale != name]:
+        blocks = _worker_maps.pop(stale)[0]
+        for block in blocks:
+            block.close()
+
+    if name not in _worker_maps:
+        mask_block, flat_img = attach_array(mask_descriptor)
+        bits_block, bits = attach_array(bits_descriptor)
+        blocks, csr_arrays = [mask_block, bits_block], []
+        for csr_descriptor in csr_descriptors:
+            block, array = attach_array(csr_descriptor)
+            blocks.append(block)
+            csr_arrays.append(array)
+        adjacency = csr_matrix(tuple(csr_arrays), shape=(flat_img.size, flat_img.size), copy=False)
+        _worker_maps[name] = (blocks, flat_img, NeighbourMask.from_bits(bits, width, nnz), adjacency)
+    return _worker_maps[name][1:]
+
+
+def run_query(descriptor, query, live):
+    # Tek bir sorguyu havuzdaki bir süreçte çalıştır. Maske ve graf ortak bellekteki haritadan okunur; uç noktalar
+    # ana süreçte zaten yola taşınmış piksel indisleridir.
+    # Dönüş: yanıt sözlüğü; ulaşılamayan hedef gibi hatalar 'error' alanıyla döner.
+    flat_img, graph, adjacency = _attach_map(descriptor, live)
+    engine, source, target, simplify_tolerance = query
+    stats = {}
+    options = dict(simplify_tolerance=simplify_tolerance, stats=stats)
+    try:
+        if engine == 'dijkstra':
+            path, elapsed = dijkstra_routing.find_path(flat_img, source, target, mode='full', graph=adjacency,
+                                                       **options)
+        elif engine == 'bidirectional':
+            path, elapsed = dijkstra_routing.find_path(flat_img, source, target, mode='bidirectional', graph=graph,
+                                                       **options)
+        elif engine == 'a_star':
+            path, elapsed = a_star_routing.find_path_a_star(flat_img, source, target, graph=graph, **options)
+        elif engine == 'a_star_grid':
+            path, elapsed = a_star_routing.find_path_a_star_grid(flat_img, source, target, heuristic='octile',
+                                                                 **options)
+        else:
+            path, elapsed = a_star_routing.find_path_jps(flat_img, source, target, **options)
+    except ValueError as error:
+        return {'error': str(error), 'stats': search_record(stats, engine)}
+    return {'path': np.asarray(path).tolist(), 'elapsed': elapsed, 'stats': search_record(stats, engine)}
+
+
+class RoutingService:
+    # Yol sorgularını karşılayan servis. Her farklı sorgu, süreç havuzunda ayrı bir görev olarak çalışır;
+    # yol bulucular saf Python olduğu için iş parçacıkları GIL nedeniyle aramaları paralel çalıştıramaz.
+    # Tamamen aynı olan eşzamanlı sorgular tek bir aramanın sonucunu paylaşır.
+    # Haritalar iş parçacığı havuzunda yüklenir; uç noktalar aramadan önce ana süreçte yola taşınır.
+
+    def __init__(self, maps_dir, max_bytes=DEFAULT_CACHE_MB * 1024 ** 2, workers=None, log=None):
+        workers = workers or os.cpu_count() or 1
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        # Olay döngüsü ve yükleme iş parçacıkları çalışırken fork güvenli olmadığından süreçler spawn ile başlatılır.
+        self.searches = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        self.maps = MapCache(maps_dir, max_bytes, self.executor)
+        self.log = log
+        self.inflight = {}
+        self.stats = {'queries': 0, 'merged': 0, 'searches': 0}
+
+    async def route(self, request):
+        map_name = request.get('map')
+        engine = request.get('engine', 'dijkstra')
+        if not isinstance(map_name, str) or engine not in ENGINES:
+            raise ValueError("Request needs a 'map' name and a known 'engine'")
+        try:
+            source = tuple(int(value) for value in request['source'])
+            target = tuple(int(value) for value in request['target'])
+        except (KeyError, TypeError, ValueError):
+            raise ValueError("'source' and 'target' must be [y, x] pairs")
+        if len(source) != 2 or len(target) != 2:
+            raise ValueError("'source' and 'target' must be [y, x] pairs")
+        simplify_tolerance = request.get('simplify')
+        if simplify_tolerance is not None:
+            try:
+                simplify_tolerance = float(simplify_tolerance)
+            except (TypeError, ValueError):
+                raise ValueError("'simplify' must be a non-negative number")
+            if not math.isfinite(simplify_tolerance) or simplify_tolerance < 0:
+                raise ValueError("'simplify' must be a non-negative number")
+
+        entry = await self.maps.get(map_name)
+        height, width = entry.shape
+        if not all(0 <= y < height and 0 <= x < width for y, x in (source, target)):
+            raise ValueError("'source' and 'target' must lie inside the map")
+
+        self.stats['queries'] += 1
+        query = (engine, source, target, simplify_tolerance)
+        inflight_key = (entry.key, query)
+        if inflight_key in self.inflight:
+            self.stats['merged'] += 1
+            return await asyncio.shield(self.inflight[inflight_key])
+
+        # Harita, arama bitene kadar önbellekten çıkarılsa bile ortak bellekte kalır.
+        entry.acquire()
+        task = asyncio.ensure_future(self._search(entry, query))
+        self.inflight[inflight_key] = task
+        task.add_done_callback(lambda _: self.inflight.pop(inflight_key, None))
+        return await asyncio.shield(task)
+
+    async def _search(self, entry, query):
+        engine, source, target, simplify_tolerance = query
+        width = entry.shape[1]
+        try:
+            try:
+                source, target = entry.road_index.resolve(dijkstra_routing.to_index(source[0], source[1], width),
+                                                          dijkstra_routing.to_index(target[0], target[1], width))
+            except ValueError as error:
+                result = {'error': str(error), 'stats': search_record({}, engine)}
+            else:
+                self.stats['searches'] += 1
+                result = await asyncio.get_running_loop().run_in_executor(
+                    self.searches, run_query, entry.descriptor, (engine, source, target, simplify_tolerance),
+                    self.maps.live())
+        finally:
+            entry.release()
+        if self.log is not None:
+            self.log.write(to_json_line(result['stats']) + '\n')
+        return result
+
+    def describe(self):
+        return {'service': self.stats, 'cache': self.maps.describe()}
+
+    async def handle(self, method, path, body):
+        # HTTP isteğini (durum kodu, yanıt sözlüğü) çiftine çevir.
+        if path == '/health':
+            return 200, {'status': 'ok'}
+        if path == '/stats':
+            return 200, self.describe()
+        if path != '/route':
+            return 404, {'error': f"Unknown path: {path}"}
+        if method != 'POST':
+            return 405, {'error': "Use POST for /route"}
+        try:
+            request = json.loads(body or b'{}')
+            if not isinstance(request, dict):
+                raise ValueError("Request body must be a JSON object")
+            result = await self.route(request)
+        except FileNotFoundError as error:
+            return 404, {'error': str(error)}
+        except ValueError as error:
+            return 400, {'error': str(error)}
+        return (422 if 'error' in result else 200), result
+
+    async def serve_connection(self, reader, writer):
+        # Basit HTTP/1.1: bağlantı kapanana kadar (keep-alive) istekleri sırayla işle.
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                try:
+                    method, path, _ = request_line.decode('latin-1').split()
+                except ValueError:
+                    await self._respond(writer, 400, {'error': "Malformed request line"}, close=True)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if not line.strip():
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get('content-length') or 0)
+                    if length < 0:
+                        raise ValueError(length)
+                except ValueError:
+                    await self._respond(writer, 400, {'error': "Malformed Content-Length header"}, close=True)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {'error': "Request body too large"}, close=True)
+                    break
+                body = await reader.readexactly(length) if length else b''
+                close = headers.get('connection', '').lower() == 'close'
+
+                try:
+                    status, payload = await self.handle(method, path.split('?', 1)[0], body)
+                except Exception as error:  # Sunucu çökmemeli; beklenmeyen hatalar 500 olarak döner.
+                    status, payload = 500, {'error': f"{type(error).__name__}: {error}"}
+                await self._respond(writer, status, payload, close)
+                if close:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer, status, payload, close=False):
+        body = to_json_line(payload).encode()
+        head = (f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: {'close' if close else 'keep-alive'}\r\n\r\n")
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+    def close(self):
+        self.searches.shutdown(wait=True, cancel_futures=True)
+        self.executor.shutdown(wait=False)
+        self.maps.close()
+
+
+async def serve(service, host='127.0.0.1', port=DEFAULT_PORT, unix_path=None):
+    if unix_path is not None:
+        server = await asyncio.start_unix_server(service.serve_connection, path=unix_path)
+        address = unix_path
+    else:
+        server = await asyncio.start_server(service.serve_connection, host, port)
+        address = f"http://{host}:{server.sockets[0].getsockname()[1]}"
+    print(f"Routing service listening on {address}", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local routing service that keeps road masks and graphs in memory.")
+    parser.add_argument('maps_dir', help="folder containing the road mask images; requests name maps relative to it")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--unix', help="listen on this Unix socket path instead of TCP")
+    parser.add_argument('--cache-mb', type=float, default=DEFAULT_CACHE_MB, help="memory bound of the map cache")
+    parser.add_argument('--workers', type=int, default=None, help="search worker processes (default: CPU count)")
+    parser.add_argument('--log', action='store_true', help="print one JSON line of search statistics per query")
+    args = parser.parse_args()
+
+    service = RoutingService(args.maps_dir, int(args.cache_mb * 1024 ** 2), args.workers,
+                             sys.stdout if args.log else None)
+    # SIGTERM de Ctrl+C gibi ele alınır; böylece arama süreçleri kapatılır ve ortak bellek blokları silinir.
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        asyncio.run(serve(service, args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    main()